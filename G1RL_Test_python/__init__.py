@@ -12,4 +12,11 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-from .extension import *
+
+try:
+    import omni.ext  # noqa: F401
+except ModuleNotFoundError:
+    # outside of Isaac Sim (e.g. standalone training or benchmarks), only the torch modules are usable
+    pass
+else:
+    from .extension import *
@@ -0,0 +1,54 @@
+class SimulationBackend:
+    """Interface between a locomotion task and the simulator.
+
+    A backend builds the scene for a task, creates the batched articulation view that the task reads
+    from and writes to, and advances the physics. The articulation view follows the API of
+    :class:`isaacsim.core.prims.Articulation` for the subset of methods used by the tasks.
+    """
+
+    @property
+    def device(self) -> str:
+        """The device on which the articulation view exchanges data."""
+        raise NotImplementedError
+
+    @property
+    def physics_dt(self) -> float:
+        """The physics time step in seconds."""
+        raise NotImplementedError
+
+    def set_up_scene(self, task):
+        """Create the ground, the robots and the environment grid of the task.
+
+        Returns:
+            The environment origins. Shape is (num_envs, 3).
+        """
+        raise NotImplementedError
+
+    def create_articulation(self, task):
+        """Create and initialize the articulation view over all robots of the task."""
+        raise NotImplementedError
+
+    def to_sim(self, data):
+        """Convert a task tensor to the data type expected by the articulation view setters.
+
+        The default implementation passes the tensor through unchanged.
+        """
+        return data
+
+    def set_material_properties(self, articulation, materials, env_ids):
+        """Set the (static friction, dynamic friction, restitution) of all collision shapes of the given robots.
+
+        Args:
+            articulation: The articulation view created by :meth:`create_articulation`.
+            materials: The material of every robot. Shape is (len(env_ids), 3).
+            env_ids: The robots to update.
+        """
+        raise NotImplementedError
+
+    def step(self, render: bool = False):
+        """Advance the physics by one time step."""
+        raise NotImplementedError
+
+    def close(self):
+        """Release the simulator resources."""
+        pass
@@ -0,0 +1,128 @@
+import numpy as np
+
+from .base import SimulationBackend
+from .torch_backend import grid_env_origins
+
+
+class IsaacSimBackend(SimulationBackend):
+    """Backend running the task in Isaac Sim.
+
+    The Isaac Sim modules are imported lazily, so that this backend can be selected before the
+    simulation app is launched (see ``scripts/train.py``). In the extension UI, the physics is stepped
+    by the timeline and :meth:`step` is not used.
+    """
+
+    def __init__(self, physics_dt: float = 1.0 / 200.0):
+        self._physics_dt = physics_dt
+
+    @property
+    def device(self) -> str:
+        # without a torch simulation context (e.g. in the extension UI), the views exchange NumPy arrays
+        if self._uses_numpy():
+            return "cpu"
+        from isaacsim.core.api import SimulationContext
+
+        return str(SimulationContext.instance().device)
+
+    @property
+    def physics_dt(self) -> float:
+        return self._physics_dt
+
+    def to_sim(self, data):
+        if self._uses_numpy():
+            return data.detach().cpu().numpy()
+        return data
+
+    def set_up_scene(self, task):
+        import isaacsim.core.utils.xforms as xform_utils
+        import omni.usd
+        from isaacsim.core.cloner import Cloner
+        from pxr import Gf
+
+        timer = task.scene_timer
+        stage = omni.usd.get_context().get_stage()
+        with timer.section("add_ground"):
+            self.add_ground(task)
+        with timer.section("add_robot"):
+            self.get_humanoid(task)
+            # the robot is placed once in the source environment, the clones inherit its local pose
+            prim = stage.GetPrimAtPath(task.default_zero_env_path + "/g1")
+            translation = Gf.Vec3d(0.0, 0.0, task._g1_default_height)
+            xform_utils.reset_and_set_xform_ops(prim, translation, Gf.Quatd(1.0, 0.0, 0.0, 0.0))
+
+        with timer.section("env_origins"):
+            env_origins = grid_env_origins(task._num_envs, task._env_spacing)
+
+        with timer.section("clone"):
+            # the environment prims are created and translated in a single batched call of the cloner
+            cloner = Cloner()
+            cloner.define_base_env(task.default_base_env_path)
+            prim_paths = cloner.generate_paths(f"{task.default_base_env_path}/env", task._num_envs)
+            cloner.clone(
+                source_prim_path=task.default_zero_env_path,
+                prim_paths=prim_paths,
+                positions=env_origins.numpy(),
+                replicate_physics=True,
+                copy_from_source=False,
+            )
+        return env_origins
+
+    def add_ground(self, task=None):
+        """Add the terrain of the task as a static triangle mesh collider, or a flat ground plane without one."""
+        import omni.usd
+        from pxr import Gf, PhysicsSchemaTools
+
+        stage = omni.usd.get_context().get_stage()
+        terrain = getattr(task, "terrain", None)
+        if terrain is not None:
+            self.add_terrain(stage, terrain)
+            return
+        PhysicsSchemaTools.addGroundPlane(stage, "/groundPlane", "Z", 1500, Gf.Vec3f(0, 0, 0), Gf.Vec3f(0.5))
+
+    def add_terrain(self, stage, terrain, prim_path: str = "/World/terrain"):
+        from pxr import UsdGeom, UsdPhysics, Vt
+
+        vertices, triangles = terrain.mesh()
+        mesh = UsdGeom.Mesh.Define(stage, prim_path)
+        # the arrays are handed to USD in bulk, without per-vertex Python objects
+        mesh.CreatePointsAttr(Vt.Vec3fArray.FromNumpy(vertices))
+        mesh.CreateFaceVertexIndicesAttr(Vt.IntArray.FromNumpy(triangles.reshape(-1)))
+        mesh.CreateFaceVertexCountsAttr(Vt.IntArray.FromNumpy(np.full(len(triangles), 3, dtype=np.int32)))
+        mesh.CreateSubdivisionSchemeAttr("none")
+        UsdPhysics.CollisionAPI.Apply(mesh.GetPrim())
+        UsdPhysics.MeshCollisionAPI.Apply(mesh.GetPrim()).CreateApproximationAttr("none")
+
+    def get_humanoid(self, task):
+        from ..g1 import G1Robot
+
+        G1Robot(prim_path=task.default_zero_env_path + "/g1", name="g1")
+
+    def create_articulation(self, task):
+        from isaacsim.core.prims import Articulation
+
+        articulation = Articulation(
+            prim_paths_expr="/World/envs/.*/g1", name="humanoid_view", reset_xform_properties=False
+        )
+        articulation.initialize()
+        return articulation
+
+    def set_material_properties(self, articulation, materials, env_ids):
+        import torch
+
+        # the materials of the PhysX view live on the host, and are set for all shapes of a robot at once
+        physics_view = articulation._physics_view
+        env_ids = torch.as_tensor(env_ids).cpu()
+        current = physics_view.get_material_properties()
+        current[env_ids] = torch.as_tensor(materials).cpu().to(current.dtype).unsqueeze(1)
+        physics_view.set_material_properties(current, env_ids)
+
+    def step(self, render: bool = False):
+        from isaacsim.core.api import SimulationContext
+
+        SimulationContext.instance().step(render=render)
+
+    def _uses_numpy(self) -> bool:
+        from isaacsim.core.api import SimulationContext
+
+        sim = SimulationContext.instance()
+        return sim is None or sim.backend == "numpy"
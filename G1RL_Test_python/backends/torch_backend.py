@@ -0,0 +1,259 @@
+import math
+from collections.abc import Sequence
+
+import torch
+
+from ..utils.math_utils import normalize, quat_from_angle_axis, quat_mul
+from .base import SimulationBackend
+
+
+def grid_env_origins(num_envs: int, spacing: float, device: str = "cpu") -> torch.Tensor:
+    """Environment origins on a square grid centered at the world origin, in the order of the GridCloner.
+
+    Returns:
+        The origins of the environments. Shape is (num_envs, 3).
+    """
+    num_rows = math.ceil(math.sqrt(num_envs))
+    num_cols = math.ceil(num_envs / num_rows)
+    env_ids = torch.arange(num_envs, device=device)
+    origins = torch.zeros((num_envs, 3), device=device)
+    origins[:, 0] = 0.5 * spacing * (num_rows - 1) - spacing * torch.div(env_ids, num_cols, rounding_mode="floor")
+    origins[:, 1] = spacing * torch.remainder(env_ids, num_cols) - 0.5 * spacing * (num_cols - 1)
+    return origins
+
+
+class TorchArticulation:
+    """Stand-in for :class:`isaacsim.core.prims.Articulation` with pure PyTorch state.
+
+    All getters return tensors of the same shapes as the Isaac Sim view. The joints follow PD position
+    targets with unit inertia, and the root performs a damped random walk so that the observations,
+    rewards and terminations of the task are exercised. The dynamics are not physically meaningful;
+    this class is meant for profiling and testing the task loop without a simulator.
+    """
+
+    def __init__(
+        self,
+        num_envs: int,
+        num_dof: int = 29,
+        num_bodies: int = 30,
+        dof_names: list[str] | None = None,
+        env_origins: torch.Tensor | None = None,
+        default_height: float = 0.8,
+        stiffness: float = 100.0,
+        damping: float = 5.0,
+        effort_limit: float = 100.0,
+        device: str = "cpu",
+        seed: int = 0,
+    ):
+        self.num_envs = num_envs
+        self.count = num_envs
+        self.num_dof = num_dof
+        self.num_joints = num_dof
+        self.num_bodies = num_bodies
+        self.dof_names = dof_names if dof_names is not None else [f"joint_{i}" for i in range(num_dof)]
+        self.effort_limit = effort_limit
+        self.device = device
+        self._generator = torch.Generator(device=device).manual_seed(seed)
+
+        # default state
+        if env_origins is None:
+            env_origins = torch.zeros((num_envs, 3), device=device)
+        self._default_root_pos = env_origins.to(device).clone()
+        self._default_root_pos[:, 2] = default_height
+        self._default_root_quat = torch.zeros((num_envs, 4), device=device)
+        self._default_root_quat[:, 0] = 1.0
+        self._default_joint_pos = torch.zeros((num_envs, num_dof), device=device)
+        self._default_joint_vel = torch.zeros((num_envs, num_dof), device=device)
+
+        # simulation state
+        self._root_pos = self._default_root_pos.clone()
+        self._root_quat = self._default_root_quat.clone()
+        self._root_vel = torch.zeros((num_envs, 6), device=device)
+        self._joint_pos = self._default_joint_pos.clone()
+        self._joint_vel = self._default_joint_vel.clone()
+        self._joint_targets = self._default_joint_pos.clone()
+        self._joint_efforts = torch.zeros((num_envs, num_dof), device=device)
+
+        # physical properties, per environment so that they can be randomized
+        self._stiffness = torch.full((num_envs, num_dof), stiffness, device=device)
+        self._damping = torch.full((num_envs, num_dof), damping, device=device)
+        self._body_masses = torch.ones((num_envs, num_bodies), device=device)
+        # (static friction, dynamic friction, restitution), not used by the dynamics
+        self.materials = torch.tensor([[0.5, 0.5, 0.0]], device=device).repeat(num_envs, 1)
+
+    def initialize(self):
+        pass
+
+    """
+    Getters.
+    """
+
+    def get_world_poses(self, indices=None) -> tuple[torch.Tensor, torch.Tensor]:
+        indices = self._resolve(indices)
+        return self._root_pos[indices], self._root_quat[indices]
+
+    def get_local_poses(self, indices=None) -> tuple[torch.Tensor, torch.Tensor]:
+        return self.get_world_poses(indices)
+
+    def get_velocities(self, indices=None) -> torch.Tensor:
+        return self._root_vel[self._resolve(indices)]
+
+    def get_joint_positions(self, indices=None, joint_indices=None) -> torch.Tensor:
+        return self._joint_pos[self._resolve(indices)][:, self._resolve(joint_indices)]
+
+    def get_joint_velocities(self, indices=None, joint_indices=None) -> torch.Tensor:
+        return self._joint_vel[self._resolve(indices)][:, self._resolve(joint_indices)]
+
+    def get_measured_joint_efforts(self, indices=None, joint_indices=None) -> torch.Tensor:
+        return self._joint_efforts[self._resolve(indices)][:, self._resolve(joint_indices)]
+
+    def get_gains(self, indices=None, joint_indices=None) -> tuple[torch.Tensor, torch.Tensor]:
+        indices, joint_indices = self._resolve(indices), self._resolve(joint_indices)
+        return self._stiffness[indices][:, joint_indices], self._damping[indices][:, joint_indices]
+
+    def get_body_masses(self, indices=None, body_indices=None) -> torch.Tensor:
+        return self._body_masses[self._resolve(indices)][:, self._resolve(body_indices)]
+
+    """
+    Setters.
+    """
+
+    def set_joints_default_state(self, positions=None, velocities=None, efforts=None):
+        if positions is not None:
+            self._default_joint_pos.copy_(torch.as_tensor(positions, device=self.device))
+        if velocities is not None:
+            self._default_joint_vel.copy_(torch.as_tensor(velocities, device=self.device))
+
+    def set_world_poses(self, positions=None, orientations=None, indices=None):
+        indices = self._resolve(indices)
+        if positions is not None:
+            self._root_pos[indices] = torch.as_tensor(positions, dtype=self._root_pos.dtype, device=self.device)
+        if orientations is not None:
+            self._root_quat[indices] = torch.as_tensor(orientations, dtype=self._root_quat.dtype, device=self.device)
+
+    def set_velocities(self, velocities, indices=None):
+        velocities = torch.as_tensor(velocities, dtype=self._root_vel.dtype, device=self.device)
+        self._root_vel[self._resolve(indices)] = velocities
+
+    def set_joint_positions(self, positions, indices=None, joint_indices=None):
+        self._set_joint_state(self._joint_pos, positions, indices, joint_indices)
+
+    def set_joint_velocities(self, velocities, indices=None, joint_indices=None):
+        self._set_joint_state(self._joint_vel, velocities, indices, joint_indices)
+
+    def set_joint_position_targets(self, positions, indices=None, joint_indices=None):
+        self._set_joint_state(self._joint_targets, positions, indices, joint_indices)
+
+    def set_gains(self, kps=None, kds=None, indices=None, joint_indices=None):
+        if kps is not None:
+            self._set_joint_state(self._stiffness, kps, indices, joint_indices)
+        if kds is not None:
+            self._set_joint_state(self._damping, kds, indices, joint_indices)
+
+    def set_body_masses(self, values, indices=None, body_indices=None):
+        self._set_joint_state(self._body_masses, values, indices, body_indices)
+
+    def post_reset(self):
+        self._root_pos.copy_(self._default_root_pos)
+        self._root_quat.copy_(self._default_root_quat)
+        self._root_vel.zero_()
+        self._joint_pos.copy_(self._default_joint_pos)
+        self._joint_vel.copy_(self._default_joint_vel)
+        self._joint_targets.copy_(self._default_joint_pos)
+
+    """
+    Simulation.
+    """
+
+    def step(self, dt: float):
+        # joints: PD control with unit inertia
+        torch.clamp(
+            self._stiffness * (self._joint_targets - self._joint_pos) - self._damping * self._joint_vel,
+            -self.effort_limit,
+            self.effort_limit,
+            out=self._joint_efforts,
+        )
+        self._joint_vel.add_(self._joint_efforts, alpha=dt)
+        self._joint_pos.add_(self._joint_vel, alpha=dt)
+
+        # root: damped random walk of the twist, integrated into the pose
+        noise = torch.randn((self.num_envs, 6), device=self.device, generator=self._generator)
+        self._root_vel.mul_(1.0 - 2.0 * dt).add_(noise, alpha=math.sqrt(dt))
+        self._root_pos.add_(self._root_vel[:, :3], alpha=dt)
+        ang_vel = self._root_vel[:, 3:]
+        angle = torch.linalg.norm(ang_vel, dim=-1) * dt
+        delta = quat_from_angle_axis(angle, normalize(ang_vel))
+        self._root_quat.copy_(normalize(quat_mul(self._root_quat, delta)))
+
+    """
+    Helpers.
+    """
+
+    def _resolve(self, indices):
+        if indices is None:
+            return slice(None)
+        if isinstance(indices, Sequence):
+            return torch.tensor(indices, dtype=torch.long, device=self.device)
+        return torch.as_tensor(indices, device=self.device)
+
+    def _set_joint_state(self, state: torch.Tensor, values, indices, joint_indices):
+        indices = self._resolve(indices)
+        joint_indices = self._resolve(joint_indices)
+        values = torch.as_tensor(values, dtype=state.dtype, device=self.device)
+        if isinstance(indices, slice):
+            state[:, joint_indices] = values
+        elif isinstance(joint_indices, slice):
+            state[indices] = values
+        else:
+            state[indices.unsqueeze(-1), joint_indices] = values
+
+
+class TorchBackend(SimulationBackend):
+    """Backend replacing Isaac Sim with a :class:`TorchArticulation`.
+
+    This backend has no GUI, USD or PhysX dependency, so the full reset/step/observe/reward loop of a task
+    runs in a plain Python process, on CPU or GPU.
+    """
+
+    def __init__(self, physics_dt: float = 1.0 / 200.0, num_dof: int = 29, device: str = "cpu", seed: int = 0):
+        self._physics_dt = physics_dt
+        self._num_dof = num_dof
+        self._device = device
+        self._seed = seed
+        self._env_origins: torch.Tensor = None  # type: ignore
+        self.articulation: TorchArticulation = None  # type: ignore
+
+    @property
+    def device(self) -> str:
+        return self._device
+
+    @property
+    def physics_dt(self) -> float:
+        return self._physics_dt
+
+    def set_up_scene(self, task):
+        with task.scene_timer.section("env_origins"):
+            self._env_origins = grid_env_origins(task._num_envs, task._env_spacing, device=self._device)
+        return self._env_origins
+
+    def create_articulation(self, task):
+        dof_names = [f"joint_{i}" for i in range(self._num_dof)]
+        for joint_id, joint_name in zip(task.joint_ids, task.joint_names):
+            dof_names[joint_id] = joint_name
+        self.articulation = TorchArticulation(
+            task._num_envs,
+            num_dof=self._num_dof,
+            dof_names=dof_names,
+            env_origins=self._env_origins,
+            default_height=task._g1_default_height,
+            device=self._device,
+            seed=self._seed,
+        )
+        return self.articulation
+
+    def set_material_properties(self, articulation, materials, env_ids):
+        materials = torch.as_tensor(materials, dtype=articulation.materials.dtype, device=self._device)
+        articulation.materials[env_ids] = materials
+
+    def step(self, render: bool = False):
+        self.articulation.step(self._physics_dt)
@@ -0,0 +1,124 @@
+"""Policy checkpoint helpers.
+
+Weights are stored in a flat file following the safetensors layout: an 8-byte little-endian header size, a
+JSON header mapping every tensor name to its dtype, shape and byte range, and the raw tensor data. The file is
+memory-mapped on load, so only the pages of the tensors that are used are read from disk.
+"""
+
+import json
+import mmap
+import re
+import struct
+
+import torch
+
+_DTYPES = {
+    "F64": torch.float64,
+    "F32": torch.float32,
+    "F16": torch.float16,
+    "BF16": torch.bfloat16,
+    "I64": torch.int64,
+    "I32": torch.int32,
+    "I16": torch.int16,
+    "I8": torch.int8,
+    "U8": torch.uint8,
+    "BOOL": torch.bool,
+}
+_DTYPE_NAMES = {dtype: name for name, dtype in _DTYPES.items()}
+_ALIGNMENT = 8
+
+
+def save_flat_weights(state_dict: dict[str, torch.Tensor], path: str, metadata: dict[str, str] | None = None):
+    """Write the tensors of a state dict to a flat weight file.
+
+    Args:
+        state_dict: The tensors to save. They are copied to the host.
+        path: The output file path.
+        metadata: Optional string metadata stored in the header.
+    """
+    header = {}
+    if metadata:
+        header["__metadata__"] = {str(key): str(value) for key, value in metadata.items()}
+    tensors = []
+    offset = 0
+    for name, tensor in state_dict.items():
+        tensor = tensor.detach().contiguous().cpu()
+        num_bytes = tensor.numel() * tensor.element_size()
+        header[name] = {
+            "dtype": _DTYPE_NAMES[tensor.dtype],
+            "shape": list(tensor.shape),
+            "data_offsets": [offset, offset + num_bytes],
+        }
+        tensors.append(tensor)
+        offset += num_bytes
+
+    # the header is padded with spaces so that the tensor data starts on an aligned offset
+    header_bytes = json.dumps(header, separators=(",", ":")).encode("utf-8")
+    header_bytes += b" " * (-len(header_bytes) % _ALIGNMENT)
+    with open(path, "wb") as f:
+        f.write(struct.pack("<Q", len(header_bytes)))
+        f.write(header_bytes)
+        for tensor in tensors:
+            f.write(tensor.reshape(-1).view(torch.uint8).numpy().tobytes())
+
+
+def load_flat_weights(path: str, device: str = "cpu") -> tuple[dict[str, torch.Tensor], dict[str, str]]:
+    """Load the tensors of a flat weight file.
+
+    Args:
+        path: The file path.
+        device: The device of the returned tensors. On CPU, the tensors are views of the memory-mapped file.
+
+    Returns:
+        The state dict and the metadata of the file.
+    """
+    with open(path, "rb") as f:
+        (header_size,) = struct.unpack("<Q", f.read(8))
+        header = json.loads(f.read(header_size))
+        # copy-on-write mapping: the tensors are writable without modifying the file
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+
+    metadata = header.pop("__metadata__", {})
+    data_start = 8 + header_size
+    state_dict = {}
+    for name, info in header.items():
+        dtype = _DTYPES[info["dtype"]]
+        begin, end = info["data_offsets"]
+        count = (end - begin) // torch.empty((), dtype=dtype).element_size()
+        if count == 0:
+            tensor = torch.empty(info["shape"], dtype=dtype)
+        else:
+            tensor = torch.frombuffer(buffer, dtype=dtype, count=count, offset=data_start + begin)
+        state_dict[name] = tensor.reshape(info["shape"]).to(device)
+    return state_dict, metadata
+
+
+def infer_mlp_dims(state_dict: dict[str, torch.Tensor], prefix: str = "actor.layers.") -> tuple[int, int, list[int]]:
+    """Infer the dimensions of a sequential MLP from the names of its linear weights.
+
+    The linear layers are the 2D ``<prefix><index>.weight`` entries, ordered by index, so any depth and any
+    activation layout between the linear layers is supported.
+
+    Args:
+        state_dict: The parameters of the model.
+        prefix: The name prefix of the sequential layers. Defaults to "actor.layers.".
+
+    Returns:
+        The input dimension, the output dimension and the hidden dimensions.
+
+    Raises:
+        ValueError: If the state dict contains no linear weight with the prefix.
+    """
+    pattern = re.compile(re.escape(prefix) + r"(\d+)\.weight$")
+    weights = []
+    for name, param in state_dict.items():
+        match = pattern.match(name)
+        if match is not None and param.dim() == 2:
+            weights.append((int(match.group(1)), param))
+    if not weights:
+        raise ValueError(f"No linear weight with prefix '{prefix}' in the state dict.")
+    weights.sort(key=lambda item: item[0])
+    obs_dim = weights[0][1].shape[1]
+    action_dim = weights[-1][1].shape[0]
+    hidden_dims = [param.shape[0] for _, param in weights[:-1]]
+    return obs_dim, action_dim, hidden_dims
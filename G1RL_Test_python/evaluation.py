@@ -0,0 +1,103 @@
+import torch
+
+from .policy import BatchedPolicy, PolicyExporter
+
+
+class MultiPolicyEvaluator:
+    """Compare several policies side by side in one simulation of a locomotion task.
+
+    The environments of the task are split into one group per policy, and all policies run in a single
+    forward pass of a :class:`BatchedPolicy`. The rewards, finished episodes and failures are accumulated per
+    group on the device.
+
+    :meth:`step` reads the state reached by the last physics step, scores and resets the environments, advances
+    the velocity commands and applies the new actions. It is meant to be called once per control step, e.g. by a :class:`ControlScheduler`
+    with :meth:`score` as its ``on_control_step`` hook and :attr:`policy` as its policy.
+    """
+
+    def __init__(self, task, policies: list[PolicyExporter], group_ids: torch.Tensor = None):
+        """Initialize the evaluator.
+
+        Args:
+            task: The initialized locomotion task.
+            policies: The policies to compare.
+            group_ids: The index of the policy of every environment. Shape is (num_envs,). Defaults to None,
+                in which case the environments are split into contiguous groups.
+        """
+        self.task = task
+        self.device = task.device
+        self.policy = BatchedPolicy(policies, task._num_envs, group_ids=group_ids, device=self.device)
+        self.num_policies = self.policy.num_policies
+        self.group_ids = self.policy.group_ids
+
+        self.reward_sums = torch.zeros(self.num_policies, device=self.device)
+        self.num_episodes = torch.zeros(self.num_policies, device=self.device)
+        self.num_failures = torch.zeros(self.num_policies, device=self.device)
+        self.num_steps = 0
+        self._started = False
+
+    def reset(self):
+        """Reset all environments and the statistics, and apply the first actions."""
+        self.task.reset()
+        self.reward_sums.zero_()
+        self.num_episodes.zero_()
+        self.num_failures.zero_()
+        self.num_steps = 0
+        self.task.update_state()
+        self._act()
+        self._started = True
+
+    @torch.no_grad()
+    def step(self):
+        if not self._started:
+            self.reset()
+            return
+        self.task.update_state()
+        self.score()
+        self.task.update_commands()
+        self._act()
+
+    @torch.no_grad()
+    def score(self):
+        """Accumulate the rewards and terminations of the current state, and reset the finished environments.
+
+        Expects the task state to be up to date (see :meth:`G1LocomotionTask.update_state`).
+        """
+        task = self.task
+        dones = task.is_done()
+        rewards = task.get_reward()
+
+        # per-group statistics, without host synchronization
+        self.reward_sums.index_add_(0, self.group_ids, rewards)
+        self.num_episodes.index_add_(0, self.group_ids, dones.float())
+        self.num_failures.index_add_(0, self.group_ids, task.termination_manager.terminated.float())
+        self.num_steps += 1
+
+        reset_env_ids = dones.nonzero(as_tuple=False).squeeze(-1)
+        if len(reset_env_ids) > 0:
+            task.reset_idx(reset_env_ids)
+            task.update_state()
+
+    def summary(self) -> dict[str, list[float]]:
+        """Mean reward per environment step, finished episodes and failures of every policy."""
+        num_samples = self.policy.group_counts.float() * max(self.num_steps, 1)
+        return {
+            "mean_step_reward": (self.reward_sums / num_samples).tolist(),
+            "episodes": self.num_episodes.tolist(),
+            "failures": self.num_failures.tolist(),
+        }
+
+    def report(self, names: list[str] = None):
+        """Print the summary of every policy."""
+        names = names if names is not None else [f"policy_{i}" for i in range(self.num_policies)]
+        summary = self.summary()
+        print(f"[MultiPolicyEvaluator] {self.num_steps} steps")
+        for i, name in enumerate(names):
+            print(
+                f"  {name:<40s} reward/step {summary['mean_step_reward'][i]:8.4f}"
+                f" | episodes {summary['episodes'][i]:6.0f} | failures {summary['failures'][i]:6.0f}"
+            )
+
+    def _act(self):
+        obs = self.task.get_observation()["policy"]
+        self.task.step(self.policy(obs))
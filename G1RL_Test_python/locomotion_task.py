@@ -1,16 +1,22 @@
 # define the locomotion task
+import math
+
 import torch
 import numpy as np
 
-from pxr import Gf, PhysicsSchemaTools
-import omni.usd
-
-from isaacsim.core.cloner import Cloner, GridCloner
-import isaacsim.core.utils.xforms as xform_utils 
-from isaacsim.core.prims import Articulation
-
+from .backends.base import SimulationBackend
+from .backends.isaac_backend import IsaacSimBackend
+from .managers import event_terms, reward_terms, termination_terms
+from .managers.action_manager import JointPositionActionManager
+from .managers.command_manager import VelocityCommandManager
+from .managers.event_manager import EventManager
+from .managers.reward_manager import RewardManager
+from .managers.termination_manager import TerminationManager
+from .terrain.height_sampler import HeightSampler, grid_pattern
+from .terrain.terrain_generator import TerrainGenerator
 from .utils.math_utils import quat_apply_inverse
-from .utils.circular_buffer import CircularBuffer
+from .utils.history_buffer import PackedHistoryBuffer
+from .utils.timer import SectionTimer
 
 class LocomotionTask:
     def __init__(self):
@@ -42,37 +48,189 @@ class LocomotionTask:
 
 
 class G1LocomotionTask(LocomotionTask):
-    def __init__(self):
+    def __init__(
+        self,
+        backend: SimulationBackend = None,
+        num_envs: int = 16,
+        env_spacing: float = 4.0,
+        decimation: int = 4,
+        terrain: TerrainGenerator = None,
+        device: str = "cuda:0",
+        dtype: torch.dtype = torch.float32,
+    ):
         super().__init__()
+        # the simulator is accessed through a backend (Isaac Sim by default, see backends/)
+        self.backend = backend if backend is not None else IsaacSimBackend()
+        # all persistent task state is allocated once on this device and with this dtype
+        self.device = device
+        self.dtype = dtype
+        # when True, any data crossing the task boundary on another device or dtype raises instead of being copied
+        self.strict_device = False
         self._g1_default_height = 0.8
-        self._num_envs = 16
-        self._env_spacing = 4.0
+        self._num_envs = num_envs
+        self._env_spacing = env_spacing
         self.articulation = None
         self.initialized = False
-        gravity_dir = torch.tensor([0.0, 0.0, -0.981])
+        gravity_dir = torch.tensor([0.0, 0.0, -0.981], dtype=self.dtype, device=self.device)
         self.gravity_vec_w = gravity_dir.repeat(self._num_envs, 1)
         
         # action scale and offset
         self.action_scale = 0.5
-        self.action_offset = torch.tensor([-0.1000, -0.1000, 0.0000, 0.0000, 0.0000, 0.0000, 0.0000, 0.0000, 0.3000, 0.3000, -0.2000, -0.2000, 0.0000, 0.0000], device='cuda:0')
+        self.action_offset = torch.tensor([-0.1000, -0.1000, 0.0000, 0.0000, 0.0000, 0.0000, 0.0000, 0.0000, 0.3000, 0.3000, -0.2000, -0.2000, 0.0000, 0.0000], dtype=self.dtype, device=self.device)
         self.joint_ids = [0, 1, 3, 4, 5, 6, 7, 8, 9, 10, 13, 14, 17, 18]
+        # index tensor of the controlled joints, converted for the articulation view once in initialize()
+        self._joint_indices = torch.tensor(self.joint_ids, dtype=torch.long, device=self.device)
+        self._sim_joint_indices = None
+        # action pipeline: clip (None to disable), low-pass weight of the new target (1.0 to disable), delay
+        self.action_clip = None
+        self.action_filter_alpha = 1.0
+        self.action_delay_steps = 0
+        # created in initialize(), once the number of dofs of the articulation is known
+        self.action_manager: JointPositionActionManager = None  # type: ignore
         self.joint_names = ['left_hip_pitch_joint', 'right_hip_pitch_joint', 'left_hip_roll_joint', 'right_hip_roll_joint', 'waist_roll_joint', 'left_hip_yaw_joint', 'right_hip_yaw_joint', 'waist_pitch_joint', 'left_knee_joint', 'right_knee_joint', 'left_ankle_pitch_joint', 'right_ankle_pitch_joint', 'left_ankle_roll_joint', 'right_ankle_roll_joint']
 
-        # history buffer
-        self.history_buffer = {
-            "base_ang_vel": CircularBuffer(max_len=5, batch_size=self._num_envs, device="cuda"),
-            "projected_gravity": CircularBuffer(max_len=5, batch_size=self._num_envs, device="cuda"),
-            "velocity_commands": CircularBuffer(max_len=5, batch_size=self._num_envs, device="cuda"),
-            "joint_vel": CircularBuffer(max_len=5, batch_size=self._num_envs, device="cuda"),
-            "joint_pos": CircularBuffer(max_len=5, batch_size=self._num_envs, device="cuda"),
-            "actions": CircularBuffer(max_len=5, batch_size=self._num_envs, device="cuda"),
-        } 
+        # history buffer: all terms share one packed tensor, flattened history is the policy input
+        self.history_length = 5
+        self.history_term_dims = {
+            "base_ang_vel": 3,
+            "projected_gravity": 3,
+            "velocity_commands": 3,
+            "joint_vel": len(self.joint_ids),
+            "joint_pos": len(self.joint_ids),
+            "actions": len(self.joint_ids),
+        }
+        self.history_buffer = PackedHistoryBuffer(
+            self.history_term_dims,
+            max_len=self.history_length,
+            batch_size=self._num_envs,
+            device=self.device,
+            dtype=self.dtype,
+        )
+
+        # last actions, part of the observation
+        self.actions = torch.zeros((self._num_envs, len(self.joint_ids)), dtype=self.dtype, device=self.device)
+        self.prev_actions = torch.zeros_like(self.actions)
+
+        # base and joint state in the body frame, updated by get_observation and read by the reward terms
+        self.base_lin_vel_b = torch.zeros((self._num_envs, 3), dtype=self.dtype, device=self.device)
+        self.base_ang_vel_b = torch.zeros((self._num_envs, 3), dtype=self.dtype, device=self.device)
+        self.projected_gravity_b = torch.zeros((self._num_envs, 3), dtype=self.dtype, device=self.device)
+        self.joint_efforts = torch.zeros((self._num_envs, len(self.joint_ids)), dtype=self.dtype, device=self.device)
+        self.joint_pos = torch.zeros((self._num_envs, len(self.joint_ids)), dtype=self.dtype, device=self.device)
+        self.joint_vel = torch.zeros((self._num_envs, len(self.joint_ids)), dtype=self.dtype, device=self.device)
+        # world-frame vectors rotated into the base frame in one call: gravity, angular and linear velocity
+        self._world_vectors = torch.zeros((self._num_envs, 3, 3), dtype=self.dtype, device=self.device)
+        self._world_vectors[:, 0] = self.gravity_vec_w
+        # per-section timings of update_state and get_observation, disabled by default
+        self.observation_timer = SectionTimer(enabled=False, device=self.device)
+        # timings of the scene creation, reported by set_up_scene
+        self.scene_timer = SectionTimer(enabled=True)
+
+        # control: the policy acts every `decimation` physics steps
+        self.decimation = decimation
+        self.physics_dt = self.backend.physics_dt
+        self.step_dt = self.physics_dt * self.decimation
+
+        # rewards
+        self.reward_manager = RewardManager(self._num_envs, self.step_dt, self.device, dtype=self.dtype)
+        self.reward_manager.add_term("track_lin_vel_xy_exp", reward_terms.track_lin_vel_xy_exp, 1.0, std=0.5)
+        self.reward_manager.add_term("track_ang_vel_z_exp", reward_terms.track_ang_vel_z_exp, 0.5, std=0.5)
+        self.reward_manager.add_term("lin_vel_z_l2", reward_terms.lin_vel_z_l2, -0.2)
+        self.reward_manager.add_term("ang_vel_xy_l2", reward_terms.ang_vel_xy_l2, -0.05)
+        self.reward_manager.add_term("flat_orientation_l2", reward_terms.flat_orientation_l2, -1.0)
+        self.reward_manager.add_term("joint_torques_l2", reward_terms.joint_torques_l2, -1.5e-7)
+        self.reward_manager.add_term("action_rate_l2", reward_terms.action_rate_l2, -0.005)
+        # note: feet_air_time needs foot contacts, which the articulation view does not provide
+
+        # terminations
+        self.max_episode_length_s = 20.0
+        self.max_episode_length = math.ceil(self.max_episode_length_s / self.step_dt)
+        self.episode_length_buf = torch.zeros(self._num_envs, dtype=torch.long, device=self.device)
+        self.termination_manager = TerminationManager(self._num_envs, self.device)
+        self.termination_manager.add_term("time_out", termination_terms.time_out, time_out=True)
+        self.termination_manager.add_term("base_height", termination_terms.base_height_below, minimum_height=0.3)
+        self.termination_manager.add_term("bad_orientation", termination_terms.bad_orientation, limit_angle=1.0)
+
+        # (vx, vy, yaw rate) commands, resampled at reset and on per-environment timers
+        self.command_manager = VelocityCommandManager(
+            self._num_envs,
+            lin_vel_x=(-1.0, 1.0),
+            lin_vel_y=(-0.5, 0.5),
+            ang_vel_z=(-1.0, 1.0),
+            resampling_time_range=(10.0, 10.0),
+            device=self.device,
+            dtype=self.dtype,
+        )
+        # part of the observation, updated in place by the command manager
+        self.velocity_commands = self.command_manager.command
+
+        # domain randomization, sampled per environment and written with batched articulation setters
+        self.event_manager = EventManager(self._num_envs, self.device)
+        self.event_manager.add_term(
+            "physics_material",
+            event_terms.randomize_friction,
+            mode="startup",
+            static_friction_range=(0.4, 1.0),
+            dynamic_friction_range=(0.4, 0.8),
+        )
+        self.event_manager.add_term(
+            "body_mass", event_terms.randomize_body_mass, mode="startup", mass_distribution_params=(0.9, 1.1)
+        )
+        self.event_manager.add_term(
+            "actuator_gains",
+            event_terms.randomize_actuator_gains,
+            mode="reset",
+            stiffness_distribution_params=(0.9, 1.1),
+            damping_distribution_params=(0.9, 1.1),
+        )
+        self.event_manager.add_term(
+            "push_robot",
+            event_terms.push_by_setting_velocity,
+            mode="interval",
+            interval_range_s=(10.0, 15.0),
+            velocity_range=event_terms.twist_range({"x": (-0.5, 0.5), "y": (-0.5, 0.5)}, self.device, self.dtype),
+        )
+
+        # root position and environment origins, used by the terminations and the resets
+        self.base_pos_w = torch.zeros((self._num_envs, 3), dtype=self.dtype, device=self.device)
+        self.base_quat_w = torch.zeros((self._num_envs, 4), dtype=self.dtype, device=self.device)
+        self.env_origins = torch.zeros((self._num_envs, 3), dtype=self.dtype, device=self.device)
+        self._all_env_ids = torch.arange(self._num_envs, device=self.device)
+        self.extras = {}
+
+        # terrain: flat ground plane if None, otherwise a tiled heightfield with a difficulty curriculum
+        self.terrain = terrain
+        self.max_init_terrain_level = 5
+        self.height_sampler: HeightSampler = None  # type: ignore
+        # height scan around the base (in its yaw frame), not part of the policy observation. It is computed on
+        # its first read after update_state(), so that it costs nothing without a consumer
+        self.height_scan_points = grid_pattern((1.6, 1.0), 0.1, device=self.device, dtype=self.dtype)
+        num_scan_points = len(self.height_scan_points)
+        self._height_scan = torch.zeros((self._num_envs, num_scan_points), dtype=self.dtype, device=self.device)
+        self._height_scan_is_stale = False
+        self.terrain_levels = torch.zeros(self._num_envs, dtype=torch.long, device=self.device)
+        self.terrain_types = torch.zeros(self._num_envs, dtype=torch.long, device=self.device)
+        self._terrain_origins: torch.Tensor = None  # type: ignore
 
     def reset(self):
         pass
     
     def step(self, action):
-        pass
+        if self.strict_device:
+            self._check_tensor(action, "action")
+        self.prev_actions.copy_(self.actions)
+        self.actions.copy_(action)
+        self.episode_length_buf += 1
+        self.event_manager.apply(self, "interval", dt=self.step_dt)
+        self.action_manager.process(self.actions)
+        self.apply_actions()
+
+    def apply_actions(self):
+        """Write the joint position targets of the last :meth:`step` to the articulation, for all joints at once.
+
+        Called after every control step, and at every physics step in between if the targets must be refreshed.
+        """
+        self.articulation.set_joint_position_targets(self.backend.to_sim(self.action_manager.joint_pos_targets))
     
     def get_observation(self):
         pass
@@ -84,42 +242,25 @@ class G1LocomotionTask(LocomotionTask):
         pass
 
     def set_up_scene(self):
-        stage = omni.usd.get_context().get_stage()
-        self.add_ground()
-        self.get_humanoid()
-
-        self._cloner = GridCloner(spacing=self._env_spacing)
-        self._cloner.define_base_env(self.default_base_env_path)
-
-        prim_paths = self._cloner.generate_paths("/World/envs/env", self._num_envs)
-        self._env_pos = self._cloner.clone(
-            source_prim_path="/World/envs/env_0", prim_paths=prim_paths, replicate_physics=True, copy_from_source=False
-        )
-
-        print("self._env_pos: ", self._env_pos)
-        for prim_path, pos in zip(prim_paths, self._env_pos):
-            print("prim_path: ", prim_path)
-            print("pos: ", pos)
-            translation = Gf.Vec3d(pos[0], pos[1], self._g1_default_height)
-            orientation = Gf.Quatd(1.0, 0.0, 0.0, 0.0)
-            prim = stage.GetPrimAtPath(prim_path + "/g1")
-            xform_utils.reset_and_set_xform_ops(prim, translation, orientation)
-
-    def add_ground(self):
-        PhysicsSchemaTools.addGroundPlane(
-            omni.usd.get_context().get_stage(), "/groundPlane", "Z", 1500, Gf.Vec3f(0, 0, 0), Gf.Vec3f(0.5)
-        )
-
-    def get_humanoid(self):
-        from .g1 import G1Robot
-        g1 = G1Robot(prim_path=self.default_zero_env_path + "/g1", name="g1")
-
+        self.scene_timer.reset()
+        self._env_pos = self.backend.set_up_scene(self)
+        with self.scene_timer.section("copy_env_origins"):
+            # one-time copy, the backend may return the origins on the host
+            env_pos = self._env_pos if isinstance(self._env_pos, torch.Tensor) else np.asarray(self._env_pos)
+            self.env_origins.copy_(torch.as_tensor(env_pos, dtype=self.dtype, device=self.device))
+        if self.terrain is not None:
+            with self.scene_timer.section("terrain_origins"):
+                self._set_up_terrain_origins()
+        self.scene_timer.report(f"scene setup of {self._num_envs} envs")
 
     def initialize(self):
-        self.articulation = Articulation(
-            prim_paths_expr="/World/envs/.*/g1", name="humanoid_view", reset_xform_properties=False
-        )
-        self.articulation.initialize()
+        self.articulation = self.backend.create_articulation(self)
+        if not self._on_task_device(torch.device(self.backend.device)):
+            message = f"simulation device {self.backend.device} differs from task device {self.device}"
+            if self.strict_device:
+                raise RuntimeError(f"[G1LocomotionTask] {message}")
+            print(f"[G1LocomotionTask] warning: {message}, state is copied at every step")
+        self._sim_joint_indices = self.backend.to_sim(self._joint_indices)
 
         print("[G1LocomotionTask] num_dof", self.articulation.num_dof)
         print("[G1LocomotionTask] num_bodies", self.articulation.num_bodies)
@@ -135,18 +276,40 @@ class G1LocomotionTask(LocomotionTask):
         print("[G1LocomotionTask] joint_velocities", joint_velocities)
 
         # set default joint positions
-        default_joint_positions = torch.zeros((self._num_envs, self.articulation.num_dof), device='cuda:0')
-        
+        default_joint_positions = torch.zeros(
+            (self._num_envs, self.articulation.num_dof), dtype=self.dtype, device=self.device
+        )
+
         # apply action_offset according to joint_ids
-        default_joint_positions[:, self.joint_ids] = self.action_offset        
-        default_velocities=np.zeros((self._num_envs, self.articulation.num_dof))
-        default_efforts = np.zeros((self._num_envs, self.articulation.num_dof))
+        default_joint_positions[:, self._joint_indices] = self.action_offset
+        default_velocities = torch.zeros_like(default_joint_positions)
         self.articulation.set_joints_default_state(
-            positions = default_joint_positions.cpu().data, 
-            velocities = default_velocities, 
-            efforts = default_efforts
+            positions=self.backend.to_sim(default_joint_positions),
+            velocities=self.backend.to_sim(default_velocities),
+            efforts=self.backend.to_sim(torch.zeros_like(default_joint_positions)),
         )
 
+        # default state written by the partial resets
+        self.default_joint_pos = default_joint_positions
+        self._default_joint_vel = default_velocities
+        self._default_root_quat = torch.zeros((self._num_envs, 4), dtype=self.dtype, device=self.device)
+        self._default_root_quat[:, 0] = 1.0
+        self._default_root_vel = torch.zeros((self._num_envs, 6), dtype=self.dtype, device=self.device)
+
+        self.action_manager = JointPositionActionManager(
+            self._num_envs,
+            self.articulation.num_dof,
+            self._joint_indices,
+            scale=self.action_scale,
+            offset=self.action_offset,
+            clip=self.action_clip,
+            filter_alpha=self.action_filter_alpha,
+            delay_steps=self.action_delay_steps,
+            device=self.device,
+            dtype=self.dtype,
+        )
+        self.action_manager.set_default_targets(default_joint_positions)
+        self.event_manager.apply(self, "startup")
 
         self.initialized = True
 
@@ -154,41 +317,208 @@ class G1LocomotionTask(LocomotionTask):
         if not self.initialized:
             self.initialize()
 
-        self.articulation.post_reset()
-    
-    def get_observation(self):
+        self.reset_idx(None)
 
-        root_velocities = self.articulation.get_velocities()
-        root_angular_velocities = root_velocities[:, 3:]
-        root_linear_velocities = root_velocities[:, :3]
+    def reset_idx(self, env_ids: torch.Tensor = None):
+        """Reset the given environments (all if None), leaving the others untouched."""
+        if env_ids is None:
+            env_ids = self._all_env_ids
+        num_resets = len(env_ids)
 
-        joint_positions = self.articulation.get_joint_positions(joint_indices=self.joint_ids)
-        joint_velocities = self.articulation.get_joint_velocities(joint_indices=self.joint_ids)
-        positions, orientations = self.articulation.get_local_poses()
-        world_pos, world_orient = self.articulation.get_world_poses()
+        to_sim = self.backend.to_sim
+        sim_env_ids = to_sim(env_ids)
 
-        projected_gravity_b = quat_apply_inverse(torch.Tensor(world_orient), self.gravity_vec_w)
+        # terrain curriculum, before the new episodes are placed on their tiles
+        if self.terrain is not None:
+            self.update_terrain_levels(env_ids)
 
-        root_com_ang_vel_b = quat_apply_inverse(torch.Tensor(world_orient), torch.Tensor(root_angular_velocities))
+        # root state
+        root_pos = self.env_origins[env_ids]
+        root_pos[:, 2] += self._g1_default_height
+        self.articulation.set_world_poses(
+            to_sim(root_pos), to_sim(self._default_root_quat[:num_resets]), indices=sim_env_ids
+        )
+        self.articulation.set_velocities(to_sim(self._default_root_vel[:num_resets]), indices=sim_env_ids)
+
+        # joint state
+        default_joint_pos = self.default_joint_pos[env_ids]
+        joint_pos = to_sim(default_joint_pos)
+        self.articulation.set_joint_positions(joint_pos, indices=sim_env_ids)
+        self.articulation.set_joint_velocities(to_sim(self._default_joint_vel[:num_resets]), indices=sim_env_ids)
+        self.articulation.set_joint_position_targets(joint_pos, indices=sim_env_ids)
+        self.event_manager.apply(self, "reset", env_ids)
+
+        # task buffers
+        self.action_manager.reset(env_ids, default_joint_pos)
+        self.history_buffer.reset(env_ids)
+        self.actions[env_ids] = 0.0
+        self.prev_actions[env_ids] = 0.0
+        self.command_manager.reset(env_ids)
+        self.event_manager.reset(env_ids)
+        self.extras["log"] = {**self.reward_manager.reset(env_ids), **self.termination_manager.reset(env_ids)}
+        if self.terrain is not None:
+            self.extras["log"]["Curriculum/terrain_levels"] = self.terrain_levels.float().mean()
+        self.episode_length_buf[env_ids] = 0
+
+    def update_state(self):
+        """Read the articulation state of all environments into the task buffers.
+
+        The root and joint states are fetched once, and the gravity and the root velocities are rotated into
+        the base frame with a single batched quaternion call.
+        """
+        timer = self.observation_timer
+        with timer.section("read_root_state"):
+            root_velocities = self._as_tensor(self.articulation.get_velocities())
+            world_pos, world_orient = self.articulation.get_world_poses()
+            world_orient = self._as_tensor(world_orient)
+            self.base_pos_w.copy_(self._as_tensor(world_pos))
+            self.base_quat_w.copy_(world_orient)
+
+        with timer.section("read_joint_state"):
+            joint_indices = self._sim_joint_indices
+            self.joint_pos.copy_(self._as_tensor(self.articulation.get_joint_positions(joint_indices=joint_indices)))
+            self.joint_vel.copy_(self._as_tensor(self.articulation.get_joint_velocities(joint_indices=joint_indices)))
+            joint_efforts = self.articulation.get_measured_joint_efforts(joint_indices=joint_indices)
+            self.joint_efforts.copy_(self._as_tensor(joint_efforts))
+
+        with timer.section("base_frame_transforms"):
+            # rows of the world vectors: gravity (constant), angular velocity, linear velocity
+            self._world_vectors[:, 1].copy_(root_velocities[:, 3:])
+            self._world_vectors[:, 2].copy_(root_velocities[:, :3])
+            body_vectors = quat_apply_inverse(world_orient.unsqueeze(1).expand(-1, 3, -1), self._world_vectors)
+            self.projected_gravity_b.copy_(body_vectors[:, 0])
+            self.base_ang_vel_b.copy_(body_vectors[:, 1])
+            self.base_lin_vel_b.copy_(body_vectors[:, 2])
+
+        # the height scan of the new state is computed on its next read
+        self._height_scan_is_stale = self.height_sampler is not None
+
+    @property
+    def height_scan(self) -> torch.Tensor:
+        """Height of the base above the terrain at the scan points. Shape is (num_envs, num_points).
+
+        Computed on the first read after :meth:`update_state`, in place. Zeros on flat ground.
+        """
+        if self._height_scan_is_stale:
+            with self.observation_timer.section("height_scan"):
+                self._height_scan.copy_(self.compute_height_scan())
+            self._height_scan_is_stale = False
+        return self._height_scan
+
+    def compute_height_scan(self) -> torch.Tensor:
+        """Height of the base above the terrain at the scan points of all environments.
+
+        The scan points are rotated by the yaw of the base only, and all environments are sampled in one
+        batched lookup. Shape is (num_envs, num_points).
+        """
+        w, x, y, z = self.base_quat_w.unbind(-1)
+        yaw = torch.atan2(2.0 * (w * z + x * y), 1.0 - 2.0 * (y * y + z * z))
+        cos_yaw, sin_yaw = torch.cos(yaw).unsqueeze(-1), torch.sin(yaw).unsqueeze(-1)
+        px, py = self.height_scan_points[:, 0], self.height_scan_points[:, 1]
+        points_xy = torch.stack(
+            (
+                self.base_pos_w[:, 0:1] + cos_yaw * px - sin_yaw * py,
+                self.base_pos_w[:, 1:2] + sin_yaw * px + cos_yaw * py,
+            ),
+            dim=-1,
+        )
+        return self.base_pos_w[:, 2:3] - self.height_sampler.sample(points_xy)
+
+    def update_terrain_levels(self, env_ids: torch.Tensor):
+        """Move the given environments to a harder or easier terrain level, and update their origins.
+
+        Environments that walked farther than half a tile move up a level, those that walked less than half
+        the distance of their command move down. Environments that solve the last level are sent to a random
+        level. Environments that have not stepped yet (first reset) keep their level.
+        """
+        distance = torch.norm(self.base_pos_w[env_ids, :2] - self.env_origins[env_ids, :2], dim=1)
+        move_up = distance > 0.5 * self.terrain.size[0]
+        commanded = torch.norm(self.velocity_commands[env_ids, :2], dim=1) * self.max_episode_length_s
+        move_down = (distance < 0.5 * commanded) & ~move_up
+        started = self.episode_length_buf[env_ids] > 0
+        levels = self.terrain_levels[env_ids] + (move_up & started).long() - (move_down & started).long()
+        num_levels = self.terrain.num_rows
+        levels = torch.where(levels >= num_levels, torch.randint_like(levels, num_levels), levels.clamp(min=0))
+        self.terrain_levels[env_ids] = levels
+        self.env_origins[env_ids] = self._terrain_origins[levels, self.terrain_types[env_ids]]
+
+    def update_commands(self):
+        """Advance the velocity commands by one control step: resample the expired ones, update the heading control.
+
+        Called once per control step, after the rewards and resets of the step and before :meth:`get_observation`.
+        """
+        self.command_manager.compute(self.step_dt, self.base_quat_w)
+
+    def get_observation(self):
+        """Write the observation terms of the current state into the history, see :meth:`update_state`.
+
+        The terms are written in place into the staging slots of :attr:`history_buffer`, and the returned
+        policy observation is a view of the history. The velocity commands are only read: they are advanced by
+        :meth:`update_commands`.
+        """
+        timer = self.observation_timer
+        history = self.history_buffer
+        with timer.section("base_ang_vel"):
+            history.step_view("base_ang_vel").copy_(self.base_ang_vel_b)
+        with timer.section("projected_gravity"):
+            history.step_view("projected_gravity").copy_(self.projected_gravity_b)
+        with timer.section("velocity_commands"):
+            history.step_view("velocity_commands").copy_(self.velocity_commands)
+        with timer.section("joint_vel"):
+            history.step_view("joint_vel").copy_(self.joint_vel)
+        with timer.section("joint_pos"):
+            torch.sub(self.joint_pos, self.action_offset, out=history.step_view("joint_pos"))
+        with timer.section("actions"):
+            history.step_view("actions").copy_(self.actions)
+        with timer.section("history_append"):
+            history.append()
 
         obs = {
-            # "root_linear_velocities": root_linear_velocities,
-            # "root_angular_velocities": root_angular_velocities,
-            # "joint_positions": joint_positions,
-            # "joint_velocities": joint_velocities,
-            # "positions": positions,
-            # "orientations": orientations,
-            "projected_gravity_b": projected_gravity_b,
-            "root_com_ang_vel_b": root_com_ang_vel_b
+            "policy": self.get_history_observation(),
+            "projected_gravity_b": self.projected_gravity_b,
+            "root_com_ang_vel_b": self.base_ang_vel_b,
         }
-
-        print("[G1LocomotionTask] obs", obs)
         return obs
 
+    def _set_up_terrain_origins(self):
+        # environments are spread evenly over the terrain types, and start on a random easy level
+        terrain = self.terrain
+        self._terrain_origins = torch.as_tensor(terrain.tile_origins, dtype=self.dtype, device=self.device)
+        max_init_level = min(self.max_init_terrain_level, terrain.num_rows - 1)
+        self.terrain_levels.copy_(torch.randint(0, max_init_level + 1, (self._num_envs,), device=self.device))
+        self.terrain_types.copy_(torch.div(self._all_env_ids * terrain.num_cols, self._num_envs, rounding_mode="floor"))
+        self.env_origins.copy_(self._terrain_origins[self.terrain_levels, self.terrain_types])
+        self.height_sampler = HeightSampler.from_terrain(terrain, device=self.device, dtype=self.dtype)
+
+    def _as_tensor(self, data) -> torch.Tensor:
+        # articulation views return tensors on the sim device (torch backend) or NumPy arrays (numpy backend)
+        if self.strict_device:
+            self._check_tensor(data, "articulation data")
+        return torch.as_tensor(data, dtype=self.dtype, device=self.device)
+
+    def _check_tensor(self, data, name: str):
+        """Raise if ``data`` would be implicitly copied to the task device or cast to the task dtype."""
+        if not isinstance(data, torch.Tensor):
+            raise RuntimeError(f"[G1LocomotionTask] {name} is a {type(data).__name__}, expected a torch.Tensor")
+        if not self._on_task_device(data.device):
+            raise RuntimeError(f"[G1LocomotionTask] {name} is on {data.device}, expected {self.device}")
+        if data.dtype != self.dtype:
+            raise RuntimeError(f"[G1LocomotionTask] {name} has dtype {data.dtype}, expected {self.dtype}")
+
+    def _on_task_device(self, device: torch.device) -> bool:
+        task_device = torch.device(self.device)
+        if device.type != task_device.type:
+            return False
+        # an unindexed device ("cuda") matches any index
+        return task_device.index is None or device.index is None or device.index == task_device.index
+
+    def get_history_observation(self):
+        """Flattened observation history of shape (num_envs, history_length * step_dim), fed to the policy."""
+        return self.history_buffer.buffer
 
     def get_reward(self):
-        pass
+        return self.reward_manager.compute(self)
 
     def is_done(self):
-        pass
-        
\ No newline at end of file
+        return self.termination_manager.compute(self)
+        
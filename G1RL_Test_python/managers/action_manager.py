@@ -0,0 +1,132 @@
+import torch
+from collections.abc import Sequence
+
+
+class JointPositionActionManager:
+    """Processing of the policy actions into joint position targets, for all environments at once.
+
+    The actions of the controlled joints go through a fixed pipeline: clip, scale, offset, an optional
+    first-order low-pass filter and an optional delay of a whole number of control steps. The result is
+    scattered into a preallocated (num_envs, num_dof) target tensor, in which the other joints hold their
+    default position, so the targets are applied to the articulation in a single call without joint indices.
+
+    :meth:`process` runs once per control step, :attr:`joint_pos_targets` is applied at every physics step.
+    Both reuse their buffers and do not allocate.
+    """
+
+    def __init__(
+        self,
+        num_envs: int,
+        num_dof: int,
+        joint_ids: Sequence[int] | torch.Tensor,
+        scale: float | torch.Tensor,
+        offset: float | torch.Tensor,
+        clip: float | None = None,
+        filter_alpha: float = 1.0,
+        delay_steps: int = 0,
+        device: str = "cpu",
+        dtype: torch.dtype = torch.float32,
+    ):
+        """Initialize the action manager.
+
+        Args:
+            num_envs: The number of environments.
+            num_dof: The number of degrees of freedom of the articulation.
+            joint_ids: The indices of the controlled joints in the articulation. Shape is (action_dim,).
+            scale: The scale of the actions, a scalar or a tensor of shape (action_dim,).
+            offset: The offset of the scaled actions, a scalar or a tensor of shape (action_dim,).
+            clip: If set, the raw actions are clipped to [-clip, clip]. Defaults to None.
+            filter_alpha: Weight of the new target in the low-pass filter. 1.0 disables the filter.
+                Defaults to 1.0.
+            delay_steps: The number of control steps by which the targets are delayed. Defaults to 0.
+            device: The device used for processing. Defaults to "cpu".
+            dtype: The data type of the actions and targets. Defaults to float32.
+
+        Raises:
+            ValueError: If the filter weight is not in (0, 1] or the delay is negative.
+        """
+        if not 0.0 < filter_alpha <= 1.0:
+            raise ValueError(f"The filter weight should be in (0, 1]. Received: {filter_alpha}.")
+        if delay_steps < 0:
+            raise ValueError(f"The delay should be non-negative. Received: {delay_steps}.")
+        self._num_envs = num_envs
+        self._device = device
+        self._joint_indices = torch.as_tensor(joint_ids, dtype=torch.long, device=device)
+        self._action_dim = len(self._joint_indices)
+        self._scale = torch.as_tensor(scale, dtype=dtype, device=device).expand(self._action_dim).clone()
+        self._offset = torch.as_tensor(offset, dtype=dtype, device=device).expand(self._action_dim).clone()
+        self._clip = clip
+        self._filter_alpha = filter_alpha
+        self._delay_steps = delay_steps
+
+        self._raw_actions = torch.zeros((num_envs, self._action_dim), dtype=dtype, device=device)
+        self._processed_actions = torch.zeros_like(self._raw_actions)
+        # filter state, starting at the offset (the target of a zero action)
+        self._filtered_actions = self._offset.repeat(num_envs, 1)
+        # ring of the last delay_steps + 1 targets, the slot after the newest one holds the delayed target
+        self._delay_buffer = self._offset.repeat(delay_steps + 1, num_envs, 1)
+        self._delay_pointer = 0
+        self._joint_pos_targets = torch.zeros((num_envs, num_dof), dtype=dtype, device=device)
+
+    """
+    Properties.
+    """
+
+    @property
+    def action_dim(self) -> int:
+        return self._action_dim
+
+    @property
+    def raw_actions(self) -> torch.Tensor:
+        """The actions of the last call to :meth:`process`. Shape is (num_envs, action_dim)."""
+        return self._raw_actions
+
+    @property
+    def joint_pos_targets(self) -> torch.Tensor:
+        """The position targets of all joints. Shape is (num_envs, num_dof)."""
+        return self._joint_pos_targets
+
+    """
+    Operations.
+    """
+
+    def set_default_targets(self, default_joint_pos: torch.Tensor):
+        """Set the targets of all joints, e.g. to the default joint positions. Shape is (num_envs, num_dof)."""
+        self._joint_pos_targets.copy_(default_joint_pos)
+
+    def process(self, actions: torch.Tensor):
+        """Process the actions of the policy into :attr:`joint_pos_targets`.
+
+        Args:
+            actions: The actions of the controlled joints. Shape is (num_envs, action_dim).
+        """
+        self._raw_actions.copy_(actions)
+        targets = self._processed_actions
+        if self._clip is not None:
+            torch.clamp(self._raw_actions, -self._clip, self._clip, out=targets)
+        else:
+            targets.copy_(self._raw_actions)
+        targets.mul_(self._scale).add_(self._offset)
+
+        if self._filter_alpha < 1.0:
+            self._filtered_actions.lerp_(targets, self._filter_alpha)
+            targets = self._filtered_actions
+        if self._delay_steps > 0:
+            self._delay_buffer[self._delay_pointer].copy_(targets)
+            self._delay_pointer = (self._delay_pointer + 1) % (self._delay_steps + 1)
+            targets = self._delay_buffer[self._delay_pointer]
+
+        self._joint_pos_targets.index_copy_(1, self._joint_indices, targets)
+
+    def reset(self, env_ids: torch.Tensor, default_joint_pos: torch.Tensor):
+        """Reset the pipeline state and the targets of the given environments.
+
+        Args:
+            env_ids: The environments to reset.
+            default_joint_pos: The default positions of all joints of these environments.
+                Shape is (len(env_ids), num_dof).
+        """
+        self._raw_actions[env_ids] = 0.0
+        self._filtered_actions[env_ids] = self._offset
+        self._delay_buffer[:, env_ids] = self._offset
+        self._joint_pos_targets[env_ids] = default_joint_pos
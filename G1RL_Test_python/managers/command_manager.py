@@ -0,0 +1,194 @@
+import math
+
+import torch
+from collections.abc import Sequence
+
+from ..utils.math_utils import sample_uniform, wrap_to_pi
+
+
+class VelocityCommandManager:
+    """Uniformly sampled (vx, vy, yaw rate) velocity commands of all environments.
+
+    Every environment resamples its command when its timer runs out, with a resampling time drawn from
+    ``resampling_time_range``. The timers, the resampling and the heading control are updated with masked
+    tensor operations over all environments, so :meth:`compute` needs neither Python loops nor host
+    synchronization. Outside of heading mode, it also allocates no tensor: the candidate samples are drawn into
+    buffers that are reused at every step.
+
+    In heading mode, a fraction of the environments track a sampled heading instead of a yaw rate: their yaw
+    rate command is proportional to the wrapped heading error. A fraction of the environments can also be
+    commanded to stand still. The sampling ranges can be changed during training, e.g. by a curriculum,
+    with :meth:`set_ranges` and :meth:`expand_ranges`.
+    """
+
+    range_names = ("lin_vel_x", "lin_vel_y", "ang_vel_z", "heading")
+
+    def __init__(
+        self,
+        num_envs: int,
+        lin_vel_x: tuple[float, float] = (-1.0, 1.0),
+        lin_vel_y: tuple[float, float] = (-0.5, 0.5),
+        ang_vel_z: tuple[float, float] = (-1.0, 1.0),
+        heading: tuple[float, float] = (-math.pi, math.pi),
+        resampling_time_range: tuple[float, float] = (10.0, 10.0),
+        heading_command: bool = False,
+        heading_control_stiffness: float = 0.5,
+        rel_heading_envs: float = 1.0,
+        rel_standing_envs: float = 0.0,
+        device: str = "cpu",
+        dtype: torch.dtype = torch.float32,
+    ):
+        """Initialize the command manager.
+
+        Args:
+            num_envs: The number of environments.
+            lin_vel_x: The range of the forward velocity command in m/s. Defaults to (-1.0, 1.0).
+            lin_vel_y: The range of the lateral velocity command in m/s. Defaults to (-0.5, 0.5).
+            ang_vel_z: The range of the yaw rate command in rad/s. Defaults to (-1.0, 1.0).
+            heading: The range of the heading target in rad, used in heading mode. Defaults to (-pi, pi).
+            resampling_time_range: The range of the time between two resamplings in seconds.
+                Defaults to (10.0, 10.0).
+            heading_command: Whether to use heading mode. Defaults to False.
+            heading_control_stiffness: The gain from heading error to yaw rate command. Defaults to 0.5.
+            rel_heading_envs: The fraction of environments in heading mode. Defaults to 1.0.
+            rel_standing_envs: The fraction of environments commanded to stand still. Defaults to 0.0.
+            device: The device used for processing. Defaults to "cpu".
+            dtype: The data type of the commands. Defaults to float32.
+        """
+        self._num_envs = num_envs
+        self._device = device
+        self._dtype = dtype
+        self.resampling_time_range = resampling_time_range
+        self.heading_command = heading_command
+        self.heading_control_stiffness = heading_control_stiffness
+        self.rel_heading_envs = rel_heading_envs
+        self.rel_standing_envs = rel_standing_envs
+
+        # sampling ranges, one column per name of `range_names`
+        ranges = (lin_vel_x, lin_vel_y, ang_vel_z, heading)
+        self._lower = torch.tensor([r[0] for r in ranges], dtype=dtype, device=device)
+        self._upper = torch.tensor([r[1] for r in ranges], dtype=dtype, device=device)
+
+        self._command = torch.zeros((num_envs, 3), dtype=dtype, device=device)
+        self._heading_target = torch.zeros(num_envs, dtype=dtype, device=device)
+        self._time_left = torch.zeros(num_envs, dtype=dtype, device=device)
+        self._is_heading_env = torch.zeros(num_envs, dtype=torch.bool, device=device)
+        self._is_standing_env = torch.zeros(num_envs, dtype=torch.bool, device=device)
+        # buffers of the candidate samples of compute()
+        self._samples = torch.zeros((num_envs, len(self.range_names)), dtype=dtype, device=device)
+        self._uniform = torch.zeros(num_envs, dtype=dtype, device=device)
+        self._resample = torch.zeros(num_envs, dtype=torch.bool, device=device)
+        self._mask = torch.zeros(num_envs, dtype=torch.bool, device=device)
+
+    """
+    Properties.
+    """
+
+    @property
+    def command(self) -> torch.Tensor:
+        """The (vx, vy, yaw rate) command in the base frame. Shape is (num_envs, 3). Updated in place."""
+        return self._command
+
+    @property
+    def heading_target(self) -> torch.Tensor:
+        """The heading target in the world frame, used in heading mode. Shape is (num_envs,)."""
+        return self._heading_target
+
+    @property
+    def ranges(self) -> dict[str, tuple[float, float]]:
+        """The current sampling ranges. Reading them synchronizes with the device."""
+        lower, upper = self._lower.tolist(), self._upper.tolist()
+        return {name: (lower[i], upper[i]) for i, name in enumerate(self.range_names)}
+
+    """
+    Operations.
+    """
+
+    def set_ranges(self, **ranges: tuple[float, float]):
+        """Set the sampling ranges, e.g. ``set_ranges(lin_vel_x=(-2.0, 2.0))``. Applies from the next resampling.
+
+        Raises:
+            ValueError: If a range name is unknown.
+        """
+        for name, (lower, upper) in ranges.items():
+            if name not in self.range_names:
+                raise ValueError(f"Unknown command range '{name}'. Available: {self.range_names}.")
+            index = self.range_names.index(name)
+            self._lower[index] = lower
+            self._upper[index] = upper
+
+    def expand_ranges(self, delta: Sequence[float], max_ranges: dict[str, tuple[float, float]]):
+        """Widen the sampling ranges on both sides, without exceeding the given limits.
+
+        Args:
+            delta: The widening of every range, in the order of :attr:`range_names`.
+            max_ranges: The limits of the ranges. Ranges without a limit are not widened.
+        """
+        delta = torch.as_tensor(delta, dtype=self._dtype, device=self._device)
+        for name, (lower, upper) in max_ranges.items():
+            index = self.range_names.index(name)
+            self._lower[index] = torch.clamp(self._lower[index] - delta[index], min=lower)
+            self._upper[index] = torch.clamp(self._upper[index] + delta[index], max=upper)
+
+    def compute(self, dt: float, base_quat_w: torch.Tensor = None):
+        """Advance the timers by ``dt``, resample the expired commands and update the heading control.
+
+        Args:
+            dt: The time since the last call in seconds.
+            base_quat_w: The base orientation (w, x, y, z) in the world frame. Shape is (num_envs, 4).
+                Required in heading mode.
+        """
+        self._time_left -= dt
+        resample = torch.le(self._time_left, 0.0, out=self._resample)
+        # candidate samples for all environments, kept where the timer expired
+        samples = self._sample(self._num_envs, out=self._samples)
+        torch.where(resample.unsqueeze(-1), samples[:, :3], self._command, out=self._command)
+        torch.where(resample, samples[:, 3], self._heading_target, out=self._heading_target)
+        time_left = self._sample_time(self._num_envs, out=self._uniform)
+        torch.where(resample, time_left, self._time_left, out=self._time_left)
+        is_heading_env = self._sample_mask(self.rel_heading_envs, out=self._mask)
+        torch.where(resample, is_heading_env, self._is_heading_env, out=self._is_heading_env)
+        is_standing_env = self._sample_mask(self.rel_standing_envs, out=self._mask)
+        torch.where(resample, is_standing_env, self._is_standing_env, out=self._is_standing_env)
+
+        if self.heading_command:
+            # yaw of the base: atan2 of the rotated x-axis
+            w, x, y, z = base_quat_w.unbind(-1)
+            heading = torch.atan2(2.0 * (w * z + x * y), 1.0 - 2.0 * (y * y + z * z))
+            yaw_rate = self.heading_control_stiffness * wrap_to_pi(self._heading_target - heading)
+            yaw_rate = torch.clamp(yaw_rate, min=self._lower[2], max=self._upper[2])
+            self._command[:, 2] = torch.where(self._is_heading_env, yaw_rate, self._command[:, 2])
+        self._command.masked_fill_(self._is_standing_env.unsqueeze(-1), 0.0)
+
+    def reset(self, env_ids: torch.Tensor):
+        """Resample the commands and timers of the given environments."""
+        num_envs = len(env_ids)
+        samples = self._sample(num_envs)
+        self._command[env_ids] = samples[:, :3]
+        self._heading_target[env_ids] = samples[:, 3]
+        self._time_left[env_ids] = self._sample_time(num_envs)
+        self._is_heading_env[env_ids] = self._sample_mask(self.rel_heading_envs, num_envs)
+        is_standing_env = self._sample_mask(self.rel_standing_envs, num_envs)
+        self._is_standing_env[env_ids] = is_standing_env
+        self._command[env_ids] = self._command[env_ids].masked_fill(is_standing_env.unsqueeze(-1), 0.0)
+
+    """
+    Helpers.
+    """
+
+    def _sample(self, num_envs: int, out: torch.Tensor = None) -> torch.Tensor:
+        size = (num_envs, len(self.range_names))
+        return sample_uniform(self._lower, self._upper, size, device=self._device, out=out)
+
+    def _sample_time(self, num_envs: int, out: torch.Tensor = None) -> torch.Tensor:
+        lower, upper = self.resampling_time_range
+        if out is not None:
+            return sample_uniform(lower, upper, num_envs, device=self._device, out=out)
+        return sample_uniform(lower, upper, num_envs, device=self._device).to(self._dtype)
+
+    def _sample_mask(self, fraction: float, num_envs: int = None, out: torch.Tensor = None) -> torch.Tensor:
+        if out is not None:
+            # the uniform buffer is free again once the timers are resampled
+            return torch.lt(self._uniform.uniform_(), fraction, out=out)
+        num_envs = num_envs if num_envs is not None else self._num_envs
+        return torch.rand(num_envs, device=self._device) < fraction
@@ -0,0 +1,146 @@
+import torch
+from collections.abc import Callable, Sequence
+
+from ..utils.math_utils import sample_uniform
+
+
+class EventManager:
+    """Named randomization events, applied to batches of environments through the articulation view.
+
+    Every term is a function ``func(task, env_ids, **params)`` that samples new values for the given
+    environments as tensors and writes them with one batched setter call. A term runs in one of three modes:
+
+    - ``"startup"``: once for all environments, after the articulation is initialized.
+    - ``"reset"``: for the environments being reset.
+    - ``"interval"``: for the environments whose timer ran out. Every environment has its own timer, drawn
+      from ``interval_range_s`` and advanced by :meth:`apply` with the time since the last call. A lower bound
+      of the earliest timer is kept on the host, so that the due environments are only looked up (and the
+      device synchronized) once an environment can be due. The term is not called when none is.
+    """
+
+    modes = ("startup", "reset", "interval")
+
+    def __init__(self, num_envs: int, device: str):
+        """Initialize the event manager.
+
+        Args:
+            num_envs: The number of environments.
+            device: The device used for processing.
+        """
+        self._num_envs = num_envs
+        self._device = device
+        # when False, apply() does nothing, e.g. to evaluate a policy without randomization
+        self.enabled = True
+
+        self._term_names: dict[str, list[str]] = {mode: [] for mode in self.modes}
+        self._term_funcs: dict[str, list[Callable[..., None]]] = {mode: [] for mode in self.modes}
+        self._term_params: dict[str, list[dict]] = {mode: [] for mode in self.modes}
+        self._interval_ranges: list[tuple[float, float]] = []
+        self._time_left: list[torch.Tensor] = []
+        # lower bound of the smallest timer of every interval term, on the host
+        self._next_due: list[float] = []
+        # nominal values read once from the simulation, e.g. the masses scaled by the mass randomization
+        self._default_state: dict[str, object] = {}
+
+    """
+    Properties.
+    """
+
+    @property
+    def term_names(self) -> dict[str, list[str]]:
+        """The names of the registered terms of every mode."""
+        return {mode: list(names) for mode, names in self._term_names.items()}
+
+    """
+    Operations.
+    """
+
+    def add_term(
+        self,
+        name: str,
+        func: Callable[..., None],
+        mode: str,
+        interval_range_s: tuple[float, float] = None,
+        **params,
+    ):
+        """Register an event term.
+
+        Args:
+            name: The name of the term.
+            func: The function applying the event to the environments ``env_ids`` of the task.
+            mode: The mode of the term, one of :attr:`modes`.
+            interval_range_s: The range of the time between two events of an environment in seconds.
+                Required for the interval mode.
+            params: Additional keyword arguments passed to ``func``.
+
+        Raises:
+            ValueError: If the mode is unknown, the name is already registered or the interval is missing.
+        """
+        if mode not in self.modes:
+            raise ValueError(f"Unknown event mode '{mode}'. Available: {self.modes}.")
+        if any(name in names for names in self._term_names.values()):
+            raise ValueError(f"The event term '{name}' is already registered.")
+        if mode == "interval":
+            if interval_range_s is None:
+                raise ValueError(f"The interval event term '{name}' requires an interval range.")
+            self._interval_ranges.append(interval_range_s)
+            self._time_left.append(self._sample_time(interval_range_s, self._num_envs))
+            self._next_due.append(interval_range_s[0])
+        self._term_names[mode].append(name)
+        self._term_funcs[mode].append(func)
+        self._term_params[mode].append(params)
+
+    def apply(self, task, mode: str, env_ids: torch.Tensor = None, dt: float = None):
+        """Apply the terms of a mode.
+
+        Args:
+            task: The task passed to the terms.
+            mode: The mode of the terms to apply.
+            env_ids: The environments of the startup and reset modes. Defaults to None (all environments).
+            dt: The time since the last call in seconds. Required for the interval mode.
+        """
+        if not self.enabled:
+            return
+        if mode == "interval":
+            self._apply_interval(task, dt)
+            return
+        if env_ids is None:
+            env_ids = torch.arange(self._num_envs, device=self._device)
+        for func, params in zip(self._term_funcs[mode], self._term_params[mode]):
+            func(task, env_ids, **params)
+
+    def reset(self, env_ids: Sequence[int] | torch.Tensor | None = None):
+        """Restart the interval timers of the given environments (all if None)."""
+        if env_ids is None:
+            env_ids = slice(None)
+        num_envs = self._num_envs if isinstance(env_ids, slice) else len(env_ids)
+        for i, (interval_range_s, time_left) in enumerate(zip(self._interval_ranges, self._time_left)):
+            time_left[env_ids] = self._sample_time(interval_range_s, num_envs)
+            self._next_due[i] = min(self._next_due[i], interval_range_s[0])
+
+    def default_state(self, key: str, getter: Callable[[], object]):
+        """The value cached under ``key``, read with ``getter`` on the first call."""
+        if key not in self._default_state:
+            self._default_state[key] = getter()
+        return self._default_state[key]
+
+    """
+    Helpers.
+    """
+
+    def _apply_interval(self, task, dt: float):
+        terms = zip(self._term_funcs["interval"], self._term_params["interval"], self._interval_ranges, self._time_left)
+        for i, (func, params, interval_range_s, time_left) in enumerate(terms):
+            time_left -= dt
+            self._next_due[i] -= dt
+            if self._next_due[i] > 0.0:
+                continue
+            env_ids = (time_left <= 0.0).nonzero(as_tuple=False).squeeze(-1)
+            if len(env_ids) > 0:
+                time_left[env_ids] = self._sample_time(interval_range_s, len(env_ids))
+                func(task, env_ids, **params)
+            self._next_due[i] = time_left.min().item()
+
+    def _sample_time(self, interval_range_s: tuple[float, float], num_envs: int) -> torch.Tensor:
+        lower, upper = interval_range_s
+        return sample_uniform(lower, upper, num_envs, device=self._device)
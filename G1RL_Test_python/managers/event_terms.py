@@ -0,0 +1,127 @@
+"""Event terms for the locomotion tasks.
+
+Each term takes the task and the environments to randomize as first arguments. The new values of all these
+environments are sampled as one tensor and written with a single batched setter of the articulation view.
+"""
+
+import torch
+
+from ..utils.math_utils import sample_gaussian, sample_log_uniform, sample_uniform
+
+
+def randomize_friction(
+    task,
+    env_ids: torch.Tensor,
+    static_friction_range: tuple[float, float],
+    dynamic_friction_range: tuple[float, float],
+    restitution_range: tuple[float, float] = (0.0, 0.0),
+):
+    """Sample the friction and restitution of all collision shapes of the robots.
+
+    The dynamic friction is capped by the static friction.
+    """
+    num_envs = len(env_ids)
+    # sampled in place into the columns of the materials
+    materials = torch.empty((num_envs, 3), device=task.device, dtype=task.dtype)
+    static_friction = sample_uniform(*static_friction_range, num_envs, device=task.device, out=materials[:, 0])
+    dynamic_friction = sample_uniform(*dynamic_friction_range, num_envs, device=task.device, out=materials[:, 1])
+    sample_uniform(*restitution_range, num_envs, device=task.device, out=materials[:, 2])
+    torch.minimum(dynamic_friction, static_friction, out=dynamic_friction)
+    task.backend.set_material_properties(task.articulation, materials, env_ids)
+
+
+def randomize_body_mass(
+    task,
+    env_ids: torch.Tensor,
+    mass_distribution_params: tuple[float, float],
+    operation: str = "scale",
+    distribution: str = "uniform",
+    body_ids: list[int] = None,
+):
+    """Sample the masses of the bodies of the robots, relative to (or in place of) their nominal masses."""
+    default_masses = task.event_manager.default_state(
+        "body_masses", lambda: task._as_tensor(task.articulation.get_body_masses()).clone()
+    )
+    masses = default_masses[env_ids].clone()
+    body_ids = slice(None) if body_ids is None else body_ids
+    samples = _sample(distribution, mass_distribution_params, masses[:, body_ids].shape, task.device)
+    masses[:, body_ids] = _combine(operation, masses[:, body_ids], samples)
+    to_sim = task.backend.to_sim
+    task.articulation.set_body_masses(to_sim(masses.clamp(min=1e-6)), indices=to_sim(env_ids))
+
+
+def randomize_actuator_gains(
+    task,
+    env_ids: torch.Tensor,
+    stiffness_distribution_params: tuple[float, float] = None,
+    damping_distribution_params: tuple[float, float] = None,
+    operation: str = "scale",
+    distribution: str = "uniform",
+):
+    """Sample the joint stiffness and damping of the robots, relative to (or in place of) their nominal gains."""
+    default_kps, default_kds = task.event_manager.default_state(
+        "actuator_gains", lambda: tuple(task._as_tensor(gains).clone() for gains in task.articulation.get_gains())
+    )
+    kps, kds = default_kps[env_ids], default_kds[env_ids]
+    if stiffness_distribution_params is not None:
+        samples = _sample(distribution, stiffness_distribution_params, kps.shape, task.device)
+        kps = _combine(operation, kps, samples).clamp(min=0.0)
+    if damping_distribution_params is not None:
+        samples = _sample(distribution, damping_distribution_params, kds.shape, task.device)
+        kds = _combine(operation, kds, samples).clamp(min=0.0)
+    to_sim = task.backend.to_sim
+    task.articulation.set_gains(kps=to_sim(kps), kds=to_sim(kds), indices=to_sim(env_ids))
+
+
+def push_by_setting_velocity(task, env_ids: torch.Tensor, velocity_range: tuple[torch.Tensor, torch.Tensor]):
+    """Push the robots by adding a sampled twist to their root velocity.
+
+    ``velocity_range`` holds the lower and upper bounds of the twist, built once with :func:`twist_range` when
+    the term is registered.
+    """
+    lower, upper = velocity_range
+    to_sim = task.backend.to_sim
+    sim_env_ids = to_sim(env_ids)
+    velocities = task._as_tensor(task.articulation.get_velocities(indices=sim_env_ids))
+    velocities = velocities + sample_uniform(lower, upper, (len(env_ids), 6), device=task.device)
+    task.articulation.set_velocities(to_sim(velocities), indices=sim_env_ids)
+
+
+def twist_range(
+    velocity_range: dict[str, tuple[float, float]], device: str, dtype: torch.dtype = torch.float32
+) -> tuple[torch.Tensor, torch.Tensor]:
+    """The bounds of the twist of :func:`push_by_setting_velocity`.
+
+    The keys of ``velocity_range`` are among ``x``, ``y``, ``z``, ``roll``, ``pitch`` and ``yaw``; missing
+    components are not changed by the push.
+    """
+    ranges = [velocity_range.get(key, (0.0, 0.0)) for key in ("x", "y", "z", "roll", "pitch", "yaw")]
+    lower = torch.tensor([r[0] for r in ranges], device=device, dtype=dtype)
+    upper = torch.tensor([r[1] for r in ranges], device=device, dtype=dtype)
+    return lower, upper
+
+
+"""
+Helpers.
+"""
+
+
+def _sample(distribution: str, params: tuple[float, float], size: tuple[int, ...], device) -> torch.Tensor:
+    if distribution == "uniform":
+        return sample_uniform(params[0], params[1], size, device=device)
+    if distribution == "log_uniform":
+        return sample_log_uniform(params[0], params[1], size, device=device)
+    if distribution == "gaussian":
+        return sample_gaussian(float(params[0]), float(params[1]), size, device=device)
+    raise ValueError(f"Unknown distribution '{distribution}'. Available: uniform, log_uniform, gaussian.")
+
+
+def _combine(operation: str, values: torch.Tensor, samples: torch.Tensor) -> torch.Tensor:
+    if operation == "scale":
+        return values * samples
+    if operation == "add":
+        return values + samples
+    if operation == "abs":
+        return samples.to(values.dtype)
+    raise ValueError(f"Unknown operation '{operation}'. Available: scale, add, abs.")
+
@@ -0,0 +1,120 @@
+import torch
+from collections.abc import Callable, Sequence
+
+
+class RewardManager:
+    """Weighted sum of named reward terms, evaluated for all environments at once.
+
+    Every term is a function ``func(task, **params) -> torch.Tensor`` returning one value per environment.
+    At each step, the term values are written into the columns of a preallocated (num_envs, num_terms)
+    tensor, and the total reward and the per-term episodic sums are obtained from it with one matrix-vector
+    product and one fused multiply-add. Terms are expected to be built from batched tensor kernels
+    (see :mod:`reward_terms`), so the cost per term is a few kernel launches.
+
+    The weights are multiplied by the step duration ``dt``, so that the episodic sums do not depend on the
+    control frequency.
+    """
+
+    def __init__(self, num_envs: int, dt: float, device: str, dtype: torch.dtype = torch.float32):
+        """Initialize the reward manager.
+
+        Args:
+            num_envs: The number of environments.
+            dt: The duration of one task step in seconds.
+            device: The device used for processing.
+            dtype: The data type of the rewards, of the term values and of the episodic sums. Defaults to float32.
+        """
+        self._num_envs = num_envs
+        self._dt = dt
+        self._device = device
+        self._dtype = dtype
+
+        self._term_names: list[str] = []
+        self._term_funcs: list[Callable[..., torch.Tensor]] = []
+        self._term_params: list[dict] = []
+        self._term_weights: list[float] = []
+
+        # buffers, allocated once all terms are registered
+        self._weights: torch.Tensor = None  # type: ignore
+        self._term_values: torch.Tensor = None  # type: ignore
+        self._episode_sums: torch.Tensor = None  # type: ignore
+        self._reward = torch.zeros(num_envs, device=device, dtype=dtype)
+
+    """
+    Properties.
+    """
+
+    @property
+    def term_names(self) -> list[str]:
+        """The names of the registered terms."""
+        return list(self._term_names)
+
+    @property
+    def term_values(self) -> torch.Tensor:
+        """Unweighted values of the terms at the last call to :meth:`compute`. Shape is (num_envs, num_terms)."""
+        return self._term_values
+
+    @property
+    def episode_sums(self) -> torch.Tensor:
+        """Weighted sums of the terms since the last reset. Shape is (num_envs, num_terms)."""
+        return self._episode_sums
+
+    """
+    Operations.
+    """
+
+    def add_term(self, name: str, func: Callable[..., torch.Tensor], weight: float, **params):
+        """Register a reward term.
+
+        Args:
+            name: The name of the term, used for logging.
+            func: The function computing the term values of shape (num_envs,) from the task.
+            weight: The weight of the term in the total reward.
+            params: Additional keyword arguments passed to ``func``.
+
+        Raises:
+            ValueError: If a term with the same name is already registered.
+        """
+        if name in self._term_names:
+            raise ValueError(f"The reward term '{name}' is already registered.")
+        self._term_names.append(name)
+        self._term_funcs.append(func)
+        self._term_params.append(params)
+        self._term_weights.append(weight)
+
+        num_terms = len(self._term_names)
+        self._weights = torch.tensor(self._term_weights, device=self._device, dtype=self._dtype) * self._dt
+        self._term_values = torch.zeros((self._num_envs, num_terms), device=self._device, dtype=self._dtype)
+        self._episode_sums = torch.zeros((self._num_envs, num_terms), device=self._device, dtype=self._dtype)
+
+    def compute(self, task) -> torch.Tensor:
+        """Compute the total reward of all environments.
+
+        Returns:
+            The reward of every environment. Shape is (num_envs,). The tensor is reused across calls.
+        """
+        if not self._term_names:
+            return self._reward.zero_()
+        for index, (func, params) in enumerate(zip(self._term_funcs, self._term_params)):
+            self._term_values[:, index] = func(task, **params)
+        torch.mv(self._term_values, self._weights, out=self._reward)
+        self._episode_sums.addcmul_(self._term_values, self._weights)
+        return self._reward
+
+    def reset(self, env_ids: Sequence[int] | torch.Tensor | None = None) -> dict[str, torch.Tensor]:
+        """Reset the episodic sums of the given environments.
+
+        Args:
+            env_ids: The environments to reset. Default is None, which resets all environments.
+
+        Returns:
+            The mean episodic sum of every term over the reset environments, before the reset.
+        """
+        if env_ids is None:
+            env_ids = slice(None)
+        extras = {}
+        if self._term_names:
+            episode_means = self._episode_sums[env_ids].mean(dim=0)
+            extras = {f"Episode_Reward/{name}": episode_means[i] for i, name in enumerate(self._term_names)}
+            self._episode_sums[env_ids] = 0.0
+        return extras
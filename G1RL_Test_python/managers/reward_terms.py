@@ -0,0 +1,78 @@
+"""Reward terms for the locomotion tasks.
+
+Each term takes the task as first argument and returns one value per environment. The arithmetic is done
+in TorchScript kernels over the batched task state, so that the terms can also be traced or compiled.
+"""
+
+import torch
+
+"""
+Kernels.
+"""
+
+
+@torch.jit.script
+def _sum_square(x: torch.Tensor) -> torch.Tensor:
+    return torch.sum(torch.square(x), dim=-1)
+
+
+@torch.jit.script
+def _tracking_exp(command: torch.Tensor, value: torch.Tensor, std: float) -> torch.Tensor:
+    return torch.exp(-torch.sum(torch.square(command - value), dim=-1) / (std * std))
+
+
+@torch.jit.script
+def _feet_air_time(
+    air_time: torch.Tensor, first_contact: torch.Tensor, command: torch.Tensor, threshold: float
+) -> torch.Tensor:
+    reward = torch.sum((air_time - threshold) * first_contact.float(), dim=-1)
+    # no reward for standing still
+    return reward * (torch.norm(command[:, :2], dim=-1) > 0.1).float()
+
+
+"""
+Terms.
+"""
+
+
+def track_lin_vel_xy_exp(task, std: float = 0.5) -> torch.Tensor:
+    """Tracking of the commanded planar velocity in the base frame."""
+    return _tracking_exp(task.velocity_commands[:, :2], task.base_lin_vel_b[:, :2], std)
+
+
+def track_ang_vel_z_exp(task, std: float = 0.5) -> torch.Tensor:
+    """Tracking of the commanded yaw rate."""
+    return _tracking_exp(task.velocity_commands[:, 2:3], task.base_ang_vel_b[:, 2:3], std)
+
+
+def lin_vel_z_l2(task) -> torch.Tensor:
+    """Penalty on the vertical base velocity."""
+    return torch.square(task.base_lin_vel_b[:, 2])
+
+
+def ang_vel_xy_l2(task) -> torch.Tensor:
+    """Penalty on the roll and pitch rates."""
+    return _sum_square(task.base_ang_vel_b[:, :2])
+
+
+def flat_orientation_l2(task) -> torch.Tensor:
+    """Penalty on the base tilt, from the planar components of the projected gravity."""
+    return _sum_square(task.projected_gravity_b[:, :2])
+
+
+def joint_torques_l2(task) -> torch.Tensor:
+    """Penalty on the efforts of the controlled joints."""
+    return _sum_square(task.joint_efforts)
+
+
+def action_rate_l2(task) -> torch.Tensor:
+    """Penalty on the change of the actions between two steps."""
+    return _sum_square(task.actions - task.prev_actions)
+
+
+def feet_air_time(task, threshold: float = 0.4) -> torch.Tensor:
+    """Reward for long steps, paid at the first contact of each foot.
+
+    Requires the task to track ``feet_air_time`` and ``feet_first_contact`` of shape (num_envs, num_feet).
+    """
+    return _feet_air_time(task.feet_air_time, task.feet_first_contact, task.velocity_commands, threshold)
@@ -0,0 +1,113 @@
+import torch
+from collections.abc import Callable, Sequence
+
+
+class TerminationManager:
+    """Combination of named termination conditions, evaluated for all environments at once.
+
+    Every term is a function ``func(task, **params) -> torch.Tensor`` returning a boolean per environment.
+    Terms are either failures (terminations) or time-outs; the two kinds are kept in separate masks,
+    since learning algorithms bootstrap the value of time-out transitions.
+    """
+
+    def __init__(self, num_envs: int, device: str):
+        """Initialize the termination manager.
+
+        Args:
+            num_envs: The number of environments.
+            device: The device used for processing.
+        """
+        self._num_envs = num_envs
+        self._device = device
+
+        self._term_names: list[str] = []
+        self._term_funcs: list[Callable[..., torch.Tensor]] = []
+        self._term_params: list[dict] = []
+        self._term_is_time_out: list[bool] = []
+
+        self._terminated = torch.zeros(num_envs, dtype=torch.bool, device=device)
+        self._time_outs = torch.zeros(num_envs, dtype=torch.bool, device=device)
+        self._dones = torch.zeros(num_envs, dtype=torch.bool, device=device)
+        # per-term masks of the last call to :meth:`compute`, used for logging
+        self._term_dones: torch.Tensor = torch.zeros((num_envs, 0), dtype=torch.bool, device=device)
+
+    """
+    Properties.
+    """
+
+    @property
+    def term_names(self) -> list[str]:
+        """The names of the registered terms."""
+        return list(self._term_names)
+
+    @property
+    def dones(self) -> torch.Tensor:
+        """Environments that terminated or timed out at the last step. Shape is (num_envs,)."""
+        return self._dones
+
+    @property
+    def terminated(self) -> torch.Tensor:
+        """Environments that reached a failure condition at the last step. Shape is (num_envs,)."""
+        return self._terminated
+
+    @property
+    def time_outs(self) -> torch.Tensor:
+        """Environments that reached a time-out condition at the last step. Shape is (num_envs,)."""
+        return self._time_outs
+
+    """
+    Operations.
+    """
+
+    def add_term(self, name: str, func: Callable[..., torch.Tensor], time_out: bool = False, **params):
+        """Register a termination term.
+
+        Args:
+            name: The name of the term, used for logging.
+            func: The function computing the boolean termination mask of shape (num_envs,) from the task.
+            time_out: Whether the term is a time-out rather than a failure. Defaults to False.
+            params: Additional keyword arguments passed to ``func``.
+
+        Raises:
+            ValueError: If a term with the same name is already registered.
+        """
+        if name in self._term_names:
+            raise ValueError(f"The termination term '{name}' is already registered.")
+        self._term_names.append(name)
+        self._term_funcs.append(func)
+        self._term_params.append(params)
+        self._term_is_time_out.append(time_out)
+        self._term_dones = torch.zeros((self._num_envs, len(self._term_names)), dtype=torch.bool, device=self._device)
+
+    def compute(self, task) -> torch.Tensor:
+        """Evaluate all terms.
+
+        Returns:
+            The done mask of all environments. Shape is (num_envs,). The tensor is reused across calls.
+        """
+        self._terminated.zero_()
+        self._time_outs.zero_()
+        for index, (func, params, time_out) in enumerate(
+            zip(self._term_funcs, self._term_params, self._term_is_time_out)
+        ):
+            self._term_dones[:, index] = func(task, **params)
+            if time_out:
+                self._time_outs.logical_or_(self._term_dones[:, index])
+            else:
+                self._terminated.logical_or_(self._term_dones[:, index])
+        torch.logical_or(self._terminated, self._time_outs, out=self._dones)
+        return self._dones
+
+    def reset(self, env_ids: Sequence[int] | torch.Tensor | None = None) -> dict[str, torch.Tensor]:
+        """Summarize the last termination causes of the given environments.
+
+        Args:
+            env_ids: The environments being reset. Default is None, which refers to all environments.
+
+        Returns:
+            The number of reset environments ended by each term.
+        """
+        if env_ids is None:
+            env_ids = slice(None)
+        counts = self._term_dones[env_ids].sum(dim=0)
+        return {f"Episode_Termination/{name}": counts[i] for i, name in enumerate(self._term_names)}
@@ -0,0 +1,25 @@
+"""Termination terms for the locomotion tasks.
+
+Each term takes the task as first argument and returns a boolean per environment.
+"""
+
+import math
+
+import torch
+
+
+def time_out(task) -> torch.Tensor:
+    """The episode reached its maximum length."""
+    return task.episode_length_buf >= task.max_episode_length
+
+
+def base_height_below(task, minimum_height: float = 0.3) -> torch.Tensor:
+    """The base fell below a height above the environment origin."""
+    return (task.base_pos_w[:, 2] - task.env_origins[:, 2]) < minimum_height
+
+
+def bad_orientation(task, limit_angle: float = 1.0) -> torch.Tensor:
+    """The base tilt, i.e. the angle between the projected gravity and the base -z axis, exceeds a limit."""
+    gravity_b = task.projected_gravity_b
+    cos_tilt = -gravity_b[:, 2] / torch.norm(gravity_b, dim=-1).clamp(min=1e-9)
+    return cos_tilt < math.cos(limit_angle)
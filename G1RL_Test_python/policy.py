@@ -1,6 +1,14 @@
+import math
+import os
+from collections import OrderedDict
+from typing import Optional
+
 import torch
+import torch.distributed as dist
 import torch.nn as nn
 
+from .checkpoint import infer_mlp_dims, load_flat_weights, save_flat_weights
+
 
 class SimpleMLP(nn.Module):
     def __init__(self, obs_dim: int = 255, action_dim: int = 14, hidden_dims: list = [256, 256, 128]):
@@ -18,11 +26,101 @@ class SimpleMLP(nn.Module):
         return self.layers(x)
 
 
+class RunningNormalizer(nn.Module):
+    """Normalize observations with a running estimate of their mean and variance.
+
+    The statistics are updated with the parallel algorithm of Chan et al.: the mean and variance of a whole
+    (num_envs, obs_dim) batch are merged into the running estimate with a few O(obs_dim) kernels. When
+    ``torch.distributed`` is initialized, the batch statistics of all workers are gathered and merged, so that
+    every worker keeps identical statistics. The statistics are buffers, so they are part of the state dict
+    and of TorchScript/ONNX exports. :meth:`freeze` stops the updates.
+    """
+
+    clip: Optional[float]
+    frozen: bool
+
+    def __init__(self, obs_dim: int, epsilon: float = 1e-8, clip: Optional[float] = None):
+        """Initialize the normalizer.
+
+        Args:
+            obs_dim: The dimension of the observations.
+            epsilon: Added to the variance before the square root. Defaults to 1e-8.
+            clip: If set, the normalized observations are clipped to [-clip, clip]. Defaults to None.
+        """
+        super().__init__()
+        self.epsilon = epsilon
+        self.clip = clip
+        self.frozen = False
+        self.register_buffer("mean", torch.zeros(obs_dim))
+        self.register_buffer("var", torch.ones(obs_dim))
+        # float64, so that the count stays exact over long trainings
+        self.register_buffer("count", torch.zeros((), dtype=torch.float64))
+
+    def forward(self, x: torch.Tensor) -> torch.Tensor:
+        x = (x - self.mean) / torch.sqrt(self.var + self.epsilon)
+        # bound to a local, so that TorchScript refines the optional
+        clip = self.clip
+        if clip is not None:
+            x = torch.clamp(x, -clip, clip)
+        return x
+
+    def freeze(self) -> "RunningNormalizer":
+        self.frozen = True
+        return self
+
+    def unfreeze(self) -> "RunningNormalizer":
+        self.frozen = False
+        return self
+
+    @torch.no_grad()
+    def update(self, x: torch.Tensor):
+        """Merge the statistics of a batch of observations of shape (batch_size, obs_dim), unless frozen."""
+        if self.frozen:
+            return
+        batch_var, batch_mean = torch.var_mean(x, dim=0, correction=0)
+        batch_count = torch.full((1,), x.shape[0], dtype=batch_mean.dtype, device=batch_mean.device)
+        stats = torch.cat((batch_count, batch_mean, batch_var))
+        if dist.is_available() and dist.is_initialized():
+            gathered = stats.new_empty((dist.get_world_size(), stats.numel()))
+            dist.all_gather_into_tensor(gathered, stats)
+        else:
+            gathered = stats.unsqueeze(0)
+        obs_dim = self.mean.numel()
+        self.merge(gathered[:, 0], gathered[:, 1 : 1 + obs_dim], gathered[:, 1 + obs_dim :])
+
+    @torch.no_grad()
+    def merge(self, counts: torch.Tensor, means: torch.Tensor, variances: torch.Tensor):
+        """Merge the statistics of K batches into the running estimate.
+
+        Args:
+            counts: The number of samples of the batches. Shape is (K,).
+            means: The means of the batches. Shape is (K, obs_dim).
+            variances: The (biased) variances of the batches. Shape is (K, obs_dim).
+        """
+        total = self.count + counts.to(self.count.dtype).sum()
+        # weights of the running estimate and of every batch in the merged statistics
+        running_weight = (self.count / total).to(self.mean.dtype)
+        batch_weights = (counts.to(self.count.dtype) / total).to(self.mean.dtype).unsqueeze(-1)
+        mean = running_weight * self.mean + (batch_weights * means).sum(0)
+        var = running_weight * (self.var + (self.mean - mean).square())
+        var += (batch_weights * (variances + (means - mean).square())).sum(0)
+        self.mean.copy_(mean)
+        self.var.copy_(var)
+        self.count.copy_(total)
+
+
 class PolicyExporter(nn.Module):
-    def __init__(self, obs_dim: int = 255, action_dim: int = 14, hidden_dims: list = [256, 256, 128]):
+    def __init__(
+        self,
+        obs_dim: int = 255,
+        action_dim: int = 14,
+        hidden_dims: list = [256, 256, 128],
+        normalize_obs: bool = False,
+    ):
         super().__init__()
         self.actor = SimpleMLP(obs_dim, action_dim, hidden_dims)
-        self.normalizer = nn.Identity()
+        # frozen observation statistics of the training, or the raw observations
+        self.normalizer = RunningNormalizer(obs_dim).freeze() if normalize_obs else nn.Identity()
 
     def forward(self, obs: torch.Tensor) -> torch.Tensor:
         return self.actor(self.normalizer(obs))
@@ -31,23 +129,268 @@ class PolicyExporter(nn.Module):
     def from_jit(path: str, device: str = "cuda") -> "PolicyExporter":
         """Load weights from a TorchScript checkpoint into this nn.Module."""
         jit_model = torch.jit.load(path, map_location=device)
+        # the clip of the normalizer is an attribute, not part of the state dict
+        obs_clip = getattr(jit_model.normalizer, "clip", None)
+        return PolicyExporter.from_state_dict(jit_model.state_dict(), device, obs_clip=obs_clip)
+
+    @staticmethod
+    def from_flat(path: str, device: str = "cuda") -> "PolicyExporter":
+        """Load weights from a flat weight file written by :meth:`save_flat`."""
+        state_dict, metadata = load_flat_weights(path)
+        obs_clip = float(metadata["obs_clip"]) if "obs_clip" in metadata else None
+        return PolicyExporter.from_state_dict(state_dict, device, obs_clip=obs_clip)
+
+    @staticmethod
+    def from_state_dict(state_dict: dict, device: str = "cuda", obs_clip: Optional[float] = None) -> "PolicyExporter":
+        """Build a policy whose MLP dimensions are inferred from the parameter names of the state dict.
 
-        # Infer dimensions from the first and last linear layers
-        first_weight = dict(jit_model.named_parameters())["actor.layers.0.weight"]
-        last_weight = dict(jit_model.named_parameters())["actor.layers.6.weight"]
-        obs_dim = first_weight.shape[1]
-        action_dim = last_weight.shape[0]
-
-        # Infer hidden dims from intermediate linear layers
-        hidden_dims = []
-        for name, param in jit_model.named_parameters():
-            if name.startswith("actor.layers.") and name.endswith(".weight"):
-                layer_idx = int(name.split(".")[2])
-                if layer_idx < 6:  # exclude last linear
-                    hidden_dims.append(param.shape[0])
-
-        model = PolicyExporter(obs_dim, action_dim, hidden_dims)
-        model.load_state_dict(jit_model.state_dict())
+        ``obs_clip`` is the clip of the observation normalizer, if the state dict has one.
+        """
+        obs_dim, action_dim, hidden_dims = infer_mlp_dims(state_dict, prefix="actor.layers.")
+        model = PolicyExporter(obs_dim, action_dim, hidden_dims, normalize_obs="normalizer.mean" in state_dict)
+        model.load_state_dict(state_dict)
+        if isinstance(model.normalizer, RunningNormalizer):
+            model.normalizer.clip = obs_clip
         model.to(device)
         model.eval()
         return model
+
+    @staticmethod
+    def load(path: str, device: str = "cuda", use_cache: bool = True) -> "PolicyExporter":
+        """Load a TorchScript (``.pt``/``.jit``) or flat weight (``.safetensors``) checkpoint.
+
+        The state dicts of the last :data:`POLICY_CACHE_SIZE` loaded files are cached by path, modification time
+        and device, so repeated loads of an unchanged file do not read it again. Every load builds a new module
+        from the cached state dict, so callers can move, train or modify their policy without affecting others.
+        """
+        path = os.path.abspath(path)
+        key = (path, os.stat(path).st_mtime_ns, str(device))
+        if use_cache and key in _POLICY_CACHE:
+            _POLICY_CACHE.move_to_end(key)
+            state_dict, obs_clip = _POLICY_CACHE[key]
+            return PolicyExporter.from_state_dict(state_dict, device, obs_clip=obs_clip)
+        if path.endswith(".safetensors"):
+            model = PolicyExporter.from_flat(path, device)
+        else:
+            model = PolicyExporter.from_jit(path, device)
+        if use_cache:
+            # entries of older versions of the file are dropped, then the least recently used ones
+            for stale_key in [k for k in _POLICY_CACHE if k[0] == path and k[1] != key[1]]:
+                del _POLICY_CACHE[stale_key]
+            state_dict = {name: tensor.detach().clone() for name, tensor in model.state_dict().items()}
+            _POLICY_CACHE[key] = (state_dict, getattr(model.normalizer, "clip", None))
+            while len(_POLICY_CACHE) > POLICY_CACHE_SIZE:
+                _POLICY_CACHE.popitem(last=False)
+        return model
+
+    def save_flat(self, path: str):
+        """Save the weights to a flat weight file, loadable with :meth:`from_flat` without TorchScript."""
+        metadata = {"format": "PolicyExporter"}
+        if getattr(self.normalizer, "clip", None) is not None:
+            metadata["obs_clip"] = self.normalizer.clip
+        save_flat_weights(self.state_dict(), path, metadata=metadata)
+
+
+# maximum number of checkpoints whose weights are kept by PolicyExporter.load
+POLICY_CACHE_SIZE = 4
+# state dicts and normalizer clips loaded by PolicyExporter.load, keyed by (path, mtime_ns, device), least
+# recently used first
+_POLICY_CACHE: OrderedDict[tuple[str, int, str], tuple[dict[str, torch.Tensor], Optional[float]]] = OrderedDict()
+
+
+class BatchedPolicy(nn.Module):
+    """Run several policies of identical architecture on groups of environments in one forward pass.
+
+    The weights of the P policies are stacked along a leading policy dimension. The observations of every
+    group are gathered into one (P, group_size, obs_dim) batch, so every linear layer of all policies is a single
+    ``baddbmm``, and the actions are gathered back in environment order. Groups of unequal size are padded to
+    the largest group.
+    """
+
+    def __init__(
+        self, policies: list[PolicyExporter], num_envs: int, group_ids: torch.Tensor = None, device: str = "cuda"
+    ):
+        """Initialize the batched policy.
+
+        Args:
+            policies: The policies to evaluate. Their actors must have the same layer dimensions.
+            num_envs: The number of environments.
+            group_ids: The index of the policy of every environment. Shape is (num_envs,). Defaults to None,
+                in which case the environments are split into contiguous groups of (almost) equal size.
+            device: The device used for inference. Defaults to "cuda".
+
+        Raises:
+            ValueError: If no policy is given or if the layer dimensions of the policies differ.
+        """
+        super().__init__()
+        if len(policies) == 0:
+            raise ValueError("At least one policy is required.")
+        linears = [[layer for layer in policy.actor.layers if isinstance(layer, nn.Linear)] for policy in policies]
+        shapes = [[tuple(linear.weight.shape) for linear in layers] for layers in linears]
+        for index, layer_shapes in enumerate(shapes):
+            if layer_shapes != shapes[0]:
+                raise ValueError(f"Policy {index} has layers {layer_shapes}, expected {shapes[0]}.")
+        self.num_policies = len(policies)
+        self.num_envs = num_envs
+        self.num_layers = len(shapes[0])
+        self.obs_dim = shapes[0][0][1]
+        self.action_dim = shapes[0][-1][0]
+
+        with torch.no_grad():
+            # stacked weights (P, in, out) and biases (P, 1, out) of every linear layer
+            for i in range(self.num_layers):
+                weight = torch.stack([layers[i].weight.t() for layers in linears])
+                bias = torch.stack([layers[i].bias.unsqueeze(0) for layers in linears])
+                self.register_buffer(f"weight_{i}", weight.to(device).contiguous())
+                self.register_buffer(f"bias_{i}", bias.to(device))
+            # observation normalization as (x - shift) * scale, the identity for policies without statistics
+            shift = torch.zeros((self.num_policies, 1, self.obs_dim))
+            scale = torch.ones((self.num_policies, 1, self.obs_dim))
+            clip = torch.full((self.num_policies, 1, 1), math.inf)
+            for index, policy in enumerate(policies):
+                normalizer = policy.normalizer
+                if isinstance(normalizer, RunningNormalizer):
+                    shift[index, 0] = normalizer.mean.cpu()
+                    scale[index, 0] = torch.rsqrt(normalizer.var.cpu() + normalizer.epsilon)
+                    if normalizer.clip is not None:
+                        clip[index] = normalizer.clip
+            self.register_buffer("shift", shift.to(device))
+            self.register_buffer("scale", scale.to(device))
+            self.register_buffer("clip", clip.to(device))
+            self._clip_obs = bool(torch.isfinite(clip).any())
+
+        # group of every environment, and its slot in the padded (P, group_size) batch
+        if group_ids is None:
+            group_ids = torch.arange(num_envs, device=device) * self.num_policies // num_envs
+        group_ids = torch.as_tensor(group_ids, dtype=torch.long, device=device)
+        counts = torch.bincount(group_ids, minlength=self.num_policies)
+        self.group_size = int(counts.max().item())
+        order = torch.argsort(group_ids, stable=True)
+        starts = torch.cumsum(counts, 0) - counts
+        slots = torch.empty_like(group_ids)
+        slots[order] = torch.arange(num_envs, device=device) - starts[group_ids[order]]
+        # padded slots read environment 0 and their actions are discarded
+        gather_index = torch.zeros((self.num_policies, self.group_size), dtype=torch.long, device=device)
+        gather_index[group_ids, slots] = torch.arange(num_envs, device=device)
+        self.register_buffer("group_ids", group_ids)
+        self.register_buffer("group_counts", counts)
+        self.register_buffer("_gather_index", gather_index)
+        self.register_buffer("_scatter_index", group_ids * self.group_size + slots)
+
+    def forward(self, obs: torch.Tensor) -> torch.Tensor:
+        """Compute the actions of all environments, each with the policy of its group.
+
+        Args:
+            obs: The observations. Shape is (num_envs, obs_dim).
+
+        Returns:
+            The actions. Shape is (num_envs, action_dim).
+        """
+        x = (obs[self._gather_index] - self.shift) * self.scale
+        if self._clip_obs:
+            x = torch.minimum(torch.maximum(x, -self.clip), self.clip)
+        for i in range(self.num_layers):
+            x = torch.baddbmm(getattr(self, f"bias_{i}"), x, getattr(self, f"weight_{i}"))
+            if i < self.num_layers - 1:
+                x = torch.nn.functional.elu(x)
+        return x.reshape(-1, self.action_dim)[self._scatter_index]
+
+
+class PolicyInferenceEngine:
+    """Run a :class:`PolicyExporter` on a fixed batch of observations without per-call allocations.
+
+    The observations are copied into a static input buffer and the actions are written into a static output
+    buffer. On CUDA, the forward pass is captured once in a CUDA graph and replayed by :meth:`act`, which
+    removes the launch overhead of the small MLP. On other devices, the actor runs eagerly into preallocated
+    per-layer buffers.
+    """
+
+    def __init__(self, policy: PolicyExporter, num_envs: int, device: str = "cuda", num_warmup: int = 3):
+        """Initialize the engine.
+
+        Args:
+            policy: The policy to run. It is moved to ``device`` and set to evaluation mode.
+            num_envs: The fixed batch size of the observations passed to :meth:`act`.
+            device: The device used for inference. Defaults to "cuda".
+            num_warmup: The number of eager forward passes before the graph capture. Defaults to 3.
+        """
+        self.policy = policy.to(device).eval()
+        self.num_envs = num_envs
+        self.device = torch.device(device)
+        layers = list(self.policy.actor.layers)
+        linears = [layer for layer in layers if isinstance(layer, nn.Linear)]
+        self.obs_dim = linears[0].in_features
+        self.action_dim = linears[-1].out_features
+
+        # static input and output buffers, and one buffer per linear layer for the eager path
+        self.static_obs = torch.zeros((num_envs, self.obs_dim), device=self.device)
+        self.static_actions = torch.zeros((num_envs, self.action_dim), device=self.device)
+        self._layers = layers
+        self._layer_outputs = [torch.zeros((num_envs, linear.out_features), device=self.device) for linear in linears]
+        self._layer_outputs[-1] = self.static_actions
+        # normalized observations and the std of the normalizer, recomputed in place from its live statistics
+        self._normalizer = None if isinstance(self.policy.normalizer, nn.Identity) else self.policy.normalizer
+        if self._normalizer is not None:
+            self._normalized_obs = torch.zeros((num_envs, self.obs_dim), device=self.device)
+            self._normalizer_std = torch.zeros(self.obs_dim, device=self.device)
+
+        self._graph = None
+        if self.device.type == "cuda":
+            self._capture(num_warmup)
+
+    @property
+    def uses_cuda_graph(self) -> bool:
+        """Whether :meth:`act` replays a captured CUDA graph."""
+        return self._graph is not None
+
+    def act(self, obs: torch.Tensor) -> torch.Tensor:
+        """Compute the actions of the observations.
+
+        Args:
+            obs: The observations. Shape is (num_envs, obs_dim).
+
+        Returns:
+            The actions. Shape is (num_envs, action_dim). The tensor is reused across calls.
+        """
+        self.static_obs.copy_(obs)
+        if self._graph is not None:
+            self._graph.replay()
+        else:
+            self._forward_static()
+        return self.static_actions
+
+    def _forward_static(self):
+        with torch.no_grad():
+            x = self.static_obs
+            normalizer = self._normalizer
+            if normalizer is not None:
+                # same as RunningNormalizer.forward, into the preallocated buffers
+                torch.add(normalizer.var, normalizer.epsilon, out=self._normalizer_std).sqrt_()
+                x = torch.sub(x, normalizer.mean, out=self._normalized_obs).div_(self._normalizer_std)
+                if normalizer.clip is not None:
+                    x.clamp_(-normalizer.clip, normalizer.clip)
+            outputs = iter(self._layer_outputs)
+            for layer in self._layers:
+                if isinstance(layer, nn.Linear):
+                    out = next(outputs)
+                    torch.addmm(layer.bias, x, layer.weight.t(), out=out)
+                    x = out
+                elif isinstance(layer, nn.ELU):
+                    torch.nn.functional.elu_(x, alpha=layer.alpha)
+                else:
+                    x = layer(x)
+            if x is not self.static_actions:
+                self.static_actions.copy_(x)
+
+    def _capture(self, num_warmup: int):
+        # warm up on a side stream, so that the lazy initializations are not part of the graph
+        stream = torch.cuda.Stream(self.device)
+        stream.wait_stream(torch.cuda.current_stream(self.device))
+        with torch.cuda.stream(stream):
+            for _ in range(num_warmup):
+                self._forward_static()
+        torch.cuda.current_stream(self.device).wait_stream(stream)
+
+        self._graph = torch.cuda.CUDAGraph()
+        with torch.cuda.graph(self._graph):
+            self._forward_static()
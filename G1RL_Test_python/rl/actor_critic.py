@@ -0,0 +1,86 @@
+import math
+
+import torch
+import torch.nn as nn
+from torch.distributions import Normal
+
+from ..policy import PolicyExporter, RunningNormalizer, SimpleMLP
+
+
+class ActorCritic(nn.Module):
+    """Gaussian actor and value critic built from two :class:`SimpleMLP` networks.
+
+    The actor network has the same structure and parameter names as :attr:`PolicyExporter.actor`, so a trained
+    actor can be exported with :meth:`export_policy` and loaded back with :meth:`PolicyExporter.from_jit`.
+
+    With ``obs_normalization``, the observations of both networks are normalized by a shared
+    :class:`RunningNormalizer`, updated by the algorithm through :meth:`update_normalization` and exported
+    frozen with the actor.
+    """
+
+    def __init__(
+        self,
+        obs_dim: int = 255,
+        action_dim: int = 14,
+        actor_hidden_dims: list = [256, 256, 128],
+        critic_hidden_dims: list = [256, 256, 128],
+        init_noise_std: float = 1.0,
+        obs_normalization: bool = False,
+    ):
+        super().__init__()
+        self.obs_dim = obs_dim
+        self.action_dim = action_dim
+        self.actor_hidden_dims = list(actor_hidden_dims)
+        self.actor = SimpleMLP(obs_dim, action_dim, actor_hidden_dims)
+        self.critic = SimpleMLP(obs_dim, 1, critic_hidden_dims)
+        self.obs_normalizer = RunningNormalizer(obs_dim) if obs_normalization else nn.Identity()
+        # state-independent action noise
+        self.log_std = nn.Parameter(torch.full((action_dim,), math.log(init_noise_std)))
+
+    def forward(self, obs: torch.Tensor) -> torch.Tensor:
+        """Deterministic (mean) action, used for evaluation."""
+        return self.actor(self.obs_normalizer(obs))
+
+    def distribution(self, obs: torch.Tensor) -> Normal:
+        mean = self.actor(self.obs_normalizer(obs))
+        return Normal(mean, self.log_std.exp().expand_as(mean))
+
+    def value(self, obs: torch.Tensor) -> torch.Tensor:
+        """State value. Shape is (batch_size,)."""
+        return self.critic(self.obs_normalizer(obs)).squeeze(-1)
+
+    def update_normalization(self, obs: torch.Tensor):
+        """Merge a batch of observations into the normalizer statistics, if the observations are normalized."""
+        if isinstance(self.obs_normalizer, RunningNormalizer):
+            self.obs_normalizer.update(obs)
+
+    def act(self, obs: torch.Tensor) -> tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+        """Sample actions for a batch of observations.
+
+        Returns:
+            A tuple of actions (batch_size, action_dim), their log-probabilities (batch_size,)
+            and the state values (batch_size,).
+        """
+        dist = self.distribution(obs)
+        actions = dist.sample()
+        return actions, dist.log_prob(actions).sum(-1), self.value(obs)
+
+    def evaluate(self, obs: torch.Tensor, actions: torch.Tensor) -> tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+        """Evaluate stored actions under the current policy.
+
+        Returns:
+            A tuple of log-probabilities (batch_size,), entropies (batch_size,) and state values (batch_size,).
+        """
+        dist = self.distribution(obs)
+        return dist.log_prob(actions).sum(-1), dist.entropy().sum(-1), self.value(obs)
+
+    def export_policy(self) -> PolicyExporter:
+        """Copy the actor and the frozen normalizer statistics into a :class:`PolicyExporter` on the same device."""
+        normalize_obs = isinstance(self.obs_normalizer, RunningNormalizer)
+        policy = PolicyExporter(self.obs_dim, self.action_dim, self.actor_hidden_dims, normalize_obs=normalize_obs)
+        policy.actor.load_state_dict(self.actor.state_dict())
+        if normalize_obs:
+            policy.normalizer.load_state_dict(self.obs_normalizer.state_dict())
+        policy.to(self.log_std.device)
+        policy.eval()
+        return policy
@@ -0,0 +1,42 @@
+import torch
+
+
+class LocomotionVecEnv:
+    """Vectorized environment interface of a locomotion task, as expected by :class:`OnPolicyRunner`.
+
+    One call to :meth:`step` applies the actions, advances the backend physics by ``task.decimation`` steps
+    while the joint targets are held, evaluates the reward and termination of all environments, resets the
+    finished ones, advances the velocity commands, and returns the observations.
+    """
+
+    def __init__(self, task):
+        self.task = task
+        self.backend = task.backend
+        self.num_envs = task._num_envs
+        self.obs_dim = task.history_buffer.history_dim
+        self.action_dim = len(task.joint_ids)
+        self.device = task.device
+
+    def reset(self) -> torch.Tensor:
+        self.task.reset()
+        self.task.update_state()
+        return self.task.get_observation()["policy"]
+
+    def step(self, actions: torch.Tensor) -> tuple[torch.Tensor, torch.Tensor, torch.Tensor, dict]:
+        self.task.step(actions)
+        for _ in range(self.task.decimation):
+            self.backend.step()
+        self.task.update_state()
+        dones = self.task.is_done()
+        rewards = self.task.get_reward()
+
+        # reset only the environments that are done, then observe the new episodes
+        reset_env_ids = dones.nonzero(as_tuple=False).squeeze(-1)
+        extras = {"time_outs": self.task.termination_manager.time_outs}
+        if len(reset_env_ids) > 0:
+            self.task.reset_idx(reset_env_ids)
+            self.task.update_state()
+            extras["log"] = self.task.extras["log"]
+        self.task.update_commands()
+        obs = self.task.get_observation()["policy"]
+        return obs, rewards, dones.float(), extras
@@ -0,0 +1,69 @@
+import time
+
+import torch
+
+from .ppo import PPO
+
+
+class OnPolicyRunner:
+    """Alternate rollout collection and PPO updates on a vectorized environment.
+
+    The environment is expected to expose ``num_envs``, ``reset() -> obs`` and
+    ``step(actions) -> (obs, rewards, dones, extras)``, with all tensors batched over the environments.
+    """
+
+    def __init__(self, env, algorithm: PPO):
+        self.env = env
+        self.algorithm = algorithm
+        self.num_steps = algorithm.storage.num_steps
+        self.iteration = 0
+        # observations of the ongoing rollout, kept across calls to :meth:`learn`
+        self._obs: torch.Tensor = None  # type: ignore
+
+    def learn(self, num_iterations: int, log_interval: int = 1) -> list[dict[str, float]]:
+        """Run the training loop.
+
+        Args:
+            num_iterations: The number of rollout/update iterations.
+            log_interval: Print the statistics every ``log_interval`` iterations. Zero disables printing.
+
+        Returns:
+            The statistics of every iteration, including the collection and learning throughput.
+        """
+        history = []
+        if self._obs is None:
+            self._obs = self.env.reset()
+        obs = self._obs
+        for _ in range(num_iterations):
+            start = time.perf_counter()
+            mean_reward = torch.zeros((), device=self.algorithm.device)
+            with torch.no_grad():
+                for _ in range(self.num_steps):
+                    actions = self.algorithm.act(obs)
+                    obs, rewards, dones, extras = self.env.step(actions)
+                    self.algorithm.process_env_step(rewards, dones, extras.get("time_outs"))
+                    mean_reward += rewards.mean()
+                self.algorithm.compute_returns(obs)
+            collection_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            stats = self.algorithm.update()
+            learn_time = time.perf_counter() - start
+
+            num_samples = self.num_steps * self.env.num_envs
+            stats["mean_step_reward"] = mean_reward.item() / self.num_steps
+            stats["collection_time"] = collection_time
+            stats["learn_time"] = learn_time
+            stats["samples_per_second"] = num_samples / (collection_time + learn_time)
+            history.append(stats)
+            self.iteration += 1
+            self._obs = obs
+
+            if log_interval and self.iteration % log_interval == 0:
+                print(
+                    f"[OnPolicyRunner] it {self.iteration:5d} | reward {stats['mean_step_reward']:8.4f}"
+                    f" | surrogate {stats['surrogate_loss']:8.4f} | value {stats['value_loss']:8.4f}"
+                    f" | {stats['samples_per_second']:10.0f} samples/s"
+                    f" (collect {collection_time:.3f}s, learn {learn_time:.3f}s)"
+                )
+        return history
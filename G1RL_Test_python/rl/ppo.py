@@ -0,0 +1,132 @@
+import torch
+import torch.nn as nn
+
+from .actor_critic import ActorCritic
+from .rollout_storage import RolloutStorage
+
+
+class PPO:
+    """Proximal Policy Optimization with Generalized Advantage Estimation.
+
+    The algorithm collects ``num_steps`` transitions from all environments into a :class:`RolloutStorage`,
+    computes the GAE advantages, and runs ``num_learning_epochs`` passes of shuffled mini-batch updates on the
+    clipped surrogate objective.
+    """
+
+    def __init__(
+        self,
+        actor_critic: ActorCritic,
+        num_envs: int,
+        num_steps: int = 24,
+        num_learning_epochs: int = 5,
+        num_mini_batches: int = 4,
+        clip_param: float = 0.2,
+        gamma: float = 0.99,
+        lam: float = 0.95,
+        value_loss_coef: float = 1.0,
+        entropy_coef: float = 0.01,
+        learning_rate: float = 1e-3,
+        max_grad_norm: float = 1.0,
+        use_clipped_value_loss: bool = True,
+        device: str = "cuda",
+    ):
+        self.device = device
+        self.actor_critic = actor_critic.to(device)
+        self.optimizer = torch.optim.Adam(self.actor_critic.parameters(), lr=learning_rate)
+        self.storage = RolloutStorage(
+            num_steps, num_envs, actor_critic.obs_dim, actor_critic.action_dim, device=device
+        )
+
+        self.num_learning_epochs = num_learning_epochs
+        self.num_mini_batches = num_mini_batches
+        self.clip_param = clip_param
+        self.gamma = gamma
+        self.lam = lam
+        self.value_loss_coef = value_loss_coef
+        self.entropy_coef = entropy_coef
+        self.max_grad_norm = max_grad_norm
+        self.use_clipped_value_loss = use_clipped_value_loss
+
+        # transition of the current step, completed by :meth:`process_env_step`
+        self._observations: torch.Tensor = None  # type: ignore
+        self._actions: torch.Tensor = None  # type: ignore
+        self._log_probs: torch.Tensor = None  # type: ignore
+        self._values: torch.Tensor = None  # type: ignore
+
+    @torch.no_grad()
+    def act(self, obs: torch.Tensor) -> torch.Tensor:
+        """Sample actions for all environments and remember the transition."""
+        # snapshot into the storage slot, since environments may update their observation tensor in place
+        self._observations = self.storage.observations[self.storage.step]
+        self._observations.copy_(obs)
+        self._actions, self._log_probs, self._values = self.actor_critic.act(obs)
+        return self._actions
+
+    def process_env_step(self, rewards: torch.Tensor, dones: torch.Tensor, time_outs: torch.Tensor = None):
+        """Store the transition started by :meth:`act` with the resulting rewards and done flags.
+
+        For environments that were reset on a time-out rather than a failure, the value of the last state is
+        bootstrapped into the reward.
+        """
+        if time_outs is not None:
+            rewards = rewards + self.gamma * self._values * time_outs
+        # the stored observations are raw, they are normalized with the latest statistics during the update
+        self.actor_critic.update_normalization(self._observations)
+        self.storage.add(self._observations, self._actions, self._log_probs, self._values, rewards, dones)
+
+    @torch.no_grad()
+    def compute_returns(self, last_obs: torch.Tensor):
+        last_values = self.actor_critic.value(last_obs)
+        self.storage.compute_returns(last_values, self.gamma, self.lam)
+
+    def update(self) -> dict[str, float]:
+        """Run the PPO epochs on the collected rollout and clear the storage.
+
+        Returns:
+            The mean surrogate, value and entropy losses over all mini-batches.
+        """
+        # normalize the advantages over the whole rollout
+        advantages = self.storage.advantages
+        advantages.sub_(advantages.mean()).div_(advantages.std() + 1e-8)
+
+        mean_surrogate_loss = torch.zeros((), device=self.device)
+        mean_value_loss = torch.zeros((), device=self.device)
+        mean_entropy = torch.zeros((), device=self.device)
+        num_updates = 0
+        for obs, actions, old_log_probs, old_values, advantages, returns in self.storage.mini_batch_generator(
+            self.num_mini_batches, self.num_learning_epochs
+        ):
+            log_probs, entropy, values = self.actor_critic.evaluate(obs, actions)
+
+            # clipped surrogate objective
+            ratio = torch.exp(log_probs - old_log_probs)
+            surrogate = -advantages * ratio
+            surrogate_clipped = -advantages * torch.clamp(ratio, 1.0 - self.clip_param, 1.0 + self.clip_param)
+            surrogate_loss = torch.max(surrogate, surrogate_clipped).mean()
+
+            # value function loss
+            if self.use_clipped_value_loss:
+                values_clipped = old_values + (values - old_values).clamp(-self.clip_param, self.clip_param)
+                value_loss = torch.max((values - returns).pow(2), (values_clipped - returns).pow(2)).mean()
+            else:
+                value_loss = (returns - values).pow(2).mean()
+
+            loss = surrogate_loss + self.value_loss_coef * value_loss - self.entropy_coef * entropy.mean()
+
+            self.optimizer.zero_grad()
+            loss.backward()
+            nn.utils.clip_grad_norm_(self.actor_critic.parameters(), self.max_grad_norm)
+            self.optimizer.step()
+
+            # accumulate on the device to avoid a host synchronization per mini-batch
+            mean_surrogate_loss += surrogate_loss.detach()
+            mean_value_loss += value_loss.detach()
+            mean_entropy += entropy.mean().detach()
+            num_updates += 1
+
+        self.storage.clear()
+        return {
+            "surrogate_loss": mean_surrogate_loss.item() / num_updates,
+            "value_loss": mean_value_loss.item() / num_updates,
+            "entropy": mean_entropy.item() / num_updates,
+        }
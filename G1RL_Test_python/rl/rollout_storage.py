@@ -0,0 +1,120 @@
+import torch
+
+
+class RolloutStorage:
+    """Preallocated storage for on-policy rollouts of a vectorized environment.
+
+    Every field has the shape (num_steps, num_envs, ...) and is allocated once. Transitions are written
+    in place by :meth:`add`, and the advantages are computed over all environments at once by
+    :meth:`compute_returns`.
+    """
+
+    def __init__(self, num_steps: int, num_envs: int, obs_dim: int, action_dim: int, device: str):
+        """Initialize the rollout storage.
+
+        Args:
+            num_steps: The number of transitions collected per environment before an update.
+            num_envs: The number of environments.
+            obs_dim: The dimension of the observations.
+            action_dim: The dimension of the actions.
+            device: The device used for processing.
+        """
+        self.num_steps = num_steps
+        self.num_envs = num_envs
+        self.device = device
+
+        self.observations = torch.zeros((num_steps, num_envs, obs_dim), device=device)
+        self.actions = torch.zeros((num_steps, num_envs, action_dim), device=device)
+        self.log_probs = torch.zeros((num_steps, num_envs), device=device)
+        self.values = torch.zeros((num_steps, num_envs), device=device)
+        self.rewards = torch.zeros((num_steps, num_envs), device=device)
+        self.dones = torch.zeros((num_steps, num_envs), device=device)
+        self.advantages = torch.zeros((num_steps, num_envs), device=device)
+        self.returns = torch.zeros((num_steps, num_envs), device=device)
+
+        self.step = 0
+
+    @property
+    def num_samples(self) -> int:
+        return self.num_steps * self.num_envs
+
+    def add(
+        self,
+        observations: torch.Tensor,
+        actions: torch.Tensor,
+        log_probs: torch.Tensor,
+        values: torch.Tensor,
+        rewards: torch.Tensor,
+        dones: torch.Tensor,
+    ):
+        """Write the transitions of all environments for the current step.
+
+        Raises:
+            RuntimeError: If the storage is already full.
+        """
+        if self.step >= self.num_steps:
+            raise RuntimeError("Rollout storage overflow. Call clear() before adding new transitions.")
+        self.observations[self.step].copy_(observations)
+        self.actions[self.step].copy_(actions)
+        self.log_probs[self.step].copy_(log_probs)
+        self.values[self.step].copy_(values)
+        self.rewards[self.step].copy_(rewards)
+        self.dones[self.step].copy_(dones)
+        self.step += 1
+
+    def clear(self):
+        self.step = 0
+
+    def compute_returns(self, last_values: torch.Tensor, gamma: float, lam: float):
+        """Compute the GAE advantages and the value targets.
+
+        The recursion :math:`A_t = \\delta_t + \\gamma \\lambda (1 - d_t) A_{t+1}` is evaluated as a single reverse
+        scan over time, where each step updates all environments with one batched tensor operation.
+
+        Args:
+            last_values: The values of the observations following the last stored step. Shape is (num_envs,).
+            gamma: The discount factor.
+            lam: The GAE lambda parameter.
+        """
+        not_dones = 1.0 - self.dones
+        # values of the next step for every time step
+        next_values = torch.cat((self.values[1:], last_values.unsqueeze(0)), dim=0)
+        deltas = self.rewards + gamma * next_values * not_dones - self.values
+        discounts = gamma * lam * not_dones
+
+        advantage = torch.zeros_like(last_values)
+        for t in reversed(range(self.num_steps)):
+            advantage = deltas[t] + discounts[t] * advantage
+            self.advantages[t] = advantage
+        torch.add(self.advantages, self.values, out=self.returns)
+
+    def mini_batch_generator(self, num_mini_batches: int, num_epochs: int):
+        """Yield shuffled mini-batches over the flattened (num_steps * num_envs) samples.
+
+        Each epoch draws one random permutation of all samples and splits it into ``num_mini_batches`` chunks.
+
+        Yields:
+            Tuples of observations, actions, log-probabilities, values, advantages and returns.
+        """
+        batch_size = self.num_samples
+        mini_batch_size = batch_size // num_mini_batches
+
+        observations = self.observations.flatten(0, 1)
+        actions = self.actions.flatten(0, 1)
+        log_probs = self.log_probs.flatten()
+        values = self.values.flatten()
+        advantages = self.advantages.flatten()
+        returns = self.returns.flatten()
+
+        for _ in range(num_epochs):
+            permutation = torch.randperm(batch_size, device=self.device)
+            for i in range(num_mini_batches):
+                index = permutation[i * mini_batch_size : (i + 1) * mini_batch_size]
+                yield (
+                    observations[index],
+                    actions[index],
+                    log_probs[index],
+                    values[index],
+                    advantages[index],
+                    returns[index],
+                )
@@ -0,0 +1,63 @@
+import torch
+
+
+class SyntheticVecEnv:
+    """Vectorized stand-in environment with random linear dynamics, for profiling the trainer without Isaac Sim.
+
+    The state evolves as ``obs' = tanh(obs @ A + actions @ B) + noise``. The reward penalizes the first
+    ``num_tracked`` observation dimensions and the action magnitude, and episodes end after ``max_episode_length``
+    steps or when the tracked dimensions leave a box. All environments are stepped with batched tensor operations.
+    """
+
+    def __init__(
+        self,
+        num_envs: int,
+        obs_dim: int = 255,
+        action_dim: int = 14,
+        max_episode_length: int = 1000,
+        num_tracked: int = 3,
+        device: str = "cpu",
+        seed: int = 0,
+    ):
+        self.num_envs = num_envs
+        self.obs_dim = obs_dim
+        self.action_dim = action_dim
+        self.max_episode_length = max_episode_length
+        self.num_tracked = num_tracked
+        self.device = device
+
+        generator = torch.Generator().manual_seed(seed)
+        self._state_matrix = (torch.randn(obs_dim, obs_dim, generator=generator) / obs_dim**0.5).to(device)
+        self._action_matrix = (torch.randn(action_dim, obs_dim, generator=generator) / action_dim**0.5).to(device)
+
+        self.obs = torch.zeros((num_envs, obs_dim), device=device)
+        self.rewards = torch.zeros(num_envs, device=device)
+        self.dones = torch.zeros(num_envs, device=device)
+        self.episode_length = torch.zeros(num_envs, dtype=torch.long, device=device)
+
+    def reset(self) -> torch.Tensor:
+        self.obs.uniform_(-0.1, 0.1)
+        self.episode_length.zero_()
+        return self.obs
+
+    def step(self, actions: torch.Tensor) -> tuple[torch.Tensor, torch.Tensor, torch.Tensor, dict]:
+        """Step all environments and reset the terminated ones.
+
+        Returns:
+            A tuple of observations (num_envs, obs_dim), rewards (num_envs,), done flags (num_envs,) and extras.
+        """
+        torch.tanh(self.obs @ self._state_matrix + actions @ self._action_matrix, out=self.obs)
+        self.obs.add_(torch.randn_like(self.obs), alpha=0.01)
+        self.episode_length += 1
+
+        tracked = self.obs[:, : self.num_tracked]
+        self.rewards = -tracked.square().sum(-1) - 0.01 * actions.square().sum(-1)
+        terminated = tracked.abs().amax(-1) > 0.9
+        timed_out = self.episode_length >= self.max_episode_length
+        done = terminated | timed_out
+        self.dones = done.float()
+
+        # reset the finished environments with masked writes
+        self.obs.copy_(torch.where(done.unsqueeze(-1), torch.empty_like(self.obs).uniform_(-0.1, 0.1), self.obs))
+        self.episode_length.masked_fill_(done, 0)
+        return self.obs, self.rewards, self.dones, {"time_outs": timed_out}
@@ -0,0 +1,120 @@
+import time
+from collections.abc import Callable
+
+import torch
+
+
+class ControlScheduler:
+    """Run a policy on a locomotion task every ``decimation`` physics steps.
+
+    The scheduler is driven by the physics loop: :meth:`pre_physics_step` is called before and
+    :meth:`post_physics_step` after every physics step. Between two control steps, the joint targets applied
+    by :meth:`G1LocomotionTask.step` are held by the articulation.
+
+    At a control step, the scheduler reads the state, calls the optional ``on_control_step`` hook (e.g. to
+    evaluate the rewards and reset finished environments), advances the velocity commands, observes, runs the
+    policy and applies the actions.
+    With ``async_inference`` on a CUDA device, the state is read and the policy is launched on a side stream
+    before the last physics substep, so inference overlaps with that substep; the actions are applied once the
+    substep is done. The policy then sees observations that are one physics step older.
+
+    The achieved control frequency and real-time factor are measured in wall-clock time, see :meth:`report`.
+    """
+
+    def __init__(
+        self,
+        task,
+        policy: Callable[[torch.Tensor], torch.Tensor],
+        decimation: int = None,
+        async_inference: bool = False,
+        on_control_step: Callable[[], None] = None,
+    ):
+        """Initialize the scheduler.
+
+        Args:
+            task: The initialized locomotion task.
+            policy: Callable mapping the policy observations to actions, e.g. a :class:`PolicyExporter` or
+                :meth:`PolicyInferenceEngine.act`.
+            decimation: The number of physics steps per control step. Defaults to None, in which case the
+                decimation of the task is used.
+            async_inference: Whether to overlap inference with the last physics substep. Only used on CUDA.
+                Defaults to False.
+            on_control_step: Called at every control step, after the state is read and before the observation.
+        """
+        self.task = task
+        self.policy = policy
+        self.decimation = decimation if decimation is not None else task.decimation
+        self.on_control_step = on_control_step
+        self.control_dt = task.physics_dt * self.decimation
+        device = torch.device(task.device)
+        self._stream = torch.cuda.Stream(device) if async_inference and device.type == "cuda" else None
+        self._actions = torch.zeros((task._num_envs, len(task.joint_ids)), dtype=task.dtype, device=device)
+        self._substep = 0
+
+        # wall-clock measurement of the control rate
+        self.num_control_steps = 0
+        self._start_time: float = None  # type: ignore
+
+    @property
+    def async_inference(self) -> bool:
+        return self._stream is not None
+
+    def pre_physics_step(self):
+        if self._stream is not None and self._substep == self.decimation - 1:
+            obs = self._observe()
+            self._stream.wait_stream(torch.cuda.current_stream(self._stream.device))
+            with torch.cuda.stream(self._stream):
+                self._infer(obs)
+
+    def post_physics_step(self) -> bool:
+        """Count the physics step, and run a control step if ``decimation`` steps have passed.
+
+        Returns:
+            Whether a control step was run.
+        """
+        self._substep += 1
+        if self._substep < self.decimation:
+            return False
+        self._substep = 0
+
+        if self._stream is not None:
+            torch.cuda.current_stream(self._stream.device).wait_stream(self._stream)
+        else:
+            self._infer(self._observe())
+        self.task.step(self._actions)
+
+        if self._start_time is None:
+            self._start_time = time.perf_counter()
+        else:
+            self.num_control_steps += 1
+        return True
+
+    def reset_statistics(self):
+        self.num_control_steps = 0
+        self._start_time = None
+
+    def statistics(self) -> dict[str, float]:
+        """The target and achieved control frequencies in Hz, and the real-time factor of the simulation."""
+        elapsed = time.perf_counter() - self._start_time if self._start_time is not None else 0.0
+        achieved = self.num_control_steps / elapsed if elapsed > 0 else 0.0
+        target = 1.0 / self.control_dt
+        return {"target_hz": target, "achieved_hz": achieved, "real_time_factor": achieved / target}
+
+    def report(self):
+        stats = self.statistics()
+        mode = "async" if self.async_inference else "sync"
+        print(
+            f"[ControlScheduler] decimation {self.decimation} ({mode}): target {stats['target_hz']:.1f} Hz,"
+            f" achieved {stats['achieved_hz']:.1f} Hz, real-time factor {stats['real_time_factor']:.2f}"
+        )
+
+    def _observe(self) -> torch.Tensor:
+        self.task.update_state()
+        if self.on_control_step is not None:
+            self.on_control_step()
+        self.task.update_commands()
+        return self.task.get_observation()["policy"]
+
+    @torch.no_grad()
+    def _infer(self, obs: torch.Tensor):
+        self._actions.copy_(self.policy(obs))
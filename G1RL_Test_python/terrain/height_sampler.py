@@ -0,0 +1,81 @@
+import numpy as np
+import torch
+
+
+class HeightSampler:
+    """Batched terrain height lookup by bilinear interpolation of a heightfield.
+
+    The heightfield is kept as a flat tensor on the device, and the four neighbouring pixels of all query
+    points are read with a single gather per corner, so sampling the height scans of thousands of
+    environments costs a few kernel launches. Points outside the heightfield take the height of its edge.
+    """
+
+    def __init__(
+        self,
+        heights: np.ndarray,
+        horizontal_scale: float,
+        origin_xy: tuple[float, float] = (0.0, 0.0),
+        device: str = "cpu",
+        dtype: torch.dtype = torch.float32,
+    ):
+        """Initialize the sampler.
+
+        Args:
+            heights: The heights in meters. Shape is (num_x, num_y).
+            horizontal_scale: The size of a pixel in meters.
+            origin_xy: The world (x, y) position of the pixel (0, 0). Defaults to (0, 0).
+            device: The device used for processing. Defaults to "cpu".
+            dtype: The data type of the heights. Defaults to float32.
+        """
+        self.num_x, self.num_y = heights.shape
+        self.horizontal_scale = horizontal_scale
+        self._heights = torch.as_tensor(heights, dtype=dtype, device=device).reshape(-1)
+        self._origin = torch.tensor(origin_xy, dtype=dtype, device=device)
+        self._max_index = torch.tensor([self.num_x - 1, self.num_y - 1], dtype=dtype, device=device)
+
+    @classmethod
+    def from_terrain(cls, terrain, device: str = "cpu", dtype: torch.dtype = torch.float32) -> "HeightSampler":
+        """Create a sampler of the heightfield of a :class:`TerrainGenerator`."""
+        return cls(terrain.heights, terrain.horizontal_scale, terrain.origin_xy, device=device, dtype=dtype)
+
+    def sample(self, points_xy: torch.Tensor) -> torch.Tensor:
+        """Terrain heights at the given world positions.
+
+        Args:
+            points_xy: The (x, y) positions in the world frame. Shape is (..., 2).
+
+        Returns:
+            The heights in meters. Shape is (...).
+        """
+        grid = ((points_xy - self._origin) / self.horizontal_scale).clamp(min=0.0)
+        grid = torch.minimum(grid, self._max_index)
+        index0 = grid.floor()
+        frac = grid - index0
+        index0 = index0.long()
+        # upper neighbours, clamped at the last row and column (where the fraction is zero)
+        x0, y0 = index0[..., 0], index0[..., 1]
+        x1 = torch.clamp(x0 + 1, max=self.num_x - 1)
+        y1 = torch.clamp(y0 + 1, max=self.num_y - 1)
+        fx, fy = frac[..., 0], frac[..., 1]
+
+        h00 = self._heights[x0 * self.num_y + y0]
+        h10 = self._heights[x1 * self.num_y + y0]
+        h01 = self._heights[x0 * self.num_y + y1]
+        h11 = self._heights[x1 * self.num_y + y1]
+        h0 = torch.lerp(h00, h10, fx)
+        h1 = torch.lerp(h01, h11, fx)
+        return torch.lerp(h0, h1, fy)
+
+
+def grid_pattern(
+    size: tuple[float, float] = (1.6, 1.0), resolution: float = 0.1, device: str = "cpu", dtype=torch.float32
+) -> torch.Tensor:
+    """Regular grid of scan points centered at the origin, e.g. around the base of the robot.
+
+    Returns:
+        The (x, y) offsets of the points. Shape is (num_points, 2).
+    """
+    x = torch.arange(-0.5 * size[0], 0.5 * size[0] + 1e-6, resolution, dtype=dtype, device=device)
+    y = torch.arange(-0.5 * size[1], 0.5 * size[1] + 1e-6, resolution, dtype=dtype, device=device)
+    grid_x, grid_y = torch.meshgrid(x, y, indexing="ij")
+    return torch.stack((grid_x.reshape(-1), grid_y.reshape(-1)), dim=-1)
@@ -0,0 +1,284 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+
+# bump when the generated heights change for the same parameters, to invalidate the disk cache
+_CACHE_VERSION = 1
+
+SUB_TERRAINS = ("flat", "pyramid_slope", "inverted_pyramid_slope", "pyramid_stairs", "inverted_pyramid_stairs", "rough")
+
+
+"""
+Sub-terrains.
+
+Every function returns the heights in meters of one tile, as a float32 array of shape
+(size_x / horizontal_scale, size_y / horizontal_scale). The difficulty in [0, 1] interpolates the parameter ranges.
+"""
+
+
+def _tile_coordinates(size: tuple[float, float], horizontal_scale: float) -> tuple[np.ndarray, np.ndarray, float]:
+    """Distance of every pixel of a tile to its center along x and y, and the half size of the tile."""
+    num_x, num_y = int(size[0] / horizontal_scale), int(size[1] / horizontal_scale)
+    x = (np.arange(num_x, dtype=np.float32) + 0.5) * horizontal_scale - 0.5 * size[0]
+    y = (np.arange(num_y, dtype=np.float32) + 0.5) * horizontal_scale - 0.5 * size[1]
+    return np.abs(x)[:, None], np.abs(y)[None, :], 0.5 * min(size)
+
+
+def flat_terrain(difficulty: float, size: tuple[float, float], horizontal_scale: float, rng) -> np.ndarray:
+    return np.zeros((int(size[0] / horizontal_scale), int(size[1] / horizontal_scale)), dtype=np.float32)
+
+
+def pyramid_slope_terrain(
+    difficulty: float,
+    size: tuple[float, float],
+    horizontal_scale: float,
+    rng,
+    slope_range: tuple[float, float] = (0.0, 0.4),
+    platform_width: float = 1.5,
+    inverted: bool = False,
+) -> np.ndarray:
+    """Pyramid rising with a constant slope from the border to a flat platform at the center."""
+    slope = slope_range[0] + difficulty * (slope_range[1] - slope_range[0])
+    dx, dy, half = _tile_coordinates(size, horizontal_scale)
+    distance = np.maximum(np.maximum(dx, dy), 0.5 * platform_width)
+    heights = slope * np.clip(half - distance, 0.0, None)
+    return (-heights if inverted else heights).astype(np.float32)
+
+
+def pyramid_stairs_terrain(
+    difficulty: float,
+    size: tuple[float, float],
+    horizontal_scale: float,
+    rng,
+    step_height_range: tuple[float, float] = (0.05, 0.2),
+    step_width: float = 0.3,
+    platform_width: float = 3.0,
+    inverted: bool = False,
+) -> np.ndarray:
+    """Square rings of steps rising from the border to a flat platform at the center."""
+    step_height = step_height_range[0] + difficulty * (step_height_range[1] - step_height_range[0])
+    dx, dy, half = _tile_coordinates(size, horizontal_scale)
+    num_steps = max(int((half - 0.5 * platform_width) / step_width), 0)
+    step_index = np.clip(np.floor((half - np.maximum(dx, dy)) / step_width), 0, num_steps)
+    heights = step_height * step_index
+    return (-heights if inverted else heights).astype(np.float32)
+
+
+def random_rough_terrain(
+    difficulty: float,
+    size: tuple[float, float],
+    horizontal_scale: float,
+    rng,
+    noise_range: tuple[float, float] = (0.02, 0.08),
+    noise_step: float = 0.005,
+    downsampled_scale: float = 0.2,
+) -> np.ndarray:
+    """Uniform noise sampled on a coarse grid and bilinearly interpolated to the tile resolution."""
+    amplitude = noise_range[0] + difficulty * (noise_range[1] - noise_range[0])
+    num_x, num_y = int(size[0] / horizontal_scale), int(size[1] / horizontal_scale)
+    coarse_x, coarse_y = int(size[0] / downsampled_scale) + 1, int(size[1] / downsampled_scale) + 1
+    levels = np.arange(-amplitude, amplitude + noise_step, noise_step)
+    coarse = rng.choice(levels, size=(coarse_x, coarse_y)).astype(np.float32)
+    # bilinear interpolation of the coarse grid at the pixel positions
+    u = np.linspace(0.0, coarse_x - 1, num_x, dtype=np.float32)
+    v = np.linspace(0.0, coarse_y - 1, num_y, dtype=np.float32)
+    u0 = np.minimum(u.astype(np.int64), coarse_x - 2)
+    v0 = np.minimum(v.astype(np.int64), coarse_y - 2)
+    fu, fv = (u - u0)[:, None], (v - v0)[None, :]
+    u0, v0 = u0[:, None], v0[None, :]
+    heights = (
+        coarse[u0, v0] * (1 - fu) * (1 - fv)
+        + coarse[u0 + 1, v0] * fu * (1 - fv)
+        + coarse[u0, v0 + 1] * (1 - fu) * fv
+        + coarse[u0 + 1, v0 + 1] * fu * fv
+    )
+    return heights.astype(np.float32)
+
+
+_SUB_TERRAIN_FUNCS = {
+    "flat": flat_terrain,
+    "pyramid_slope": pyramid_slope_terrain,
+    "inverted_pyramid_slope": lambda *args, **kwargs: pyramid_slope_terrain(*args, inverted=True, **kwargs),
+    "pyramid_stairs": pyramid_stairs_terrain,
+    "inverted_pyramid_stairs": lambda *args, **kwargs: pyramid_stairs_terrain(*args, inverted=True, **kwargs),
+    "rough": random_rough_terrain,
+}
+
+
+"""
+Meshes.
+"""
+
+
+def heightfield_to_mesh(
+    heights: np.ndarray, horizontal_scale: float, origin: tuple[float, float] = (0.0, 0.0)
+) -> tuple[np.ndarray, np.ndarray]:
+    """Convert a heightfield to a triangle mesh with one vertex per pixel and two triangles per cell.
+
+    Args:
+        heights: The heights in meters. Shape is (num_x, num_y).
+        horizontal_scale: The size of a pixel in meters.
+        origin: The world (x, y) position of the pixel (0, 0). Defaults to (0, 0).
+
+    Returns:
+        The vertices of shape (num_x * num_y, 3) and the vertex indices of the triangles of shape
+        (2 * (num_x - 1) * (num_y - 1), 3).
+    """
+    num_x, num_y = heights.shape
+    x = origin[0] + np.arange(num_x, dtype=np.float32) * horizontal_scale
+    y = origin[1] + np.arange(num_y, dtype=np.float32) * horizontal_scale
+    vertices = np.empty((num_x, num_y, 3), dtype=np.float32)
+    vertices[..., 0] = x[:, None]
+    vertices[..., 1] = y[None, :]
+    vertices[..., 2] = heights
+
+    # corners of every cell: (i, j), (i + 1, j), (i, j + 1), (i + 1, j + 1)
+    ids = np.arange(num_x * num_y, dtype=np.int32).reshape(num_x, num_y)
+    v00, v10 = ids[:-1, :-1].reshape(-1), ids[1:, :-1].reshape(-1)
+    v01, v11 = ids[:-1, 1:].reshape(-1), ids[1:, 1:].reshape(-1)
+    triangles = np.empty((2 * len(v00), 3), dtype=np.int32)
+    triangles[0::2] = np.stack((v00, v11, v01), axis=-1)
+    triangles[1::2] = np.stack((v00, v10, v11), axis=-1)
+    return vertices.reshape(-1, 3), triangles
+
+
+"""
+Generator.
+"""
+
+
+class TerrainGenerator:
+    """Grid of sub-terrain tiles, merged into one heightfield.
+
+    The rows of the grid are difficulty levels (increasing with the row index, for the terrain curriculum) and
+    the columns are terrain types, assigned according to ``proportions``. The generated heightfield and the
+    tile origins are cached on disk under a hash of all generation parameters, so later runs with the same
+    parameters load them instead of generating them.
+    """
+
+    def __init__(
+        self,
+        num_rows: int = 10,
+        num_cols: int = 20,
+        size: tuple[float, float] = (8.0, 8.0),
+        border_width: float = 20.0,
+        horizontal_scale: float = 0.1,
+        proportions: dict[str, float] = None,
+        seed: int = 0,
+        cache_dir: str = os.path.join(os.path.expanduser("~"), ".cache", "g1rl", "terrain"),
+        use_cache: bool = True,
+    ):
+        """Initialize and generate (or load) the terrain.
+
+        Args:
+            num_rows: The number of difficulty levels. Defaults to 10.
+            num_cols: The number of tiles per level. Defaults to 20.
+            size: The size of a tile in meters. Defaults to (8.0, 8.0).
+            border_width: The width of the flat border around the grid in meters. Defaults to 20.0.
+            horizontal_scale: The size of a heightfield pixel in meters. Defaults to 0.1.
+            proportions: The share of columns of every sub-terrain type (see :data:`SUB_TERRAINS`).
+                Defaults to None, in which case slopes, stairs and rough terrain are mixed.
+            seed: The seed of the random generator. Defaults to 0.
+            cache_dir: The directory of the disk cache. Defaults to ``~/.cache/g1rl/terrain``.
+            use_cache: Whether to read and write the disk cache. Defaults to True.
+
+        Raises:
+            ValueError: If a sub-terrain type is unknown.
+        """
+        if proportions is None:
+            proportions = {
+                "pyramid_slope": 0.2,
+                "inverted_pyramid_slope": 0.2,
+                "pyramid_stairs": 0.2,
+                "inverted_pyramid_stairs": 0.2,
+                "rough": 0.2,
+            }
+        for name in proportions:
+            if name not in _SUB_TERRAIN_FUNCS:
+                raise ValueError(f"Unknown sub-terrain '{name}'. Available: {SUB_TERRAINS}.")
+        self.num_rows = num_rows
+        self.num_cols = num_cols
+        self.size = tuple(size)
+        self.border_width = border_width
+        self.horizontal_scale = horizontal_scale
+        self.proportions = dict(proportions)
+        self.seed = seed
+        # world (x, y) position of the pixel (0, 0): the tile grid is centered at the world origin
+        self.origin_xy = (
+            -0.5 * num_rows * self.size[0] - border_width,
+            -0.5 * num_cols * self.size[1] - border_width,
+        )
+
+        cache_path = os.path.join(cache_dir, f"{self.cache_key()}.npz") if use_cache else None
+        if cache_path is not None and os.path.isfile(cache_path):
+            data = np.load(cache_path)
+            self.heights, self.tile_origins = data["heights"], data["tile_origins"]
+            self.loaded_from_cache = True
+        else:
+            self.heights, self.tile_origins = self._generate()
+            self.loaded_from_cache = False
+            if cache_path is not None:
+                os.makedirs(cache_dir, exist_ok=True)
+                # write to a temporary file first, so that concurrent runs never read a partial file
+                tmp_path = f"{cache_path}.{os.getpid()}.tmp.npz"
+                np.savez(tmp_path, heights=self.heights, tile_origins=self.tile_origins)
+                os.replace(tmp_path, cache_path)
+
+    def cache_key(self) -> str:
+        """Hash of all parameters that determine the generated terrain."""
+        params = {
+            "version": _CACHE_VERSION,
+            "num_rows": self.num_rows,
+            "num_cols": self.num_cols,
+            "size": self.size,
+            "border_width": self.border_width,
+            "horizontal_scale": self.horizontal_scale,
+            "proportions": sorted(self.proportions.items()),
+            "seed": self.seed,
+        }
+        return hashlib.sha256(json.dumps(params, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+    @property
+    def column_types(self) -> list[str]:
+        """The sub-terrain type of every column of the grid."""
+        names = list(self.proportions)
+        cumulative = np.cumsum([self.proportions[name] for name in names])
+        cumulative /= cumulative[-1]
+        return [names[int(np.searchsorted(cumulative, (col + 0.5) / self.num_cols))] for col in range(self.num_cols)]
+
+    def mesh(self) -> tuple[np.ndarray, np.ndarray]:
+        """The triangle mesh of the whole terrain in world coordinates, see :func:`heightfield_to_mesh`."""
+        return heightfield_to_mesh(self.heights, self.horizontal_scale, self.origin_xy)
+
+    def _generate(self) -> tuple[np.ndarray, np.ndarray]:
+        rng = np.random.default_rng(self.seed)
+        tile_x = int(self.size[0] / self.horizontal_scale)
+        tile_y = int(self.size[1] / self.horizontal_scale)
+        border = int(self.border_width / self.horizontal_scale)
+        heights = np.zeros((self.num_rows * tile_x + 2 * border, self.num_cols * tile_y + 2 * border), np.float32)
+        tile_origins = np.zeros((self.num_rows, self.num_cols, 3), dtype=np.float32)
+
+        column_types = self.column_types
+        # half width in pixels of the central 1 m square of a tile
+        center_half = max(int(0.5 / self.horizontal_scale), 1)
+        for row in range(self.num_rows):
+            for col in range(self.num_cols):
+                # difficulty increases with the row, with some variation within a level
+                difficulty = (row + rng.uniform()) / self.num_rows
+                tile = _SUB_TERRAIN_FUNCS[column_types[col]](difficulty, self.size, self.horizontal_scale, rng)
+                start_x, start_y = border + row * tile_x, border + col * tile_y
+                heights[start_x : start_x + tile_x, start_y : start_y + tile_y] = tile
+                # origin at the tile center, on the highest point of the central 1 m square
+                center = (
+                    slice(tile_x // 2 - center_half, tile_x // 2 + center_half),
+                    slice(tile_y // 2 - center_half, tile_y // 2 + center_half),
+                )
+                tile_origins[row, col] = (
+                    self.origin_xy[0] + (start_x + 0.5 * tile_x) * self.horizontal_scale,
+                    self.origin_xy[1] + (start_y + 0.5 * tile_y) * self.horizontal_scale,
+                    tile[center].max(),
+                )
+        return heights, tile_origins
+
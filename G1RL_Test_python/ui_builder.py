@@ -13,6 +13,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import os
+
 import numpy as np
 import omni.timeline
 import omni.ui as ui
@@ -24,6 +26,11 @@ from isaacsim.gui.components.ui_utils import get_style
 
 from .locomotion_task import G1LocomotionTask
 
+POLICY_PATH = "/home/linfan/Projects/WBC-AGILE/agile/data/policy/velocity_g1/unitree_g1_velocity_history.pt"
+# checkpoints compared side by side by "Evaluate Policies", one group of environments each
+EVAL_POLICY_PATHS = [POLICY_PATH]
+EVAL_REPORT_INTERVAL = 1000
+
 class UIBuilder:
     def __init__(self):
         # Frames are sub-windows that can contain multiple UI elements
@@ -63,6 +70,12 @@ class UIBuilder:
             if not self.task.initialized:
                 self.task.initialize()
                 print("[UIBuilder] task initialized")
+            if self.scheduler is not None:
+                # the callback separates two physics steps: finish the last one, then prepare the next one
+                if self.scheduler.post_physics_step() and self.evaluator.num_steps % EVAL_REPORT_INTERVAL == 0:
+                    self.evaluator.report([os.path.basename(path) for path in EVAL_POLICY_PATHS])
+                    self.scheduler.report()
+                self.scheduler.pre_physics_step()
 
 
     def on_stage_event(self, event):
@@ -104,30 +117,36 @@ class UIBuilder:
                 ui.Button("Setup Stage", clicked_fn=self.setup_stage)
                 ui.Button("Get Observation", clicked_fn=self.get_observation)
                 ui.Button("Reset", clicked_fn=self.reset_task)
+                ui.Button("Evaluate Policies", clicked_fn=self.evaluate_policies)
     
     def load_policy(self):
         print("Load Policy")
         import torch
-        POLICY_PATH = "/home/linfan/Projects/WBC-AGILE/agile/data/policy/velocity_g1/unitree_g1_velocity_history.pt"
-        self.policy = torch.jit.load(POLICY_PATH, map_location="cuda")
-        print("Policy loaded")
-        print("[UIBuilder] policy", self.policy)
-        for name, param in self.policy.named_parameters():
-            print(f"{name:40s} {list(param.shape)}")
-
-        obs = torch.zeros(1, 255).to("cuda")  # batch of 1, 255-dim input
-        with torch.no_grad():
-            action = self.policy(obs)   # or policy.actor(obs), depending on the forward()
+
+        from .policy import PolicyExporter, PolicyInferenceEngine
+
+        # the policy is loaded and captured once, later clicks reuse the engine
+        if self.policy_engine is None:
+            policy = PolicyExporter.load(POLICY_PATH, device="cuda")
+            print("Policy loaded")
+            print("[UIBuilder] policy", policy)
+            for name, param in policy.named_parameters():
+                print(f"{name:40s} {list(param.shape)}")
+            self.policy_engine = PolicyInferenceEngine(policy, num_envs=1, device="cuda")
+
+        obs = torch.zeros(1, 255, device="cuda")  # batch of 1, 255-dim input
+        action = self.policy_engine.act(obs)
         print("[UIBuilder] action", action)
 
-        del self.policy
-        torch.cuda.empty_cache()
     ######################################################################################
     # Functions Below This Point Support The Provided Example And Can Be Replaced/Deleted
     ######################################################################################
 
     def _on_init(self):
         self.task = None
+        self.policy_engine = None
+        self.evaluator = None
+        self.scheduler = None
 
     def setup_stage(self):
         print("Setup Stage")
@@ -141,6 +160,7 @@ class UIBuilder:
     def get_observation(self):
         print("Get Observation")
         if self.task is not None and self.task.initialized:
+            self.task.update_state()
             obs = self.task.get_observation()
             print("[UIBuilder] obs", obs)
 
@@ -148,3 +168,22 @@ class UIBuilder:
         print("reset task")
         if self.task is not None and self.task.initialized:
             self.task.reset()
+
+    def evaluate_policies(self):
+        """Run the checkpoints of EVAL_POLICY_PATHS on separate groups of environments, while the timeline plays."""
+        print("Evaluate Policies")
+        if self.task is None or not self.task.initialized:
+            print("[UIBuilder] set up the stage and play the timeline first")
+            return
+        from .evaluation import MultiPolicyEvaluator
+        from .policy import PolicyExporter
+        from .scheduler import ControlScheduler
+
+        # loaded once, cached by path and modification time
+        policies = [PolicyExporter.load(path, device=self.task.device) for path in EVAL_POLICY_PATHS]
+        self.evaluator = MultiPolicyEvaluator(self.task, policies)
+        self.evaluator.reset()
+        # the policies act every task.decimation physics steps, with inference overlapping the last substep
+        self.scheduler = ControlScheduler(
+            self.task, self.evaluator.policy, async_inference=True, on_control_step=self.evaluator.score
+        )
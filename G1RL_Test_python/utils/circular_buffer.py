@@ -17,15 +17,21 @@ class CircularBuffer:
 
     The shape of the appended data is expected to be (batch_size, ...), where the first dimension is the
     batch dimension. Correspondingly, the shape of the ring buffer is (max_len, batch_size, ...).
+
+    In mirrored mode, every entry is written twice into a ring of length ``2 * max_len``. Any window of
+    ``max_len`` consecutive slots is then ordered chronologically, so :attr:`buffer` returns a view into
+    the storage instead of a rolled copy, at the cost of a second write per append.
     """
 
-    def __init__(self, max_len: int, batch_size: int, device: str):
+    def __init__(self, max_len: int, batch_size: int, device: str, mirrored: bool = False):
         """Initialize the circular buffer.
 
         Args:
             max_len: The maximum length of the circular buffer. The minimum allowed value is 1.
             batch_size: The batch dimension of the data.
             device: The device used for processing.
+            mirrored: Whether to store the data twice so that the ordered history can be read without a copy.
+                Defaults to False.
 
         Raises:
             ValueError: If the buffer size is less than one.
@@ -35,10 +41,12 @@ class CircularBuffer:
         # set the parameters
         self._batch_size = batch_size
         self._device = device
+        self._mirrored = mirrored
         self._ALL_INDICES = torch.arange(batch_size, device=device)
 
-        # max length tensor for comparisons
+        # max length tensor for comparisons, and on the host to avoid reading it back from the device
         self._max_len = torch.full((batch_size,), max_len, dtype=torch.int, device=device)
+        self._max_len_int = max_len
         # number of data pushes passed since the last call to :meth:`reset`
         self._num_pushes = torch.zeros(batch_size, dtype=torch.long, device=device)
         # the pointer to the current head of the circular buffer (-1 means not initialized)
@@ -61,10 +69,15 @@ class CircularBuffer:
         """The device used for processing."""
         return self._device
 
+    @property
+    def mirrored(self) -> bool:
+        """Whether the ring buffer stores every entry twice."""
+        return self._mirrored
+
     @property
     def max_length(self) -> int:
         """The maximum length of the ring buffer."""
-        return int(self._max_len[0].item())
+        return self._max_len_int
 
     @property
     def current_length(self) -> torch.Tensor:
@@ -78,11 +91,18 @@ class CircularBuffer:
     @property
     def buffer(self) -> torch.Tensor:
         """Complete circular buffer with most recent entry at the end and oldest entry at the beginning.
+
+        In mirrored mode, the returned tensor is a view into the storage. It must not be modified in place and
+        it is only valid until the next call to :meth:`append` or :meth:`reset`.
+
         Returns:
             Complete circular buffer with most recent entry at the end and oldest entry at the beginning of dimension 1. The shape is [batch_size, max_length, data.shape[1:]].
         """
+        if self._mirrored:
+            start = self._pointer + 1
+            return torch.transpose(self._buffer[start : start + self._max_len_int], dim0=0, dim1=1)
         buf = self._buffer.clone()
-        buf = torch.roll(buf, shifts=self.max_length - self._pointer - 1, dims=0)
+        buf = torch.roll(buf, shifts=self._max_len_int - self._pointer - 1, dims=0)
         return torch.transpose(buf, dim0=0, dim1=1)
 
     """
@@ -123,11 +143,14 @@ class CircularBuffer:
         # at the first call, initialize the buffer size
         if self._buffer is None:
             self._pointer = -1
-            self._buffer = torch.empty((self.max_length, *data.shape), dtype=data.dtype, device=self._device)
+            num_slots = 2 * self._max_len_int if self._mirrored else self._max_len_int
+            self._buffer = torch.empty((num_slots, *data.shape), dtype=data.dtype, device=self._device)
         # move the head to the next slot
-        self._pointer = (self._pointer + 1) % self.max_length
+        self._pointer = (self._pointer + 1) % self._max_len_int
         # add the new data to the last layer
         self._buffer[self._pointer] = data
+        if self._mirrored:
+            self._buffer[self._pointer + self._max_len_int] = data
         # Check for batches with zero pushes and initialize all values in batch to first append
         is_first_push = self._num_pushes == 0
         if torch.any(is_first_push):
@@ -162,6 +185,130 @@ class CircularBuffer:
         # admissible lag
         valid_keys = torch.minimum(key, self._num_pushes - 1)
         # the index in the circular buffer (pointer points to the last+1 index)
-        index_in_buffer = torch.remainder(self._pointer - valid_keys, self.max_length)
+        index_in_buffer = torch.remainder(self._pointer - valid_keys, self._max_len_int)
+        # return output
+        return self._buffer[index_in_buffer, self._ALL_INDICES]
+
+
+class SyncFreeCircularBuffer(CircularBuffer):
+    """Circular buffer whose operations never synchronize the device with the host.
+
+    This class has the same interface and outputs as :class:`CircularBuffer`, but keeps the head pointer
+    in a device tensor and replaces the data-dependent branches of the base class with masked writes.
+    No operation reads a device value on the host, so a loop of :meth:`append` and :meth:`__getitem__`
+    calls does not stall the stream and can be captured in a CUDA graph (once the storage has been
+    allocated by the first append).
+
+    Unlike the base class, :meth:`append` does not fill all the slots of the batch indices on their first push
+    (which would rewrite the whole ring at every call): it only writes the head slot, and the reads clamp the
+    lags to the first push instead.
+
+    The only behavioral difference concerns batch indices that have not been pushed to since the last
+    call to :meth:`reset`: instead of raising an error, :meth:`__getitem__` returns zeros for them.
+    """
+
+    def __init__(self, max_len: int, batch_size: int, device: str, mirrored: bool = False):
+        """Initialize the circular buffer.
+
+        Args:
+            max_len: The maximum length of the circular buffer. The minimum allowed value is 1.
+            batch_size: The batch dimension of the data.
+            device: The device used for processing.
+            mirrored: Whether to store the data twice so that the ordered history can be read without a copy.
+                Defaults to False.
+
+        Raises:
+            ValueError: If the buffer size is less than one.
+        """
+        super().__init__(max_len, batch_size, device, mirrored)
+        # the pointer to the current head of the circular buffer, stored on the device
+        self._pointer_tensor = torch.full((1,), -1, dtype=torch.long, device=device)
+        # lags of the ordered history, from the oldest to the most recent entry
+        self._history_lags = torch.arange(max_len - 1, -1, -1, dtype=torch.long, device=device)
+
+    """
+    Properties.
+    """
+
+    @property
+    def buffer(self) -> torch.Tensor:
+        """Complete circular buffer with most recent entry at the end and oldest entry at the beginning.
+
+        Since the head pointer lives on the device, the ordered history is gathered into a new tensor in both
+        modes. The mirrored mode only saves the modulo on the slot indices. The entries older than the first
+        push of a batch index repeat its first push, as in the base class.
+
+        Returns:
+            Complete circular buffer with most recent entry at the end and oldest entry at the beginning of dimension 1. The shape is [batch_size, max_length, data.shape[1:]].
+        """
+        # admissible lag of every slot and batch index. Shape is (max_length, batch_size)
+        lags = torch.minimum(self._history_lags.unsqueeze(1), torch.clamp(self._num_pushes - 1, min=0))
+        if self._mirrored:
+            index = self._pointer_tensor + self._max_len_int - lags
+        else:
+            index = torch.remainder(self._pointer_tensor - lags, self._max_len_int)
+        return torch.transpose(self._buffer[index, self._ALL_INDICES], dim0=0, dim1=1)
+
+    """
+    Operations.
+    """
+
+    def append(self, data: torch.Tensor):
+        """Append the data to the circular buffer.
+
+        Args:
+            data: The data to append to the circular buffer. The first dimension should be the batch dimension.
+                Shape is (batch_size, ...).
+
+        Raises:
+            ValueError: If the input data has a different batch size than the buffer.
+        """
+        # check the batch size
+        if data.shape[0] != self.batch_size:
+            raise ValueError(f"The input data has '{data.shape[0]}' batch size while expecting '{self.batch_size}'")
+
+        # move the data to the device
+        data = data.to(self._device)
+        # at the first call, initialize the buffer size
+        if self._buffer is None:
+            self._pointer_tensor.fill_(-1)
+            num_slots = 2 * self._max_len_int if self._mirrored else self._max_len_int
+            self._buffer = torch.empty((num_slots, *data.shape), dtype=data.dtype, device=self._device)
+        # move the head to the next slot
+        self._pointer_tensor.add_(1).remainder_(self._max_len_int)
+        # add the new data to the last layer
+        self._buffer.index_copy_(0, self._pointer_tensor, data.unsqueeze(0))
+        if self._mirrored:
+            self._buffer.index_copy_(0, self._pointer_tensor + self._max_len_int, data.unsqueeze(0))
+        # increment number of number of pushes for all batches
+        self._num_pushes += 1
+
+    def __getitem__(self, key: torch.Tensor) -> torch.Tensor:
+        """Retrieve the data from the circular buffer in last-in-first-out (LIFO) fashion.
+
+        If the requested index is larger than the number of pushes since the last call to :meth:`reset`,
+        the oldest stored data is returned. Batch indices without any push since the last reset return zeros.
+
+        Args:
+            key: The index to retrieve from the circular buffer. Shape is (batch_size,).
+
+        Returns:
+            The data from the circular buffer. Shape is (batch_size, ...).
+
+        Raises:
+            ValueError: If the input key has a different batch size than the buffer.
+            RuntimeError: If no data has ever been appended to the buffer.
+        """
+        # check the batch size
+        if len(key) != self.batch_size:
+            raise ValueError(f"The argument 'key' has length {key.shape[0]}, while expecting {self.batch_size}")
+        # check if the storage exists (host-side check only)
+        if self._buffer is None:
+            raise RuntimeError("Attempting to retrieve data on an empty circular buffer. Please append data first.")
+
+        # admissible lag (empty batch indices read the zeroed head slot)
+        valid_keys = torch.clamp(torch.minimum(key.to(self._device), self._num_pushes - 1), min=0)
+        # the index in the circular buffer (pointer points to the last+1 index)
+        index_in_buffer = torch.remainder(self._pointer_tensor - valid_keys, self._max_len_int)
         # return output
         return self._buffer[index_in_buffer, self._ALL_INDICES]
@@ -0,0 +1,191 @@
+"""Rotation math for on-robot deployment, without torch.
+
+The functions have the same names, conventions and results as their counterparts in :mod:`math_utils`, and
+are cross-checked against them by ``benchmarks/deploy_math_benchmark.py``. Quaternions are in (w, x, y, z).
+
+A single sample (a sequence or a 1D array, e.g. ``quat`` of shape (4,)) is computed on Python floats with the
+``math`` module, which avoids the per-operation overhead of tensors and small arrays in a control loop that
+runs every few milliseconds. A batch (an array with a leading batch dimension, e.g. ``quat`` of shape (N, 4))
+is computed with vectorized NumPy.
+"""
+
+import math
+
+import numpy as np
+
+
+def normalize(x, eps: float = 1e-9) -> np.ndarray:
+    """Normalizes a vector (or a batch of vectors along the last dimension) to unit length."""
+    if _is_batch(x):
+        x = np.asarray(x)
+        return x / np.maximum(np.linalg.norm(x, axis=-1, keepdims=True), eps)
+    x = _components(x)
+    scale = 1.0 / max(math.sqrt(sum(value * value for value in x)), eps)
+    return np.array([value * scale for value in x])
+
+
+def wrap_to_pi(angles):
+    r"""Wraps angles (in radians) to the range :math:`[-\pi, \pi]`, see :func:`math_utils.wrap_to_pi`."""
+    if isinstance(angles, np.ndarray):
+        wrapped = (angles + np.pi) % (2 * np.pi)
+        return np.where((wrapped == 0) & (angles > 0), np.pi, wrapped - np.pi)
+    wrapped = (angles + math.pi) % (2 * math.pi)
+    return math.pi if wrapped == 0 and angles > 0 else wrapped - math.pi
+
+
+def quat_conjugate(q) -> np.ndarray:
+    """Computes the conjugate of a quaternion."""
+    if _is_batch(q):
+        return np.asarray(q) * np.array([1.0, -1.0, -1.0, -1.0])
+    w, x, y, z = _components(q)
+    return np.array([w, -x, -y, -z])
+
+
+def quat_inv(q, eps: float = 1e-9) -> np.ndarray:
+    """Computes the inverse of a quaternion."""
+    if _is_batch(q):
+        q = np.asarray(q)
+        return quat_conjugate(q) / np.maximum(np.sum(q * q, axis=-1, keepdims=True), eps)
+    w, x, y, z = _components(q)
+    scale = 1.0 / max(w * w + x * x + y * y + z * z, eps)
+    return np.array([w * scale, -x * scale, -y * scale, -z * scale])
+
+
+def quat_mul(q1, q2) -> np.ndarray:
+    """Multiply two quaternions together."""
+    if _is_batch(q1) or _is_batch(q2):
+        w1, x1, y1, z1 = np.moveaxis(np.asarray(q1), -1, 0)
+        w2, x2, y2, z2 = np.moveaxis(np.asarray(q2), -1, 0)
+    else:
+        w1, x1, y1, z1 = _components(q1)
+        w2, x2, y2, z2 = _components(q2)
+    w = w1 * w2 - x1 * x2 - y1 * y2 - z1 * z2
+    x = w1 * x2 + x1 * w2 + y1 * z2 - z1 * y2
+    y = w1 * y2 - x1 * z2 + y1 * w2 + z1 * x2
+    z = w1 * z2 + x1 * y2 - y1 * x2 + z1 * w2
+    return _stack(w, x, y, z)
+
+
+def quat_apply(quat, vec) -> np.ndarray:
+    """Apply a quaternion rotation to a vector."""
+    return _rotate(quat, vec, 1.0)
+
+
+def quat_apply_inverse(quat, vec) -> np.ndarray:
+    """Apply an inverse quaternion rotation to a vector, e.g. a world-frame vector into the base frame."""
+    return _rotate(quat, vec, -1.0)
+
+
+def yaw_quat(quat) -> np.ndarray:
+    """Extract the yaw component of a quaternion."""
+    if _is_batch(quat):
+        w, x, y, z = np.moveaxis(np.asarray(quat), -1, 0)
+        half_yaw = 0.5 * np.arctan2(2 * (w * z + x * y), 1 - 2 * (y * y + z * z))
+        zero = np.zeros_like(half_yaw)
+        return np.stack((np.cos(half_yaw), zero, zero, np.sin(half_yaw)), axis=-1)
+    w, x, y, z = _components(quat)
+    half_yaw = 0.5 * math.atan2(2 * (w * z + x * y), 1 - 2 * (y * y + z * z))
+    return np.array([math.cos(half_yaw), 0.0, 0.0, math.sin(half_yaw)])
+
+
+def quat_apply_yaw(quat, vec) -> np.ndarray:
+    """Rotate a vector only around the yaw-direction."""
+    return quat_apply(yaw_quat(quat), vec)
+
+
+def quat_from_euler_xyz(roll, pitch, yaw) -> np.ndarray:
+    """Convert Euler angles in radians (XYZ convention) to a quaternion."""
+    if isinstance(roll, np.ndarray):
+        cos, sin = np.cos, np.sin
+    else:
+        cos, sin = math.cos, math.sin
+    cy, sy = cos(yaw * 0.5), sin(yaw * 0.5)
+    cr, sr = cos(roll * 0.5), sin(roll * 0.5)
+    cp, sp = cos(pitch * 0.5), sin(pitch * 0.5)
+    qw = cy * cr * cp + sy * sr * sp
+    qx = cy * sr * cp - sy * cr * sp
+    qy = cy * cr * sp + sy * sr * cp
+    qz = sy * cr * cp - cy * sr * sp
+    return _stack(qw, qx, qy, qz)
+
+
+def euler_xyz_from_quat(quat, wrap_to_2pi: bool = False) -> tuple:
+    """Convert a quaternion to Euler angles in radians (XYZ extrinsic convention).
+
+    Returns:
+        A tuple containing roll-pitch-yaw: floats for a single quaternion, arrays of shape (N,) for a batch.
+    """
+    if _is_batch(quat):
+        w, x, y, z = np.moveaxis(np.asarray(quat), -1, 0)
+        roll = np.arctan2(2.0 * (w * x + y * z), 1 - 2 * (x * x + y * y))
+        sin_pitch = 2.0 * (w * y - z * x)
+        pitch = np.where(
+            np.abs(sin_pitch) >= 1, np.copysign(np.pi / 2.0, sin_pitch), np.arcsin(np.clip(sin_pitch, -1, 1))
+        )
+        yaw = np.arctan2(2.0 * (w * z + x * y), 1 - 2 * (y * y + z * z))
+    else:
+        w, x, y, z = _components(quat)
+        roll = math.atan2(2.0 * (w * x + y * z), 1 - 2 * (x * x + y * y))
+        sin_pitch = 2.0 * (w * y - z * x)
+        pitch = math.copysign(math.pi / 2.0, sin_pitch) if abs(sin_pitch) >= 1 else math.asin(sin_pitch)
+        yaw = math.atan2(2.0 * (w * z + x * y), 1 - 2 * (y * y + z * z))
+    if wrap_to_2pi:
+        return roll % (2 * math.pi), pitch % (2 * math.pi), yaw % (2 * math.pi)
+    return roll, pitch, yaw
+
+
+def matrix_from_quat(quat) -> np.ndarray:
+    """Convert a quaternion to a rotation matrix of shape (3, 3), or (N, 3, 3) for a batch."""
+    if _is_batch(quat):
+        quat = np.asarray(quat)
+        r, i, j, k = np.moveaxis(quat, -1, 0)
+    else:
+        r, i, j, k = _components(quat)
+    two_s = 2.0 / (r * r + i * i + j * j + k * k)
+    matrix = _stack(
+        1 - two_s * (j * j + k * k),
+        two_s * (i * j - k * r),
+        two_s * (i * k + j * r),
+        two_s * (i * j + k * r),
+        1 - two_s * (i * i + k * k),
+        two_s * (j * k - i * r),
+        two_s * (i * k - j * r),
+        two_s * (j * k + i * r),
+        1 - two_s * (i * i + j * j),
+    )
+    return matrix.reshape(matrix.shape[:-1] + (3, 3))
+
+
+"""
+Helpers.
+"""
+
+
+def _is_batch(x) -> bool:
+    return isinstance(x, np.ndarray) and x.ndim > 1
+
+
+def _components(x):
+    # python floats are faster than numpy scalars for scalar arithmetic
+    return x.tolist() if isinstance(x, np.ndarray) else x
+
+
+def _stack(*components) -> np.ndarray:
+    if isinstance(components[0], np.ndarray):
+        return np.stack(components, axis=-1)
+    return np.array(components)
+
+
+def _rotate(quat, vec, sign: float) -> np.ndarray:
+    # v + sign * w * t + cross(q_xyz, t), with t = 2 * cross(q_xyz, v)
+    if _is_batch(quat) or _is_batch(vec):
+        w, x, y, z = np.moveaxis(np.asarray(quat), -1, 0)
+        vx, vy, vz = np.moveaxis(np.asarray(vec), -1, 0)
+    else:
+        w, x, y, z = _components(quat)
+        vx, vy, vz = _components(vec)
+    w = sign * w
+    tx = 2.0 * (y * vz - z * vy)
+    ty = 2.0 * (z * vx - x * vz)
+    tz = 2.0 * (x * vy - y * vx)
+    return _stack(vx + w * tx + y * tz - z * ty, vy + w * ty + z * tx - x * tz, vz + w * tz + x * ty - y * tx)
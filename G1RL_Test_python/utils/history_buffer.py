@@ -0,0 +1,207 @@
+import torch
+from collections.abc import Sequence
+
+
+class PackedHistoryBuffer:
+    """History buffer storing several observation terms in one preallocated tensor.
+
+    This class replaces a dictionary of per-term :class:`CircularBuffer` instances. All terms share a single
+    storage of shape (batch_size, history_dim + step_dim), where ``step_dim`` is the sum of the term dimensions
+    and ``history_dim = max_len * step_dim``. The history part is laid out term by term, and each term keeps its
+    ``max_len`` entries in chronological order (oldest first). This matches the layout of a flattened history
+    observation, i.e. the concatenation over terms of ``CircularBuffer.buffer.reshape(batch_size, -1)``, so
+    :attr:`buffer` is a view into the storage and needs no copy.
+
+    The trailing ``step_dim`` columns are a staging area for the next entry. Terms are either written in place
+    through :meth:`step_view` or passed packed to :meth:`append`. A single gather then shifts every term by one
+    entry and moves the staged data to the newest slot.
+
+    Similar to :class:`CircularBuffer`, the first append after a reset fills the whole history of the reset
+    batch indices with the appended data.
+    """
+
+    def __init__(
+        self, term_dims: dict[str, int], max_len: int, batch_size: int, device: str, dtype: torch.dtype = torch.float32
+    ):
+        """Initialize the packed history buffer.
+
+        Args:
+            term_dims: Ordered mapping from term name to its dimension. The order defines the layout of
+                the flattened history.
+            max_len: The number of entries kept per term. The minimum allowed value is 1.
+            batch_size: The batch dimension of the data.
+            device: The device used for processing.
+            dtype: The data type of the stored terms. Defaults to float32.
+
+        Raises:
+            ValueError: If the buffer size is less than one or a term dimension is not positive.
+        """
+        if max_len < 1:
+            raise ValueError(f"The buffer size should be greater than zero. However, it is set to {max_len}!")
+        for name, dim in term_dims.items():
+            if dim < 1:
+                raise ValueError(f"The dimension of term '{name}' should be greater than zero. Received: {dim}.")
+        # set the parameters
+        self._term_dims = dict(term_dims)
+        self._max_len = max_len
+        self._batch_size = batch_size
+        self._device = device
+
+        # column layout of the staging area and of the history
+        self._step_dim = sum(self._term_dims.values())
+        self._history_dim = self._max_len * self._step_dim
+        self._step_slices: dict[str, slice] = {}
+        self._history_slices: dict[str, slice] = {}
+        step_offset = 0
+        history_offset = 0
+        for name, dim in self._term_dims.items():
+            self._step_slices[name] = slice(step_offset, step_offset + dim)
+            self._history_slices[name] = slice(history_offset, history_offset + self._max_len * dim)
+            step_offset += dim
+            history_offset += self._max_len * dim
+
+        # gather indices: `shift` drops the oldest entry and appends the staged one, `fill` repeats the staged one
+        shift_index = []
+        fill_index = []
+        for name, dim in self._term_dims.items():
+            history_start = self._history_slices[name].start
+            step_slice = self._step_slices[name]
+            staged = list(range(self._history_dim + step_slice.start, self._history_dim + step_slice.stop))
+            for h in range(self._max_len - 1):
+                start = history_start + (h + 1) * dim
+                shift_index.extend(range(start, start + dim))
+            shift_index.extend(staged)
+            fill_index.extend(staged * self._max_len)
+        self._shift_index = torch.tensor(shift_index, dtype=torch.long, device=device)
+        self._fill_index = torch.tensor(fill_index, dtype=torch.long, device=device)
+
+        # the storage for the history and the staged entry, and a scratch tensor for the gather
+        self._storage = torch.zeros((batch_size, self._history_dim + self._step_dim), dtype=dtype, device=device)
+        self._scratch = torch.zeros((batch_size, self._history_dim), dtype=dtype, device=device)
+        # number of data pushes passed since the last call to :meth:`reset`
+        self._num_pushes = torch.zeros(batch_size, dtype=torch.long, device=device)
+        # batch indices whose history is filled by the next append
+        self._pending_fill = torch.ones(batch_size, dtype=torch.bool, device=device)
+        self._has_pending_fill = True
+
+    """
+    Properties.
+    """
+
+    @property
+    def batch_size(self) -> int:
+        """The batch size of the buffer."""
+        return self._batch_size
+
+    @property
+    def device(self) -> str:
+        """The device used for processing."""
+        return self._device
+
+    @property
+    def max_length(self) -> int:
+        """The number of entries kept per term."""
+        return self._max_len
+
+    @property
+    def term_names(self) -> list[str]:
+        """The names of the stored terms in layout order."""
+        return list(self._term_dims.keys())
+
+    @property
+    def step_dim(self) -> int:
+        """The dimension of one packed entry, i.e. the sum of the term dimensions."""
+        return self._step_dim
+
+    @property
+    def history_dim(self) -> int:
+        """The dimension of the flattened history."""
+        return self._history_dim
+
+    @property
+    def current_length(self) -> torch.Tensor:
+        """The current length of the buffer. Shape is (batch_size,)."""
+        return torch.clamp(self._num_pushes, max=self._max_len)
+
+    @property
+    def buffer(self) -> torch.Tensor:
+        """Flattened history of all terms. Shape is (batch_size, history_dim).
+
+        For every term, the entries are ordered from the oldest to the most recent one. The returned
+        tensor is a view into the storage and is updated in place by :meth:`append`.
+        """
+        return self._storage[:, : self._history_dim]
+
+    """
+    Operations.
+    """
+
+    def term(self, name: str) -> torch.Tensor:
+        """History of a single term with the most recent entry at the end.
+
+        Args:
+            name: The name of the term.
+
+        Returns:
+            A view of shape (batch_size, max_length, term_dim).
+        """
+        return self._storage[:, self._history_slices[name]].view(self._batch_size, self._max_len, -1)
+
+    def step_view(self, name: str) -> torch.Tensor:
+        """Staging slot of a single term for the next call to :meth:`append`.
+
+        Writing into the returned view (e.g. through ``copy_`` or an ``out=`` argument) avoids
+        packing the terms into an intermediate tensor.
+
+        Args:
+            name: The name of the term.
+
+        Returns:
+            A view of shape (batch_size, term_dim).
+        """
+        step_slice = self._step_slices[name]
+        return self._storage[:, self._history_dim + step_slice.start : self._history_dim + step_slice.stop]
+
+    def reset(self, batch_ids: Sequence[int] | torch.Tensor | None = None):
+        """Reset the buffer at the specified batch indices.
+
+        Args:
+            batch_ids: Elements to reset in the batch dimension. Default is None, which resets all the batch indices.
+        """
+        # resolve all indices
+        if batch_ids is None:
+            batch_ids = slice(None)
+        self._num_pushes[batch_ids] = 0
+        self._storage[batch_ids, : self._history_dim] = 0.0
+        self._pending_fill[batch_ids] = True
+        self._has_pending_fill = True
+
+    def append(self, data: torch.Tensor | None = None):
+        """Append one entry for all terms.
+
+        Args:
+            data: The packed entry of shape (batch_size, step_dim), with the terms concatenated in layout order.
+                Default is None, in which case the entry must already be written through :meth:`step_view`.
+
+        Raises:
+            ValueError: If the input data has a different shape than expected.
+        """
+        if data is not None:
+            if data.shape != (self._batch_size, self._step_dim):
+                raise ValueError(
+                    f"The input data has shape {tuple(data.shape)} while expecting {(self._batch_size, self._step_dim)}"
+                )
+            self._storage[:, self._history_dim :].copy_(data)
+
+        history = self._storage[:, : self._history_dim]
+        # shift all terms by one entry and write the staged one
+        torch.index_select(self._storage, 1, self._shift_index, out=self._scratch)
+        history.copy_(self._scratch)
+        # initialize the whole history of freshly reset batch indices to the staged entry
+        if self._has_pending_fill:
+            torch.index_select(self._storage, 1, self._fill_index, out=self._scratch)
+            history.copy_(torch.where(self._pending_fill.unsqueeze(1), self._scratch, history))
+            self._pending_fill.zero_()
+            self._has_pending_fill = False
+        # increment number of pushes for all batches
+        self._num_pushes += 1
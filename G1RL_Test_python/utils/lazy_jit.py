@@ -0,0 +1,271 @@
+"""Lazy compilation of the TorchScript kernels of the utility modules.
+
+Decorating a function with :func:`lazy_script` instead of ``torch.jit.script`` defers its compilation to its
+first call, so that importing a module of kernels costs nothing for the kernels that are never used. The
+compilation backend is selected with the ``G1RL_JIT_BACKEND`` environment variable, or per function with
+:attr:`LazyScriptFunction.backend`:
+
+- ``"script"`` (default): ``torch.jit.script``, as with the eager decorator.
+- ``"compile"``: ``torch.compile``. The generated kernels are cached on disk by the inductor cache, under
+  ``G1RL_JIT_CACHE_DIR`` (default ``~/.cache/g1rl/torch_compile``), so later processes skip the code generation.
+- ``"eager"``: the Python function, without compilation.
+
+A function can also register alternative implementations (e.g. a ``"fused"`` elementwise formulation) with
+:meth:`LazyScriptFunction.register_variant`. The implementation can be selected per batch size class
+(:func:`shape_class`) with :meth:`LazyScriptFunction.select`, from measurements made by :func:`autotune` or
+loaded with :func:`load_selection`.
+"""
+
+import functools
+import json
+import math
+import os
+import time
+
+import torch
+from torch import _jit_internal
+
+JIT_BACKENDS = ("script", "compile", "eager")
+
+# upper bounds (exclusive) of the batch sizes of every shape class
+SHAPE_CLASSES = (("small", 256), ("medium", 8192), ("large", math.inf))
+
+
+def default_backend() -> str:
+    """The backend of the functions without an explicit backend, from ``G1RL_JIT_BACKEND``.
+
+    Raises:
+        ValueError: If the backend is unknown.
+    """
+    backend = os.environ.get("G1RL_JIT_BACKEND", "script")
+    if backend not in JIT_BACKENDS:
+        raise ValueError(f"Unknown JIT backend '{backend}'. Available: {JIT_BACKENDS}.")
+    return backend
+
+
+def cache_dir() -> str:
+    """The directory of the on-disk cache of the compiled kernels, from ``G1RL_JIT_CACHE_DIR``."""
+    default = os.path.join(os.path.expanduser("~"), ".cache", "g1rl", "torch_compile")
+    return os.environ.get("G1RL_JIT_CACHE_DIR", default)
+
+
+def shape_class(batch_size: int) -> str:
+    """The shape class of a batch size, see :data:`SHAPE_CLASSES`."""
+    for name, upper in SHAPE_CLASSES:
+        if batch_size < upper:
+            return name
+    return SHAPE_CLASSES[-1][0]
+
+
+class LazyScriptFunction:
+    """Function compiled with the selected backend on its first call.
+
+    Scripted callers resolve the lazy functions they call to their TorchScript version (see :meth:`script`),
+    so the kernels can call each other as with ``torch.jit.script``. TorchScript code outside of the lazy
+    functions must call ``fn.script()`` explicitly.
+    """
+
+    def __init__(self, fn, backend: str = None):
+        functools.update_wrapper(self, fn)
+        self.python_fn = fn
+        self._backend = backend
+        self._compiled = None
+        self._scripted = None
+        self._variants = {}
+        self._implementations = {}
+        # implementation per shape class, set by select()
+        self._selected: dict = None  # type: ignore
+
+    @property
+    def backend(self) -> str:
+        return self._backend if self._backend is not None else default_backend()
+
+    @backend.setter
+    def backend(self, backend: str):
+        if backend is not None and backend not in self.backends:
+            raise ValueError(f"Unknown JIT backend '{backend}'. Available: {self.backends}.")
+        self._backend = backend
+        self._compiled = None
+
+    @property
+    def backends(self) -> tuple[str, ...]:
+        """The compilation backends and the registered variants."""
+        return JIT_BACKENDS + tuple(self._variants)
+
+    @property
+    def is_compiled(self) -> bool:
+        return self._compiled is not None
+
+    @property
+    def compiled(self):
+        """The implementation of the selected backend, compiled on first access."""
+        if self._compiled is None:
+            self._compiled = self.implementation(self.backend)
+        return self._compiled
+
+    def __call__(self, *args, **kwargs):
+        if self._selected is not None:
+            first = args[0]
+            batch_size = first.numel() // first.shape[-1] if first.dim() > 0 else 1
+            return self._selected[shape_class(batch_size)](*args, **kwargs)
+        fn = self._compiled
+        if fn is None:
+            fn = self.compiled
+        return fn(*args, **kwargs)
+
+    def script(self):
+        """The TorchScript version of the function, whatever the backend."""
+        if self._scripted is None:
+            closure_rcb = _jit_internal.createResolutionCallbackFromClosure(self.python_fn)
+
+            def rcb(name: str):
+                obj = closure_rcb(name)
+                return obj.script() if isinstance(obj, LazyScriptFunction) else obj
+
+            self._scripted = torch.jit.script(self.python_fn, _rcb=rcb)
+        return self._scripted
+
+    def register_variant(self, name: str, fn):
+        """Register an alternative implementation with the same signature, selectable as a backend."""
+        if name in JIT_BACKENDS:
+            raise ValueError(f"The variant name '{name}' is a JIT backend.")
+        self._variants[name] = fn
+        self._implementations.pop(name, None)
+
+    def implementation(self, backend: str):
+        """The implementation of a backend or variant, compiled on first access."""
+        if backend not in self._implementations:
+            if backend == "script":
+                implementation = self.script()
+            elif backend == "compile":
+                _enable_compile_cache()
+                implementation = torch.compile(self.python_fn, dynamic=True)
+            elif backend == "eager":
+                implementation = self.python_fn
+            elif backend in self._variants:
+                implementation = self._variants[backend]
+            else:
+                raise ValueError(f"Unknown JIT backend '{backend}'. Available: {self.backends}.")
+            self._implementations[backend] = implementation
+        return self._implementations[backend]
+
+    def select(self, backends: dict[str, str] = None):
+        """Use a backend per shape class, e.g. ``{"small": "eager", "medium": "script", "large": "fused"}``.
+
+        The shape class of a call is given by the batch size of its first argument (all dimensions but the
+        last). Shape classes missing from ``backends`` use :attr:`backend`. Passing None removes the selection.
+        """
+        if backends is None:
+            self._selected = None
+            return
+        self._selected = {
+            name: self.implementation(backends.get(name, self.backend)) for name, _ in SHAPE_CLASSES
+        }
+
+    @property
+    def selection(self) -> dict[str, str] | None:
+        """The backend of every shape class, if set with :meth:`select`."""
+        if self._selected is None:
+            return None
+        names = {id(impl): backend for backend, impl in self._implementations.items()}
+        return {name: names[id(impl)] for name, impl in self._selected.items()}
+
+
+def lazy_script(fn) -> LazyScriptFunction:
+    """Decorator replacing ``torch.jit.script`` with compilation on first call."""
+    return LazyScriptFunction(fn)
+
+
+def compile_all(namespace) -> list[str]:
+    """Compile all lazy functions of a module (or dict), e.g. to move the compilation out of a timed loop.
+
+    Returns:
+        The names of the compiled functions.
+    """
+    names = []
+    for name, obj in _lazy_functions(namespace).items():
+        obj.compiled
+        names.append(name)
+    return names
+
+
+def time_implementation(fn, args: tuple, num_iters: int = 100, num_warmup: int = 10) -> float:
+    """Mean latency of ``fn(*args)`` in microseconds, or infinity if the implementation fails on these inputs."""
+    device = next((arg.device for arg in args if isinstance(arg, torch.Tensor)), torch.device("cpu"))
+    try:
+        for _ in range(num_warmup):
+            fn(*args)
+        _synchronize(device)
+        start = time.perf_counter()
+        for _ in range(num_iters):
+            fn(*args)
+        _synchronize(device)
+    except (RuntimeError, TypeError, NotImplementedError):
+        # e.g. a dtype without a kernel on this device
+        return math.inf
+    return (time.perf_counter() - start) / num_iters * 1e6
+
+
+def autotune(
+    fn: LazyScriptFunction, inputs: dict[str, tuple], backends: tuple[str, ...] = None, num_iters: int = 100
+) -> dict[str, dict[str, float]]:
+    """Time every backend on example inputs of every shape class, and select the fastest per class.
+
+    Args:
+        fn: The function to tune.
+        inputs: The example arguments of every shape class, e.g. ``{"small": (quat, vec), ...}``.
+        backends: The backends and variants to compare. Defaults to None (all of them).
+        num_iters: The number of timed calls per backend and shape class. Defaults to 100.
+
+    Returns:
+        The latencies in microseconds, by shape class and backend.
+    """
+    backends = backends if backends is not None else fn.backends
+    timings = {
+        name: {backend: time_implementation(fn.implementation(backend), args, num_iters) for backend in backends}
+        for name, args in inputs.items()
+    }
+    fn.select({name: min(times, key=times.get) for name, times in timings.items()})
+    return timings
+
+
+def load_selection(path: str, namespace, device: str = None, dtype: torch.dtype = None) -> dict[str, dict[str, str]]:
+    """Apply a selection file written by ``benchmarks/quat_kernel_benchmark.py`` to the lazy functions of a module.
+
+    The file maps ``device -> dtype -> function -> shape class -> backend``; the entry of the given device type
+    (e.g. "cuda") and dtype (e.g. "float32") is applied, by default the first one of the file.
+
+    Returns:
+        The applied selection, by function name.
+    """
+    with open(path) as f:
+        data = json.load(f)
+    by_dtype = data[torch.device(device).type] if device is not None else next(iter(data.values()))
+    selection = by_dtype[str(dtype).replace("torch.", "")] if dtype is not None else next(iter(by_dtype.values()))
+    functions = _lazy_functions(namespace)
+    for name, backends in selection.items():
+        if name in functions:
+            functions[name].select(backends)
+    return selection
+
+
+def _lazy_functions(namespace) -> dict[str, LazyScriptFunction]:
+    items = namespace.items() if isinstance(namespace, dict) else vars(namespace).items()
+    return {name: obj for name, obj in list(items) if isinstance(obj, LazyScriptFunction)}
+
+
+def _synchronize(device: torch.device):
+    if device.type == "cuda":
+        torch.cuda.synchronize(device)
+
+
+@functools.cache
+def _enable_compile_cache():
+    # the inductor reads its cache location from the environment when it compiles
+    os.environ.setdefault("TORCHINDUCTOR_CACHE_DIR", cache_dir())
+    try:
+        import torch._inductor.config as inductor_config
+
+        inductor_config.fx_graph_cache = True
+    except (ImportError, AttributeError):
+        pass
@@ -3,7 +3,11 @@
 #
 # SPDX-License-Identifier: BSD-3-Clause
 
-"""Sub-module containing utilities for various math operations."""
+"""Sub-module containing utilities for various math operations.
+
+The TorchScript kernels are compiled on their first call (see :mod:`lazy_jit`), so importing this module does
+not compile anything, and it imports in plain Python as well as in Isaac Sim.
+"""
 
 # needed to import for allowing type-hinting: torch.Tensor | np.ndarray
 from __future__ import annotations
@@ -12,16 +16,23 @@ import math
 import numpy as np
 import torch
 import torch.nn.functional
+import logging
 from typing import Literal
 
-import omni.log
+from .lazy_jit import lazy_script
+
+try:
+    from omni.log import warn as _log_warn
+except ModuleNotFoundError:
+    # outside of Isaac Sim (e.g. headless training with the torch backend), use the standard logger
+    _log_warn = logging.getLogger(__name__).warning
 
 """
 General
 """
 
 
-@torch.jit.script
+@lazy_script
 def scale_transform(x: torch.Tensor, lower: torch.Tensor, upper: torch.Tensor) -> torch.Tensor:
     """Normalizes a given input tensor to a range of [-1, 1].
 
@@ -42,7 +53,7 @@ def scale_transform(x: torch.Tensor, lower: torch.Tensor, upper: torch.Tensor) -
     return 2 * (x - offset) / (upper - lower)
 
 
-@torch.jit.script
+@lazy_script
 def unscale_transform(x: torch.Tensor, lower: torch.Tensor, upper: torch.Tensor) -> torch.Tensor:
     """De-normalizes a given input tensor from range of [-1, 1] to (lower, upper).
 
@@ -63,7 +74,7 @@ def unscale_transform(x: torch.Tensor, lower: torch.Tensor, upper: torch.Tensor)
     return x * (upper - lower) * 0.5 + offset
 
 
-@torch.jit.script
+@lazy_script
 def saturate(x: torch.Tensor, lower: torch.Tensor, upper: torch.Tensor) -> torch.Tensor:
     """Clamps a given input tensor to (lower, upper).
 
@@ -80,7 +91,7 @@ def saturate(x: torch.Tensor, lower: torch.Tensor, upper: torch.Tensor) -> torch
     return torch.max(torch.min(x, upper), lower)
 
 
-@torch.jit.script
+@lazy_script
 def normalize(x: torch.Tensor, eps: float = 1e-9) -> torch.Tensor:
     """Normalizes a given input tensor to unit length.
 
@@ -94,7 +105,7 @@ def normalize(x: torch.Tensor, eps: float = 1e-9) -> torch.Tensor:
     return x / x.norm(p=2, dim=-1).clamp(min=eps, max=None).unsqueeze(-1)
 
 
-@torch.jit.script
+@lazy_script
 def wrap_to_pi(angles: torch.Tensor) -> torch.Tensor:
     r"""Wraps input angles (in radians) to the range :math:`[-\pi, \pi]`.
 
@@ -119,7 +130,7 @@ def wrap_to_pi(angles: torch.Tensor) -> torch.Tensor:
     return torch.where((wrapped_angle == 0) & (angles > 0), torch.pi, wrapped_angle - torch.pi)
 
 
-@torch.jit.script
+@lazy_script
 def copysign(mag: float, other: torch.Tensor) -> torch.Tensor:
     """Create a new floating-point tensor with the magnitude of input and the sign of other, element-wise.
 
@@ -142,7 +153,7 @@ Rotation
 """
 
 
-@torch.jit.script
+@lazy_script
 def quat_unique(q: torch.Tensor) -> torch.Tensor:
     """Convert a unit quaternion to a standard form where the real part is non-negative.
 
@@ -158,7 +169,7 @@ def quat_unique(q: torch.Tensor) -> torch.Tensor:
     return torch.where(q[..., 0:1] < 0, -q, q)
 
 
-@torch.jit.script
+@lazy_script
 def matrix_from_quat(quaternions: torch.Tensor) -> torch.Tensor:
     """Convert rotations given as quaternions to rotation matrices.
 
@@ -238,7 +249,7 @@ def convert_quat(quat: torch.Tensor | np.ndarray, to: Literal["xyzw", "wxyz"] =
             return quat.roll(1, dims=-1)
 
 
-@torch.jit.script
+@lazy_script
 def quat_conjugate(q: torch.Tensor) -> torch.Tensor:
     """Computes the conjugate of a quaternion.
 
@@ -253,7 +264,7 @@ def quat_conjugate(q: torch.Tensor) -> torch.Tensor:
     return torch.cat((q[..., 0:1], -q[..., 1:]), dim=-1).view(shape)
 
 
-@torch.jit.script
+@lazy_script
 def quat_inv(q: torch.Tensor, eps: float = 1e-9) -> torch.Tensor:
     """Computes the inverse of a quaternion.
 
@@ -267,7 +278,7 @@ def quat_inv(q: torch.Tensor, eps: float = 1e-9) -> torch.Tensor:
     return quat_conjugate(q) / q.pow(2).sum(dim=-1, keepdim=True).clamp(min=eps)
 
 
-@torch.jit.script
+@lazy_script
 def quat_from_euler_xyz(roll: torch.Tensor, pitch: torch.Tensor, yaw: torch.Tensor) -> torch.Tensor:
     """Convert rotations given as Euler angles in radians to Quaternions.
 
@@ -297,7 +308,7 @@ def quat_from_euler_xyz(roll: torch.Tensor, pitch: torch.Tensor, yaw: torch.Tens
     return torch.stack([qw, qx, qy, qz], dim=-1)
 
 
-@torch.jit.script
+@lazy_script
 def _sqrt_positive_part(x: torch.Tensor) -> torch.Tensor:
     """Returns torch.sqrt(torch.max(0, x)) but with a zero sub-gradient where x is 0.
 
@@ -310,7 +321,7 @@ def _sqrt_positive_part(x: torch.Tensor) -> torch.Tensor:
     return ret
 
 
-@torch.jit.script
+@lazy_script
 def quat_from_matrix(matrix: torch.Tensor) -> torch.Tensor:
     """Convert rotations given as rotation matrices to quaternions.
 
@@ -429,7 +440,7 @@ def matrix_from_euler(euler_angles: torch.Tensor, convention: str) -> torch.Tens
     return torch.matmul(torch.matmul(matrices[0], matrices[1]), matrices[2])
 
 
-@torch.jit.script
+@lazy_script
 def euler_xyz_from_quat(
     quat: torch.Tensor, wrap_to_2pi: bool = False
 ) -> tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
@@ -470,7 +481,7 @@ def euler_xyz_from_quat(
     return roll, pitch, yaw
 
 
-@torch.jit.script
+@lazy_script
 def axis_angle_from_quat(quat: torch.Tensor, eps: float = 1.0e-6) -> torch.Tensor:
     """Convert rotations given as quaternions to axis/angle.
 
@@ -502,7 +513,7 @@ def axis_angle_from_quat(quat: torch.Tensor, eps: float = 1.0e-6) -> torch.Tenso
     return quat[..., 1:4] / sin_half_angles_over_angles.unsqueeze(-1)
 
 
-@torch.jit.script
+@lazy_script
 def quat_from_angle_axis(angle: torch.Tensor, axis: torch.Tensor) -> torch.Tensor:
     """Convert rotations given as angle-axis to quaternions.
 
@@ -519,7 +530,7 @@ def quat_from_angle_axis(angle: torch.Tensor, axis: torch.Tensor) -> torch.Tenso
     return normalize(torch.cat([w, xyz], dim=-1))
 
 
-@torch.jit.script
+@lazy_script
 def quat_mul(q1: torch.Tensor, q2: torch.Tensor) -> torch.Tensor:
     """Multiply two quaternions together.
 
@@ -558,7 +569,7 @@ def quat_mul(q1: torch.Tensor, q2: torch.Tensor) -> torch.Tensor:
     return torch.stack([w, x, y, z], dim=-1).view(shape)
 
 
-@torch.jit.script
+@lazy_script
 def yaw_quat(quat: torch.Tensor) -> torch.Tensor:
     """Extract the yaw component of a quaternion.
 
@@ -582,7 +593,7 @@ def yaw_quat(quat: torch.Tensor) -> torch.Tensor:
     return quat_yaw.view(shape)
 
 
-@torch.jit.script
+@lazy_script
 def quat_box_minus(q1: torch.Tensor, q2: torch.Tensor) -> torch.Tensor:
     """The box-minus operator (quaternion difference) between two quaternions.
 
@@ -600,7 +611,7 @@ def quat_box_minus(q1: torch.Tensor, q2: torch.Tensor) -> torch.Tensor:
     return axis_angle_from_quat(quat_diff)  # log(qd)
 
 
-@torch.jit.script
+@lazy_script
 def quat_box_plus(q: torch.Tensor, delta: torch.Tensor, eps: float = 1.0e-6) -> torch.Tensor:
     """The box-plus operator (quaternion update) to apply an increment to a quaternion.
 
@@ -621,7 +632,7 @@ def quat_box_plus(q: torch.Tensor, delta: torch.Tensor, eps: float = 1.0e-6) ->
     return quat_unique(new_quat)
 
 
-@torch.jit.script
+@lazy_script
 def quat_apply(quat: torch.Tensor, vec: torch.Tensor) -> torch.Tensor:
     """Apply a quaternion rotation to a vector.
 
@@ -643,7 +654,7 @@ def quat_apply(quat: torch.Tensor, vec: torch.Tensor) -> torch.Tensor:
     return (vec + quat[:, 0:1] * t + xyz.cross(t, dim=-1)).view(shape)
 
 
-@torch.jit.script
+@lazy_script
 def quat_apply_inverse(quat: torch.Tensor, vec: torch.Tensor) -> torch.Tensor:
     """Apply an inverse quaternion rotation to a vector.
 
@@ -665,7 +676,7 @@ def quat_apply_inverse(quat: torch.Tensor, vec: torch.Tensor) -> torch.Tensor:
     return (vec - quat[:, 0:1] * t + xyz.cross(t, dim=-1)).view(shape)
 
 
-@torch.jit.script
+@lazy_script
 def quat_apply_yaw(quat: torch.Tensor, vec: torch.Tensor) -> torch.Tensor:
     """Rotate a vector only around the yaw-direction.
 
@@ -694,7 +705,7 @@ def quat_rotate(q: torch.Tensor, v: torch.Tensor) -> torch.Tensor:
         The rotated vector in (x, y, z). Shape is (..., 3).
     """
     # deprecation
-    omni.log.warn(
+    _log_warn(
         "The function 'quat_rotate' will be deprecated in favor of the faster method 'quat_apply'."
         " Please use 'quat_apply' instead...."
     )
@@ -714,14 +725,14 @@ def quat_rotate_inverse(q: torch.Tensor, v: torch.Tensor) -> torch.Tensor:
     Returns:
         The rotated vector in (x, y, z). Shape is (..., 3).
     """
-    omni.log.warn(
+    _log_warn(
         "The function 'quat_rotate_inverse' will be deprecated in favor of the faster method 'quat_apply_inverse'."
         " Please use 'quat_apply_inverse' instead...."
     )
     return quat_apply_inverse(q, v)
 
 
-@torch.jit.script
+@lazy_script
 def quat_error_magnitude(q1: torch.Tensor, q2: torch.Tensor) -> torch.Tensor:
     """Computes the rotation difference between two quaternions.
 
@@ -736,7 +747,7 @@ def quat_error_magnitude(q1: torch.Tensor, q2: torch.Tensor) -> torch.Tensor:
     return torch.norm(axis_angle_error, dim=-1)
 
 
-@torch.jit.script
+@lazy_script
 def skew_symmetric_matrix(vec: torch.Tensor) -> torch.Tensor:
     """Computes the skew-symmetric matrix of a vector.
 
@@ -793,7 +804,7 @@ def is_identity_pose(pos: torch.tensor, rot: torch.tensor) -> bool:
     return torch.allclose(pos, pos_identity) and torch.allclose(rot, rot_identity)
 
 
-@torch.jit.script
+@lazy_script
 def combine_frame_transforms(
     t01: torch.Tensor, q01: torch.Tensor, t12: torch.Tensor | None = None, q12: torch.Tensor | None = None
 ) -> tuple[torch.Tensor, torch.Tensor]:
@@ -865,7 +876,7 @@ def rigid_body_twist_transform(
     return v1, w1
 
 
-# @torch.jit.script
+# @lazy_script
 def subtract_frame_transforms(
     t01: torch.Tensor, q01: torch.Tensor, t02: torch.Tensor | None = None, q02: torch.Tensor | None = None
 ) -> tuple[torch.Tensor, torch.Tensor]:
@@ -900,7 +911,7 @@ def subtract_frame_transforms(
     return t12, q12
 
 
-# @torch.jit.script
+# @lazy_script
 def compute_pose_error(
     t01: torch.Tensor,
     q01: torch.Tensor,
@@ -953,7 +964,7 @@ def compute_pose_error(
         raise ValueError(f"Unsupported orientation error type: {rot_error_type}. Valid: 'quat', 'axis_angle'.")
 
 
-@torch.jit.script
+@lazy_script
 def apply_delta_pose(
     source_pos: torch.Tensor, source_rot: torch.Tensor, delta_pose: torch.Tensor, eps: float = 1.0e-6
 ) -> tuple[torch.Tensor, torch.Tensor]:
@@ -994,9 +1005,12 @@ def apply_delta_pose(
     return target_pos, target_rot
 
 
-# @torch.jit.script
+# @lazy_script
 def transform_points(
-    points: torch.Tensor, pos: torch.Tensor | None = None, quat: torch.Tensor | None = None
+    points: torch.Tensor,
+    pos: torch.Tensor | None = None,
+    quat: torch.Tensor | None = None,
+    out: torch.Tensor | None = None,
 ) -> torch.Tensor:
     r"""Transform input points in a given frame to a target frame.
 
@@ -1012,12 +1026,19 @@ def transform_points(
 
     If either the inputs :attr:`pos` and :attr:`quat` are None, the corresponding transformation is not applied.
 
+    With :attr:`out`, the transformed points are written into a buffer of the caller, e.g. reused at every step:
+    a translation then allocates no tensor. A rotation still allocates, at every call, its (N, 3, 3) rotation
+    matrices together with all the intermediates of :func:`matrix_from_quat` (38 tensors on CPU), and only
+    writes its product into :attr:`out`.
+
     Args:
         points: Points to transform. Shape is (N, P, 3) or (P, 3).
         pos: Position of the target frame. Shape is (N, 3) or (3,).
             Defaults to None, in which case the position is assumed to be zero.
         quat: Quaternion orientation of the target frame in (w, x, y, z). Shape is (N, 4) or (4,).
             Defaults to None, in which case the orientation is assumed to be identity.
+        out: The output buffer, of the shape of the transformed points. It must not overlap :attr:`points`.
+            Defaults to None, in which case a new tensor is returned.
 
     Returns:
         Transformed points in the target frame. Shape is (N, P, 3) or (P, 3).
@@ -1027,39 +1048,40 @@ def transform_points(
         ValueError: If the inputs `pos` is not of shape (N, 3) or (3,).
         ValueError: If the inputs `quat` is not of shape (N, 4) or (4,).
     """
-    points_batch = points.clone()
     # check if inputs are batched
-    is_batched = points_batch.dim() == 3
+    is_batched = points.dim() == 3
     # -- check inputs
-    if points_batch.dim() == 2:
-        points_batch = points_batch[None]  # (P, 3) -> (1, P, 3)
-    if points_batch.dim() != 3:
+    if points.dim() not in (2, 3):
         raise ValueError(f"Expected points to have dim = 2 or dim = 3: got shape {points.shape}")
     if not (pos is None or pos.dim() == 1 or pos.dim() == 2):
         raise ValueError(f"Expected pos to have dim = 1 or dim = 2: got shape {pos.shape}")
     if not (quat is None or quat.dim() == 1 or quat.dim() == 2):
         raise ValueError(f"Expected quat to have dim = 1 or dim = 2: got shape {quat.shape}")
+    points_batch = points if is_batched else points[None]  # (P, 3) -> (1, P, 3)
+    out_batch = out if out is None or out.dim() == 3 else out[None]
+    # convert to batched translation vector
+    if pos is not None:
+        pos = pos[None, None, :] if pos.dim() == 1 else pos[:, None, :]  # (3,) or (N, 3) -> (1 or N, 1, 3)
     # -- rotation
     if quat is not None:
         # convert to batched rotation matrix
         rot_mat = matrix_from_quat(quat)
         if rot_mat.dim() == 2:
             rot_mat = rot_mat[None]  # (3, 3) -> (1, 3, 3)
-        # convert points to matching batch size (N, P, 3) -> (N, 3, P)
-        # and apply rotation
-        points_batch = torch.matmul(rot_mat, points_batch.transpose_(1, 2))
-        # (N, 3, P) -> (N, P, 3)
-        points_batch = points_batch.transpose_(1, 2)
-    # -- translation
-    if pos is not None:
-        # convert to batched translation vector
-        if pos.dim() == 1:
-            pos = pos[None, None, :]  # (3,) -> (1, 1, 3)
-        else:
-            pos = pos[:, None, :]  # (N, 3) -> (N, 1, 3)
-        # apply translation
-        points_batch += pos
+        # apply rotation to the row vectors: (N, P, 3) x (N, 3, 3)^T
+        points_batch = torch.matmul(points_batch, rot_mat.transpose(1, 2), out=out_batch)
+        # -- translation
+        if pos is not None:
+            points_batch += pos
+    elif pos is not None:
+        points_batch = torch.add(points_batch, pos, out=out_batch)
+    elif out_batch is not None:
+        points_batch = out_batch.copy_(points_batch)
+    else:
+        points_batch = points_batch.clone()
     # -- return points in same shape as input
+    if out is not None:
+        return out
     if not is_batched:
         points_batch = points_batch.squeeze(0)  # (1, P, 3) -> (P, 3)
 
@@ -1071,7 +1093,7 @@ Projection operations.
 """
 
 
-@torch.jit.script
+@lazy_script
 def orthogonalize_perspective_depth(depth: torch.Tensor, intrinsics: torch.Tensor) -> torch.Tensor:
     """Converts perspective depth image to orthogonal depth image.
 
@@ -1163,7 +1185,7 @@ def orthogonalize_perspective_depth(depth: torch.Tensor, intrinsics: torch.Tenso
     return orthogonal_depth
 
 
-@torch.jit.script
+@lazy_script
 def unproject_depth(depth: torch.Tensor, intrinsics: torch.Tensor, is_ortho: bool = True) -> torch.Tensor:
     r"""Un-project depth image into a pointcloud.
 
@@ -1250,7 +1272,7 @@ def unproject_depth(depth: torch.Tensor, intrinsics: torch.Tensor, is_ortho: boo
     return points_xyz
 
 
-@torch.jit.script
+@lazy_script
 def project_points(points: torch.Tensor, intrinsics: torch.Tensor) -> torch.Tensor:
     r"""Projects 3D points into 2D image plane.
 
@@ -1314,7 +1336,7 @@ Sampling
 """
 
 
-@torch.jit.script
+@lazy_script
 def default_orientation(num: int, device: str) -> torch.Tensor:
     """Returns identity rotation transform.
 
@@ -1331,7 +1353,7 @@ def default_orientation(num: int, device: str) -> torch.Tensor:
     return quat
 
 
-@torch.jit.script
+@lazy_script
 def random_orientation(num: int, device: str) -> torch.Tensor:
     """Returns sampled rotation in 3D as quaternion.
 
@@ -1351,7 +1373,7 @@ def random_orientation(num: int, device: str) -> torch.Tensor:
     return torch.nn.functional.normalize(quat, p=2.0, dim=-1, eps=1e-12)
 
 
-@torch.jit.script
+@lazy_script
 def random_yaw_orientation(num: int, device: str) -> torch.Tensor:
     """Returns sampled rotation around z-axis.
 
@@ -1395,19 +1417,34 @@ def sample_triangle(lower: float, upper: float, size: int | tuple[int, ...], dev
 
 
 def sample_uniform(
-    lower: torch.Tensor | float, upper: torch.Tensor | float, size: int | tuple[int, ...], device: str
+    lower: torch.Tensor | float,
+    upper: torch.Tensor | float,
+    size: int | tuple[int, ...],
+    device: str,
+    out: torch.Tensor | None = None,
 ) -> torch.Tensor:
     """Sample uniformly within a range.
 
+    With :attr:`out`, the samples are written into a buffer of the caller, without allocating any tensor when
+    the bounds are both floats or both tensors (of the dtype of :attr:`out`).
+
     Args:
         lower: Lower bound of uniform range.
         upper: Upper bound of uniform range.
-        size: The shape of the tensor.
-        device: Device to create tensor on.
+        size: The shape of the tensor. Ignored if :attr:`out` is given.
+        device: Device to create tensor on. Ignored if :attr:`out` is given.
+        out: The output buffer. Defaults to None, in which case a new tensor is returned.
 
     Returns:
-        Sampled tensor. Shape is based on :attr:`size`.
+        Sampled tensor. Shape is based on :attr:`size`, or the shape of :attr:`out`.
     """
+    if out is not None:
+        lower_is_tensor, upper_is_tensor = isinstance(lower, torch.Tensor), isinstance(upper, torch.Tensor)
+        if lower_is_tensor and upper_is_tensor:
+            return torch.lerp(lower, upper, out.uniform_(), out=out)
+        if not lower_is_tensor and not upper_is_tensor:
+            return out.uniform_(lower, upper)
+        return out.uniform_().mul_(upper - lower).add_(lower)
     # convert to tuple
     if isinstance(size, int):
         size = (size,)
@@ -1416,7 +1453,11 @@ def sample_uniform(
 
 
 def sample_log_uniform(
-    lower: torch.Tensor | float, upper: torch.Tensor | float, size: int | tuple[int, ...], device: str
+    lower: torch.Tensor | float,
+    upper: torch.Tensor | float,
+    size: int | tuple[int, ...],
+    device: str,
+    out: torch.Tensor | None = None,
 ) -> torch.Tensor:
     r"""Sample using log-uniform distribution within a range.
 
@@ -1431,35 +1472,52 @@ def sample_log_uniform(
     Args:
         lower: Lower bound of uniform range.
         upper: Upper bound of uniform range.
-        size: The shape of the tensor.
-        device: Device to create tensor on.
+        size: The shape of the tensor. Ignored if :attr:`out` is given.
+        device: Device to create tensor on. Ignored if :attr:`out` is given.
+        out: The output buffer, filled without allocating any tensor when the bounds are floats.
+            Defaults to None, in which case a new tensor is returned.
 
     Returns:
-        Sampled tensor. Shape is based on :attr:`size`.
+        Sampled tensor. Shape is based on :attr:`size`, or the shape of :attr:`out`.
     """
-    # cast to tensor if not already
-    if not isinstance(lower, torch.Tensor):
-        lower = torch.tensor(lower, dtype=torch.float, device=device)
-    if not isinstance(upper, torch.Tensor):
-        upper = torch.tensor(upper, dtype=torch.float, device=device)
+    if isinstance(lower, torch.Tensor) or isinstance(upper, torch.Tensor):
+        # cast to tensor if not already
+        if not isinstance(lower, torch.Tensor):
+            lower = torch.tensor(lower, dtype=torch.float, device=device)
+        if not isinstance(upper, torch.Tensor):
+            upper = torch.tensor(upper, dtype=torch.float, device=device)
+        lower, upper = torch.log(lower), torch.log(upper)
+    else:
+        # scalar bounds stay Python floats, so that no bound tensor is created at every call
+        lower, upper = math.log(lower), math.log(upper)
     # sample in log-space and exponentiate
-    return torch.exp(sample_uniform(torch.log(lower), torch.log(upper), size, device))
+    return sample_uniform(lower, upper, size, device, out=out).exp_()
 
 
 def sample_gaussian(
-    mean: torch.Tensor | float, std: torch.Tensor | float, size: int | tuple[int, ...], device: str
+    mean: torch.Tensor | float,
+    std: torch.Tensor | float,
+    size: int | tuple[int, ...],
+    device: str,
+    out: torch.Tensor | None = None,
 ) -> torch.Tensor:
     """Sample using gaussian distribution.
 
     Args:
         mean: Mean of the gaussian.
         std: Std of the gaussian.
-        size: The shape of the tensor.
-        device: Device to create tensor on.
+        size: The shape of the tensor. Ignored if :attr:`out` is given.
+        device: Device to create tensor on. Ignored if :attr:`out` is given.
+        out: The output buffer, filled on its device without allocating any tensor.
+            Defaults to None, in which case a new tensor is returned.
 
     Returns:
         Sampled tensor.
     """
+    if out is not None:
+        if isinstance(mean, torch.Tensor) or isinstance(std, torch.Tensor):
+            return torch.normal(mean, std, out=out)
+        return out.normal_(mean, std)
     if isinstance(mean, float):
         if isinstance(size, int):
             size = (size,)
@@ -1881,6 +1939,112 @@ def interpolate_poses(
     return pose_steps, num_steps - 1
 
 
+def quat_slerp_batched(q1: torch.Tensor, q2: torch.Tensor, tau: torch.Tensor | float) -> torch.Tensor:
+    """Performs spherical linear interpolation (SLERP) between batches of quaternions.
+
+    Batched version of :func:`quat_slerp`, with the same handling of the end points and of (nearly) equal
+    rotations. The inputs are broadcast against each other, e.g. ``q1`` and ``q2`` of shape (N, 1, 4) with
+    ``tau`` of shape (S,) give the S interpolated rotations of every pair, of shape (N, S, 4).
+
+    Args:
+        q1: First quaternions in (w, x, y, z) format. Shape is (..., 4).
+        q2: Second quaternions in (w, x, y, z) format. Shape is (..., 4).
+        tau: Interpolation coefficients between 0 (q1) and 1 (q2). Shape is broadcastable to (...).
+
+    Returns:
+        Interpolated quaternions in (w, x, y, z) format. Shape is (..., 4).
+    """
+    tau = torch.as_tensor(tau, dtype=q1.dtype, device=q1.device).unsqueeze(-1)
+    eps = torch.finfo(q1.dtype).eps * 4.0
+    d = torch.sum(q1 * q2, dim=-1, keepdim=True)
+    # take the shortest path
+    q2_short = torch.where(d < 0.0, -q2, q2)
+    d = d.abs()
+    angle = torch.acos(torch.clamp(d, -1.0, 1.0))
+    degenerate = ((d - 1.0).abs() < eps) | (angle < eps)
+    inv_sin = 1.0 / torch.where(degenerate, torch.ones_like(angle), torch.sin(angle))
+    q = q1 * (torch.sin((1.0 - tau) * angle) * inv_sin) + q2_short * (torch.sin(tau * angle) * inv_sin)
+    q = torch.where(degenerate, q1.expand_as(q), q)
+    q = torch.where(tau == 0.0, q1.expand_as(q), q)
+    return torch.where(tau == 1.0, q2.expand_as(q), q)
+
+
+def interpolate_rotations_batched(
+    R1: torch.Tensor, R2: torch.Tensor, num_steps: int, axis_angle: bool = True
+) -> torch.Tensor:
+    """Interpolates between batches of rotation matrices, computing all steps at once.
+
+    Batched version of :func:`interpolate_rotations`: all interpolation steps of all pairs are computed in
+    broadcasted calls, without a Python loop over the steps.
+
+    Args:
+        R1: First rotation matrices. Shape is (..., 3, 3).
+        R2: Second rotation matrices. Shape is (..., 3, 3).
+        num_steps: Number of desired interpolated rotations (excluding the end).
+        axis_angle: If True, interpolate in axis-angle representation;
+                   otherwise use slerp. Defaults to True.
+
+    Returns:
+        Interpolated rotation matrices of shape (..., num_steps + 1, 3, 3), including the start and end rotations.
+    """
+    steps = torch.arange(num_steps, dtype=R1.dtype, device=R1.device)
+    if axis_angle:
+        # delta rotation expressed as axis-angle, chunked into steps around the fixed axis
+        delta_axis_angle = axis_angle_from_quat(quat_from_matrix(torch.matmul(R2, R1.transpose(-1, -2))))
+        delta_angle = torch.linalg.norm(delta_axis_angle, dim=-1, keepdim=True)
+        delta_axis = delta_axis_angle / delta_angle.clamp(min=1e-12)
+        angles = delta_angle / num_steps * steps
+        axes = delta_axis.unsqueeze(-2).expand(angles.shape + (3,))
+        rot_steps = torch.matmul(matrix_from_quat(quat_from_angle_axis(angles, axes)), R1.unsqueeze(-3))
+        # small angle: no interpolation
+        small_angle = (delta_angle < 0.05).unsqueeze(-1).unsqueeze(-1)
+        rot_steps = torch.where(small_angle, R2.unsqueeze(-3).expand_as(rot_steps), rot_steps)
+    else:
+        q1 = quat_from_matrix(R1).unsqueeze(-2)
+        q2 = quat_from_matrix(R2).unsqueeze(-2)
+        rot_steps = matrix_from_quat(quat_slerp_batched(q1, q2, steps / num_steps))
+
+    # add in endpoint
+    return torch.cat([rot_steps, R2.unsqueeze(-3)], dim=-3)
+
+
+def interpolate_poses_batched(
+    pose_1: torch.Tensor, pose_2: torch.Tensor, num_steps: int, perturb: bool = False
+) -> torch.Tensor:
+    """Performs linear interpolation between batches of poses, computing all steps at once.
+
+    Batched version of :func:`interpolate_poses` for a fixed number of steps, e.g. to generate reference
+    trajectories or reset paths for all environments in one call.
+
+    Args:
+        pose_1: Start poses. Shape is (..., 4, 4).
+        pose_2: End poses. Shape is (..., 4, 4).
+        num_steps: Number of desired interpolated points. Passing 0 corresponds to no interpolation.
+        perturb: If True, randomly perturbs the interpolated position points of every pair.
+
+    Returns:
+        Interpolated pose paths of shape (..., num_steps + 2, 4, 4), including the start and end poses.
+    """
+    pos1, rot1 = unmake_pose(pose_1)
+    pos2, rot2 = unmake_pose(pose_2)
+    if num_steps == 0:
+        return torch.stack([pose_1, pose_2], dim=-3)
+
+    num_steps += 1  # Include starting pose
+    # linear interpolation of positions, on a grid of shape (..., num_steps)
+    grid = torch.arange(num_steps, dtype=pos1.dtype, device=pos1.device).expand(pos1.shape[:-1] + (num_steps,))
+    if perturb:
+        # move interpolation grid points by up to half-size forward or backward
+        grid = grid.clone()
+        grid[..., 1:-1] += torch.rand(grid[..., 1:-1].shape, dtype=pos1.dtype, device=pos1.device) - 0.5
+    pos_step_size = (pos2 - pos1) / num_steps
+    pos_steps = pos1.unsqueeze(-2) + grid.unsqueeze(-1) * pos_step_size.unsqueeze(-2)
+    pos_steps = torch.cat([pos_steps, pos2.unsqueeze(-2)], dim=-2)
+
+    rot_steps = interpolate_rotations_batched(rot1, rot2, num_steps=num_steps, axis_angle=True)
+    return make_pose(pos_steps, rot_steps)
+
+
 def transform_poses_from_frame_A_to_frame_B(
     src_poses: torch.Tensor, frame_A: torch.Tensor, frame_B: torch.Tensor
 ) -> torch.Tensor:
@@ -1966,3 +2130,67 @@ def generate_random_transformation_matrix(pos_boundary: float = 1, rot_boundary:
     T[:3, 3] = translation
 
     return T
+
+
+"""
+Fused variants
+
+Elementwise formulations of the hot-path rotation kernels: the components are computed with broadcasting
+instead of reshapes, cross products and index writes, so that TorchScript (or torch.compile) can fuse each
+kernel into few launches. They are registered as the ``"fused"`` variant of the kernels (see :mod:`lazy_jit`).
+"""
+
+
+@lazy_script
+def _quat_apply_fused(quat: torch.Tensor, vec: torch.Tensor) -> torch.Tensor:
+    w, x, y, z = quat.unbind(-1)
+    vx, vy, vz = vec.unbind(-1)
+    # t = 2 * cross(q_xyz, v), result = v + w * t + cross(q_xyz, t)
+    tx = 2.0 * (y * vz - z * vy)
+    ty = 2.0 * (z * vx - x * vz)
+    tz = 2.0 * (x * vy - y * vx)
+    return torch.stack(
+        (vx + w * tx + y * tz - z * ty, vy + w * ty + z * tx - x * tz, vz + w * tz + x * ty - y * tx), dim=-1
+    )
+
+
+@lazy_script
+def _quat_apply_inverse_fused(quat: torch.Tensor, vec: torch.Tensor) -> torch.Tensor:
+    w, x, y, z = quat.unbind(-1)
+    vx, vy, vz = vec.unbind(-1)
+    # t = 2 * cross(q_xyz, v), result = v - w * t + cross(q_xyz, t)
+    tx = 2.0 * (y * vz - z * vy)
+    ty = 2.0 * (z * vx - x * vz)
+    tz = 2.0 * (x * vy - y * vx)
+    return torch.stack(
+        (vx - w * tx + y * tz - z * ty, vy - w * ty + z * tx - x * tz, vz - w * tz + x * ty - y * tx), dim=-1
+    )
+
+
+@lazy_script
+def _quat_mul_fused(q1: torch.Tensor, q2: torch.Tensor) -> torch.Tensor:
+    w1, x1, y1, z1 = q1.unbind(-1)
+    w2, x2, y2, z2 = q2.unbind(-1)
+    return torch.stack(
+        (
+            w1 * w2 - x1 * x2 - y1 * y2 - z1 * z2,
+            w1 * x2 + x1 * w2 + y1 * z2 - z1 * y2,
+            w1 * y2 - x1 * z2 + y1 * w2 + z1 * x2,
+            w1 * z2 + x1 * y2 - y1 * x2 + z1 * w2,
+        ),
+        dim=-1,
+    )
+
+
+@lazy_script
+def _yaw_quat_fused(quat: torch.Tensor) -> torch.Tensor:
+    w, x, y, z = quat.unbind(-1)
+    half_yaw = 0.5 * torch.atan2(2 * (w * z + x * y), 1 - 2 * (y * y + z * z))
+    zero = torch.zeros_like(half_yaw)
+    return torch.stack((torch.cos(half_yaw), zero, zero, torch.sin(half_yaw)), dim=-1)
+
+
+quat_apply.register_variant("fused", _quat_apply_fused)
+quat_apply_inverse.register_variant("fused", _quat_apply_inverse_fused)
+quat_mul.register_variant("fused", _quat_mul_fused)
+yaw_quat.register_variant("fused", _yaw_quat_fused)
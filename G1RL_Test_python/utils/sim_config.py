@@ -44,6 +44,8 @@ class SimConfig:
 
         self._config = config
         self._cfg = config.get("task", dict())
+        # parsed actor configs, by actor name (see parse_actor_config)
+        self._actor_configs = {}
         self._parse_config()
 
         if self._config["test"] == True:
@@ -166,6 +168,14 @@ class SimConfig:
         print("Sim Device: ", "GPU" if self._physx_params["use_gpu"] else "CPU")
 
     def parse_actor_config(self, actor_name):
+        return copy.deepcopy(self._get_actor_config(actor_name))
+
+    def _get_actor_config(self, actor_name):
+        # the task config does not change after construction, so every actor is parsed once
+        actor_params = self._actor_configs.get(actor_name)
+        if actor_params is not None:
+            return actor_params
+
         actor_params = copy.deepcopy(default_actor_options)
         if "sim" in self._cfg and actor_name in self._cfg["sim"]:
             actor_cfg = self._cfg["sim"][actor_name]
@@ -175,10 +185,11 @@ class SimConfig:
                 elif opt not in actor_params:
                     print("Actor params does not have attribute: ", opt)
 
+        self._actor_configs[actor_name] = actor_params
         return actor_params
 
     def _get_actor_config_value(self, actor_name, attribute_name, attribute=None):
-        actor_params = self.parse_actor_config(actor_name)
+        actor_params = self._get_actor_config(actor_name)
 
         if attribute is not None:
             if attribute_name not in actor_params:
@@ -354,17 +365,12 @@ class SimConfig:
             value = self._get_actor_config_value(name, "make_kinematic")
         if value == True:
             # parse through all children prims
-            prims = [prim]
-            while len(prims) > 0:
-                cur_prim = prims.pop(0)
+            for cur_prim in self._iter_subtree(prim):
                 rb = UsdPhysics.RigidBodyAPI.Get(stage, cur_prim.GetPath())
 
                 if rb:
                     rb.CreateKinematicEnabledAttr().Set(True)
 
-                children_prims = cur_prim.GetPrim().GetChildren()
-                prims = prims + children_prims
-
     def set_articulation_position_iteration(self, name, prim, value=None):
         arti_api = self._get_physx_articulation_api(prim)
         solver_position_iteration_count = arti_api.GetSolverPositionIterationCountAttr()
@@ -456,38 +462,39 @@ class SimConfig:
         self.set_rest_offset(name, prim, cfg["rest_offset"])
 
     def apply_articulation_settings(self, name, prim, cfg):
-        from pxr import PhysxSchema, UsdPhysics
+        from pxr import PhysxSchema, Sdf, UsdPhysics
 
         stage = omni.usd.get_context().get_stage()
 
+        # single traversal of the subtree: classify the prims and check if it is an articulation
         is_articulation = False
-        # check if is articulation
-        prims = [prim]
-        while len(prims) > 0:
-            prim_tmp = prims.pop(0)
-            articulation_api = UsdPhysics.ArticulationRootAPI.Get(stage, prim_tmp.GetPath())
-            physx_articulation_api = PhysxSchema.PhysxArticulationAPI.Get(stage, prim_tmp.GetPath())
-
-            if articulation_api or physx_articulation_api:
+        rigid_bodies, collision_bodies, articulation_roots = [], [], []
+        for cur_prim in self._iter_subtree(prim):
+            if cur_prim.HasAPI(UsdPhysics.ArticulationRootAPI) or cur_prim.HasAPI(PhysxSchema.PhysxArticulationAPI):
                 is_articulation = True
-
-            children_prims = prim_tmp.GetPrim().GetChildren()
-            prims = prims + children_prims
-
-        # parse through all children prims
-        prims = [prim]
-        while len(prims) > 0:
-            cur_prim = prims.pop(0)
-            rb = UsdPhysics.RigidBodyAPI.Get(stage, cur_prim.GetPath())
-            collision_body = UsdPhysics.CollisionAPI.Get(stage, cur_prim.GetPath())
-            articulation = UsdPhysics.ArticulationRootAPI.Get(stage, cur_prim.GetPath())
-            if rb:
+            if cur_prim.HasAPI(UsdPhysics.RigidBodyAPI):
+                rigid_bodies.append(cur_prim)
+            if cur_prim.HasAPI(UsdPhysics.CollisionAPI):
+                collision_bodies.append(cur_prim)
+            if cur_prim.HasAPI(UsdPhysics.ArticulationRootAPI):
+                articulation_roots.append(cur_prim)
+
+        # apply the missing PhysX schemas first: applying a schema changes the prim definition, which must be
+        # recomposed before its attributes can be read
+        for cur_prim in rigid_bodies:
+            self._get_physx_rigid_body_api(cur_prim)
+        for cur_prim in collision_bodies:
+            self._get_physx_collision_api(cur_prim)
+        for cur_prim in articulation_roots:
+            self._get_physx_articulation_api(cur_prim)
+
+        # the attribute writes of all prims are batched into a single change notification
+        with Sdf.ChangeBlock():
+            for cur_prim in rigid_bodies:
                 self.apply_rigid_body_settings(name, cur_prim, cfg, is_articulation)
-            if collision_body:
+            for cur_prim in collision_bodies:
                 self.apply_rigid_shape_settings(name, cur_prim, cfg)
-
-            if articulation:
-                articulation_api = UsdPhysics.ArticulationRootAPI.Get(stage, cur_prim.GetPath())
+            for cur_prim in articulation_roots:
                 physx_articulation_api = PhysxSchema.PhysxArticulationAPI.Get(stage, cur_prim.GetPath())
 
                 # enable self collisions
@@ -500,5 +507,8 @@ class SimConfig:
                 self.set_articulation_sleep_threshold(name, cur_prim, cfg["sleep_threshold"])
                 self.set_articulation_stabilization_threshold(name, cur_prim, cfg["stabilization_threshold"])
 
-            children_prims = cur_prim.GetPrim().GetChildren()
-            prims = prims + children_prims
+    def _iter_subtree(self, prim):
+        # pre-order traversal of the prim and its descendants, without building intermediate lists
+        from pxr import Usd
+
+        return Usd.PrimRange(prim.GetPrim())
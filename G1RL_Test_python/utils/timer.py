@@ -0,0 +1,73 @@
+import time
+from contextlib import nullcontext
+
+import torch
+
+_NULL_CONTEXT = nullcontext()
+
+
+class _Section:
+    def __init__(self, timer: "SectionTimer", name: str):
+        self._timer = timer
+        self._name = name
+        self._start = 0.0
+
+    def __enter__(self):
+        self._timer._synchronize()
+        self._start = time.perf_counter()
+
+    def __exit__(self, *args):
+        self._timer._synchronize()
+        self._timer._add(self._name, time.perf_counter() - self._start)
+
+
+class SectionTimer:
+    """Accumulate the wall-clock time spent in named code sections.
+
+    Sections are timed with ``with timer.section("name"):``. When the timer is disabled, :meth:`section`
+    returns a shared no-op context, so instrumented code can stay in the hot path. When enabled on a CUDA
+    device, the device is synchronized at the boundaries of each section, so that the time of the kernels
+    launched in a section is attributed to it.
+    """
+
+    def __init__(self, enabled: bool = False, device: str = "cpu"):
+        """Initialize the timer.
+
+        Args:
+            enabled: Whether to time the sections. Defaults to False.
+            device: The device to synchronize before reading the clock. Defaults to "cpu".
+        """
+        self.enabled = enabled
+        self._device = device
+        self._totals: dict[str, float] = {}
+        self._counts: dict[str, int] = {}
+
+    def section(self, name: str):
+        """Context manager timing the enclosed code under ``name``."""
+        if not self.enabled:
+            return _NULL_CONTEXT
+        return _Section(self, name)
+
+    def reset(self):
+        self._totals.clear()
+        self._counts.clear()
+
+    def summary(self) -> dict[str, tuple[float, int]]:
+        """The mean time in milliseconds and the number of calls of every section."""
+        return {name: (self._totals[name] / self._counts[name] * 1e3, self._counts[name]) for name in self._totals}
+
+    def report(self, title: str = "timings"):
+        """Print the mean time and the share of every section."""
+        total = sum(self._totals.values())
+        print(f"[SectionTimer] {title}")
+        for name, (mean_ms, count) in self.summary().items():
+            share = 100.0 * self._totals[name] / total if total > 0 else 0.0
+            print(f"  {name:<24s} {mean_ms:8.3f} ms x {count:6d} ({share:5.1f}%)")
+
+    def _add(self, name: str, elapsed: float):
+        self._totals[name] = self._totals.get(name, 0.0) + elapsed
+        self._counts[name] = self._counts.get(name, 0) + 1
+
+    def _synchronize(self):
+        if str(self._device).startswith("cuda"):
+            torch.cuda.synchronize(self._device)
@@ -0,0 +1,132 @@
+"""Count the tensors allocated in steady state by the sampling helpers, the point transforms and the commands.
+
+Every case is called a few times to warm up, then its calls are run under a dispatch mode that counts the
+tensors created by the torch operators (outputs that do not share the storage of an input). The ``out=``
+variants of the cases marked as allocation-free must create no tensor; the script fails otherwise. The mean
+latencies of the allocating and the ``out=`` variants are printed next to the counts.
+
+Usage:
+    python benchmarks/allocation_benchmark.py [--device cpu] [--num-envs 4096] [--iters 100]
+"""
+
+import argparse
+import collections
+
+import torch
+from torch.utils._python_dispatch import TorchDispatchMode
+from torch.utils._pytree import tree_leaves
+
+from common import default_device, time_fn
+from G1RL_Test_python.managers.command_manager import VelocityCommandManager
+from G1RL_Test_python.utils import math_utils
+
+
+class AllocationCounter(TorchDispatchMode):
+    """Counts the tensors created by the operators run under the mode, by operator."""
+
+    def __init__(self):
+        super().__init__()
+        self.counts = collections.Counter()
+
+    def __torch_dispatch__(self, func, types, args=(), kwargs=None):
+        kwargs = kwargs or {}
+        result = func(*args, **kwargs)
+        inputs = {_storage(t) for t in tree_leaves((args, kwargs)) if isinstance(t, torch.Tensor)}
+        for t in tree_leaves(result):
+            if isinstance(t, torch.Tensor) and t.untyped_storage().nbytes() > 0 and _storage(t) not in inputs:
+                self.counts[str(func)] += 1
+        return result
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts.values())
+
+
+def _storage(t: torch.Tensor) -> int:
+    return t.untyped_storage().data_ptr()
+
+
+def count_allocations(fn, num_iters: int, num_warmup: int = 3) -> AllocationCounter:
+    for _ in range(num_warmup):
+        fn()
+    with AllocationCounter() as counter:
+        for _ in range(num_iters):
+            fn()
+    return counter
+
+
+# name -> (allocating version, out= version, whether the out= version must allocate nothing)
+def cases(num_envs: int, device: str) -> dict:
+    lower, upper = torch.tensor([-1.0, -0.5, -1.0], device=device), torch.tensor([1.0, 0.5, 1.0], device=device)
+    buffer = torch.empty((num_envs, 3), device=device)
+    points = torch.randn(num_envs, 16, 3, device=device)
+    points_out = torch.empty_like(points)
+    pos = torch.randn(num_envs, 3, device=device)
+    quat = math_utils.random_orientation(num_envs, device)
+    commands = VelocityCommandManager(num_envs, resampling_time_range=(0.02, 0.1), device=device)
+    return {
+        "sample_uniform (floats)": (
+            lambda: math_utils.sample_uniform(0.5, 1.5, (num_envs, 3), device),
+            lambda: math_utils.sample_uniform(0.5, 1.5, (num_envs, 3), device, out=buffer),
+            True,
+        ),
+        "sample_uniform (tensors)": (
+            lambda: math_utils.sample_uniform(lower, upper, (num_envs, 3), device),
+            lambda: math_utils.sample_uniform(lower, upper, (num_envs, 3), device, out=buffer),
+            True,
+        ),
+        "sample_log_uniform": (
+            lambda: math_utils.sample_log_uniform(0.1, 10.0, (num_envs, 3), device),
+            lambda: math_utils.sample_log_uniform(0.1, 10.0, (num_envs, 3), device, out=buffer),
+            True,
+        ),
+        "sample_gaussian": (
+            lambda: math_utils.sample_gaussian(0.0, 1.0, (num_envs, 3), device),
+            lambda: math_utils.sample_gaussian(0.0, 1.0, (num_envs, 3), device, out=buffer),
+            True,
+        ),
+        "transform_points (pos)": (
+            lambda: math_utils.transform_points(points, pos),
+            lambda: math_utils.transform_points(points, pos, out=points_out),
+            True,
+        ),
+        # the rotation matrices and the intermediates of matrix_from_quat are still allocated at every call
+        "transform_points (pos, quat)": (
+            lambda: math_utils.transform_points(points, pos, quat),
+            lambda: math_utils.transform_points(points, pos, quat, out=points_out),
+            False,
+        ),
+        "VelocityCommandManager.compute": (None, lambda: commands.compute(0.02), True),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--device", default=default_device())
+    parser.add_argument("--num-envs", type=int, default=4096)
+    parser.add_argument("--iters", type=int, default=100)
+    args = parser.parse_args()
+
+    torch.manual_seed(0)
+    print(f"device: {args.device}, num_envs: {args.num_envs}, tensors allocated per call and latency in us")
+    print(f"{'case':<32s} {'allocs':>7s} {'out= allocs':>12s} {'us':>9s} {'out= us':>9s}")
+    failures = []
+    for name, (allocating, in_place, allocation_free) in cases(args.num_envs, args.device).items():
+        counter = count_allocations(in_place, args.iters)
+        in_place_us = time_fn(in_place, args.device, args.iters)
+        if allocating is not None:
+            allocs = f"{count_allocations(allocating, args.iters).total / args.iters:7.1f}"
+            us = f"{time_fn(allocating, args.device, args.iters):9.1f}"
+        else:
+            allocs, us = f"{'-':>7s}", f"{'-':>9s}"
+        print(f"{name:<32s} {allocs} {counter.total / args.iters:12.1f} {us} {in_place_us:9.1f}")
+        if allocation_free and counter.total > 0:
+            failures.append(f"{name}: {dict(counter.counts)}")
+
+    if failures:
+        raise SystemExit("tensors allocated in steady state:\n  " + "\n  ".join(failures))
+    print("\nno tensor allocated in steady state by the allocation-free cases")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Compare the load time of a policy from TorchScript, from flat weights, and from the load cache.
+
+Usage:
+    python benchmarks/checkpoint_load_benchmark.py [--device cpu] [--hidden-dims 512 256 128]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import torch
+
+from common import default_device
+from G1RL_Test_python.policy import PolicyExporter
+
+
+def mean_ms(fn, num_iters: int) -> float:
+    start = time.perf_counter()
+    for _ in range(num_iters):
+        fn()
+    return (time.perf_counter() - start) / num_iters * 1e3
+
+
+def check_normalized_export(tmp_dir: str, hidden_dims: list[int]):
+    """A policy with an observation normalizer must script, save and reload with the same outputs."""
+    policy = PolicyExporter(hidden_dims=hidden_dims, normalize_obs=True).eval()
+    obs_dim = policy.normalizer.mean.numel()
+    policy.normalizer.clip = 5.0
+    policy.normalizer.mean.normal_()
+    policy.normalizer.var.uniform_(0.5, 2.0)
+    path = os.path.join(tmp_dir, "normalized_policy.pt")
+    flat_path = os.path.join(tmp_dir, "normalized_policy.safetensors")
+    torch.jit.script(policy).save(path)
+    policy.save_flat(flat_path)
+    obs = 10.0 * torch.randn(64, obs_dim)
+    with torch.no_grad():
+        expected = policy(obs)
+        torch.testing.assert_close(torch.jit.load(path)(obs), expected)
+        torch.testing.assert_close(PolicyExporter.from_jit(path, "cpu")(obs), expected)
+        torch.testing.assert_close(PolicyExporter.from_flat(flat_path, "cpu")(obs), expected)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--device", default=default_device())
+    parser.add_argument("--hidden-dims", type=int, nargs="+", default=[256, 256, 128])
+    parser.add_argument("--iters", type=int, default=20)
+    args = parser.parse_args()
+
+    policy = PolicyExporter(hidden_dims=args.hidden_dims).eval()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        jit_path = os.path.join(tmp_dir, "policy.pt")
+        flat_path = os.path.join(tmp_dir, "policy.safetensors")
+        torch.jit.script(policy).save(jit_path)
+        policy.save_flat(flat_path)
+
+        # both formats must restore the same weights, for any depth
+        reference = policy.state_dict()
+        for loaded in (PolicyExporter.from_jit(jit_path, "cpu"), PolicyExporter.from_flat(flat_path, "cpu")):
+            for name, value in loaded.state_dict().items():
+                assert torch.equal(value, reference[name]), name
+        check_normalized_export(tmp_dir, args.hidden_dims)
+
+        results = {
+            "torchscript": mean_ms(lambda: PolicyExporter.from_jit(jit_path, args.device), args.iters),
+            "flat": mean_ms(lambda: PolicyExporter.from_flat(flat_path, args.device), args.iters),
+            "cached": mean_ms(lambda: PolicyExporter.load(flat_path, args.device), args.iters),
+        }
+    print(f"device: {args.device}, hidden dims: {args.hidden_dims}, load time in ms")
+    for name, ms in results.items():
+        print(f"  {name:<12s} {ms:8.3f}")
+
+
+if __name__ == "__main__":
+    main()
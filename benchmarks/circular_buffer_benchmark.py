@@ -0,0 +1,88 @@
+"""Compare append/read latency of the CircularBuffer variants.
+
+Before timing, the mirrored and the sync-free variants are checked against the default
+CircularBuffer on random sequences of appends, resets and reads (on CPU and on the benchmark device).
+
+Usage:
+    python benchmarks/circular_buffer_benchmark.py [--device cuda:0] [--data-dim 14]
+"""
+
+import argparse
+
+import torch
+
+from common import default_device, time_fn
+from circular_buffer import CircularBuffer, SyncFreeCircularBuffer
+
+VARIANTS = {
+    "default": lambda max_len, batch_size, device: CircularBuffer(max_len, batch_size, device),
+    "mirrored": lambda max_len, batch_size, device: CircularBuffer(max_len, batch_size, device, mirrored=True),
+    "sync-free": lambda max_len, batch_size, device: SyncFreeCircularBuffer(max_len, batch_size, device),
+    "sync-free(m)": lambda max_len, batch_size, device: SyncFreeCircularBuffer(
+        max_len, batch_size, device, mirrored=True
+    ),
+}
+
+
+def check_equivalence(device: str, num_steps: int = 200, seed: int = 0):
+    """Run the same random operations on every variant and compare against the default buffer."""
+    generator = torch.Generator().manual_seed(seed)
+    for max_len in (1, 2, 5):
+        batch_size = 7
+        buffers = {name: make(max_len, batch_size, device) for name, make in VARIANTS.items()}
+        for _ in range(num_steps):
+            op = torch.randint(0, 4, (1,), generator=generator).item()
+            if op == 0:
+                batch_ids = torch.randperm(batch_size, generator=generator)[:3].tolist()
+                for buffer in buffers.values():
+                    buffer.reset(batch_ids)
+            else:
+                data = torch.randn(batch_size, 3, generator=generator).to(device)
+                for buffer in buffers.values():
+                    buffer.append(data)
+
+            reference = buffers["default"]
+            for name, buffer in buffers.items():
+                assert torch.equal(buffer.current_length, reference.current_length), name
+                # the storage, and thus the ordered history, only exists after the first append
+                if reference._buffer is not None:
+                    assert torch.equal(buffer.buffer, reference.buffer), name
+            # indexing is only defined on the reference once every batch index has been pushed to
+            if torch.all(reference.current_length > 0):
+                key = torch.randint(0, max_len + 2, (batch_size,), generator=generator).to(device)
+                for name, buffer in buffers.items():
+                    assert torch.equal(buffer[key], reference[key]), name
+    print(f"variants match the default CircularBuffer on {device}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--device", default=default_device())
+    parser.add_argument("--data-dim", type=int, default=14)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[16, 256, 1024, 4096])
+    parser.add_argument("--history-lengths", type=int, nargs="+", default=[3, 5, 10])
+    parser.add_argument("--iters", type=int, default=1000)
+    args = parser.parse_args()
+
+    check_equivalence("cpu")
+    if args.device != "cpu":
+        check_equivalence(args.device)
+
+    print(f"device: {args.device}, data dim: {args.data_dim}, latency in us (append / read)")
+    print(f"{'batch':>6} {'hist':>5} | " + " | ".join(f"{name:>17}" for name in VARIANTS))
+    for batch_size in args.batch_sizes:
+        for max_len in args.history_lengths:
+            data = torch.randn(batch_size, args.data_dim, device=args.device)
+            row = []
+            for make in VARIANTS.values():
+                buffer = make(max_len, batch_size, args.device)
+                for _ in range(max_len):
+                    buffer.append(data)
+                append_us = time_fn(lambda: buffer.append(data), args.device, args.iters)
+                read_us = time_fn(lambda: buffer.buffer, args.device, args.iters)
+                row.append(f"{append_us:>8.1f} {read_us:>8.1f}")
+            print(f"{batch_size:>6} {max_len:>5} | " + " | ".join(row))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""Helpers shared by the benchmark scripts.
+
+The benchmarks import the utility modules directly from ``G1RL_Test_python/utils``, and the torch-only parts of
+the package (e.g. ``G1RL_Test_python.rl``), so that they run in a plain Python environment without Isaac Sim.
+"""
+
+import os
+import sys
+import time
+
+import torch
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+UTILS_DIR = os.path.join(REPO_DIR, "G1RL_Test_python", "utils")
+for path in (REPO_DIR, UTILS_DIR):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+
+def synchronize(device: str):
+    """Wait for all kernels on the device to finish."""
+    if str(device).startswith("cuda"):
+        torch.cuda.synchronize(device)
+
+
+def time_fn(fn, device: str, num_iters: int = 1000, num_warmup: int = 50) -> float:
+    """Return the mean latency of ``fn()`` in microseconds."""
+    for _ in range(num_warmup):
+        fn()
+    synchronize(device)
+    start = time.perf_counter()
+    for _ in range(num_iters):
+        fn()
+    synchronize(device)
+    return (time.perf_counter() - start) / num_iters * 1e6
+
+
+def default_device() -> str:
+    return "cuda:0" if torch.cuda.is_available() else "cpu"
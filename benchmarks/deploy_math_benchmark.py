@@ -0,0 +1,92 @@
+"""Cross-check the deployment math module against math_utils, and compare their single-sample latencies.
+
+Every function of ``deploy_math`` is checked against its torch counterpart (in float64) on random single
+samples and on a batch. The latencies are then measured for one sample, as in the on-robot control loop: the
+deployment version on NumPy inputs, and the torch version (eager and TorchScript) on tensors of shape (1, ...).
+
+Usage:
+    python benchmarks/deploy_math_benchmark.py [--samples 1000] [--iters 10000]
+"""
+
+import argparse
+import math
+import time
+
+import numpy as np
+import torch
+
+import common  # noqa: F401  (puts the repository on sys.path)
+from G1RL_Test_python.utils import deploy_math, math_utils
+
+
+def random_quats(rng, num: int) -> np.ndarray:
+    quat = rng.normal(size=(num, 4))
+    return quat / np.linalg.norm(quat, axis=-1, keepdims=True)
+
+
+# name -> (arguments of a batch of samples, torch function, deploy function)
+def cases(rng, num: int) -> dict:
+    quats, other_quats, vecs = random_quats(rng, num), random_quats(rng, num), rng.normal(size=(num, 3))
+    angles = rng.uniform(-math.pi, math.pi, size=(3, num))
+    return {
+        "quat_apply_inverse": ((quats, vecs), math_utils.quat_apply_inverse, deploy_math.quat_apply_inverse),
+        "quat_apply": ((quats, vecs), math_utils.quat_apply, deploy_math.quat_apply),
+        "quat_mul": ((quats, other_quats), math_utils.quat_mul, deploy_math.quat_mul),
+        "quat_conjugate": ((quats,), math_utils.quat_conjugate, deploy_math.quat_conjugate),
+        "quat_inv": ((quats,), math_utils.quat_inv, deploy_math.quat_inv),
+        "yaw_quat": ((quats,), math_utils.yaw_quat, deploy_math.yaw_quat),
+        "quat_apply_yaw": ((quats, vecs), math_utils.quat_apply_yaw, deploy_math.quat_apply_yaw),
+        "matrix_from_quat": ((quats,), math_utils.matrix_from_quat, deploy_math.matrix_from_quat),
+        "euler_xyz_from_quat": ((quats,), math_utils.euler_xyz_from_quat, deploy_math.euler_xyz_from_quat),
+        "quat_from_euler_xyz": (tuple(angles), math_utils.quat_from_euler_xyz, deploy_math.quat_from_euler_xyz),
+        "normalize": ((vecs,), math_utils.normalize, deploy_math.normalize),
+        "wrap_to_pi": ((3 * angles[0],), math_utils.wrap_to_pi, deploy_math.wrap_to_pi),
+    }
+
+
+def as_numpy(result) -> np.ndarray:
+    if isinstance(result, tuple):
+        return np.stack([as_numpy(r) for r in result], axis=-1)
+    return result.numpy() if isinstance(result, torch.Tensor) else np.asarray(result)
+
+
+def check(name: str, args: tuple, torch_fn, deploy_fn, num_singles: int):
+    expected = as_numpy(torch_fn(*(torch.from_numpy(np.ascontiguousarray(arg)) for arg in args)))
+    np.testing.assert_allclose(as_numpy(deploy_fn(*args)), expected, atol=1e-9, err_msg=f"{name} (batch)")
+    for i in range(num_singles):
+        result = as_numpy(deploy_fn(*(arg[i] if arg.ndim > 1 else float(arg[i]) for arg in args)))
+        np.testing.assert_allclose(result, expected[i], atol=1e-9, err_msg=f"{name} (sample {i})")
+
+
+def mean_us(fn, args: tuple, num_iters: int) -> float:
+    fn(*args)
+    start = time.perf_counter()
+    for _ in range(num_iters):
+        fn(*args)
+    return (time.perf_counter() - start) / num_iters * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--samples", type=int, default=1000, help="Number of random samples of the cross-check.")
+    parser.add_argument("--iters", type=int, default=10000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    for name, (batch_args, torch_fn, deploy_fn) in cases(rng, args.samples).items():
+        check(name, batch_args, torch_fn, deploy_fn, args.samples)
+    print(f"cross-check against math_utils passed on {args.samples} samples per function")
+
+    print(f"\nsingle-sample latency in us ({args.iters} calls)")
+    print(f"{'function':<22s} {'deploy':>8s} {'torch eager':>12s} {'torchscript':>12s}")
+    for name, (batch_args, torch_fn, deploy_fn) in cases(rng, 1).items():
+        single = tuple(arg[0] if arg.ndim > 1 else float(arg[0]) for arg in batch_args)
+        tensors = tuple(torch.from_numpy(np.ascontiguousarray(arg)).float() for arg in batch_args)
+        deploy = mean_us(deploy_fn, single, args.iters)
+        eager = mean_us(torch_fn.implementation("eager"), tensors, args.iters)
+        script = mean_us(torch_fn.implementation("script"), tensors, args.iters)
+        print(f"{name:<22s} {deploy:8.2f} {eager:12.2f} {script:12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Compare the batched rotation and pose interpolation with the per-pair, per-step loop versions.
+
+The loop versions interpolate one pair at a time, so they are timed on at most ``--max-loop-pairs`` pairs and
+their time is scaled to the full batch. Both versions are checked to give the same paths before timing.
+
+Usage:
+    python benchmarks/interpolation_benchmark.py [--device cpu] [--batch-sizes 1 64 4096] [--num-steps 10 100]
+"""
+
+import argparse
+import time
+
+import torch
+
+from common import default_device, synchronize
+from G1RL_Test_python.utils import math_utils
+
+
+def random_poses(batch_size: int, device: str) -> torch.Tensor:
+    rot = math_utils.matrix_from_quat(math_utils.random_orientation(batch_size, device))
+    return math_utils.make_pose(torch.randn(batch_size, 3, device=device), rot)
+
+
+def mean_ms(fn, device: str, num_iters: int) -> float:
+    fn()
+    synchronize(device)
+    start = time.perf_counter()
+    for _ in range(num_iters):
+        fn()
+    synchronize(device)
+    return (time.perf_counter() - start) / num_iters * 1e3
+
+
+def check(pose_1: torch.Tensor, pose_2: torch.Tensor, num_steps: int):
+    batched = math_utils.interpolate_poses_batched(pose_1, pose_2, num_steps)
+    for i in range(min(len(pose_1), 8)):
+        expected, _ = math_utils.interpolate_poses(pose_1[i], pose_2[i], num_steps)
+        torch.testing.assert_close(batched[i], expected, atol=1e-4, rtol=1e-4)
+    _, rot_1 = math_utils.unmake_pose(pose_1)
+    _, rot_2 = math_utils.unmake_pose(pose_2)
+    batched = math_utils.interpolate_rotations_batched(rot_1, rot_2, num_steps, axis_angle=False)
+    for i in range(min(len(pose_1), 8)):
+        expected = math_utils.interpolate_rotations(rot_1[i], rot_2[i], num_steps, axis_angle=False)
+        torch.testing.assert_close(batched[i], expected, atol=1e-4, rtol=1e-4)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--device", default=default_device())
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 64, 1024, 4096])
+    parser.add_argument("--num-steps", type=int, nargs="+", default=[10, 50, 200])
+    parser.add_argument("--max-loop-pairs", type=int, default=16)
+    parser.add_argument("--iters", type=int, default=10)
+    args = parser.parse_args()
+
+    torch.manual_seed(0)
+    print(f"device: {args.device}, interpolate_poses time in ms per batch")
+    print(f"{'batch':>6s} {'steps':>6s} {'loop':>12s} {'batched':>10s} {'speedup':>9s}")
+    for batch_size in args.batch_sizes:
+        pose_1, pose_2 = random_poses(batch_size, args.device), random_poses(batch_size, args.device)
+        for num_steps in args.num_steps:
+            check(pose_1, pose_2, num_steps)
+            num_loop_pairs = min(batch_size, args.max_loop_pairs)
+
+            def loop():
+                for i in range(num_loop_pairs):
+                    math_utils.interpolate_poses(pose_1[i], pose_2[i], num_steps)
+
+            loop_ms = mean_ms(loop, args.device, args.iters) * batch_size / num_loop_pairs
+            batched_ms = mean_ms(
+                lambda: math_utils.interpolate_poses_batched(pose_1, pose_2, num_steps), args.device, args.iters
+            )
+            print(
+                f"{batch_size:6d} {num_steps:6d} {loop_ms:12.3f} {batched_ms:10.3f} {loop_ms / batched_ms:8.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
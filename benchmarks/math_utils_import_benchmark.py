@@ -0,0 +1,78 @@
+"""Measure the import time of math_utils and the compilation cost of its kernels, in fresh processes.
+
+Every measurement runs in a new Python process, so that nothing is compiled yet. ``cold`` is the first run of a
+backend with an empty compilation cache, ``warm`` a second run that can reuse the on-disk cache (``compile``
+backend) and the OS file cache. The columns are:
+
+- ``import``: import of math_utils, after torch is imported.
+- ``first call``: first call of ``quat_apply_inverse``, including its compilation.
+- ``all kernels``: compilation of all kernels, i.e. the import cost before the kernels were lazy. With the
+  ``compile`` backend, the kernels are only generated at their first call, which is timed in ``first call``.
+
+Usage:
+    python benchmarks/math_utils_import_benchmark.py [--backends script eager compile]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from common import REPO_DIR
+
+CHILD = r"""
+import json
+import sys
+import time
+
+sys.path.insert(0, {repo_dir!r})
+import torch
+
+start = time.perf_counter()
+from G1RL_Test_python.utils import math_utils
+from G1RL_Test_python.utils.lazy_jit import compile_all
+
+import_time = time.perf_counter() - start
+
+quat = torch.nn.functional.normalize(torch.randn(4096, 4), dim=-1)
+vec = torch.randn(4096, 3)
+start = time.perf_counter()
+math_utils.quat_apply_inverse(quat, vec)
+first_call_time = time.perf_counter() - start
+
+start = time.perf_counter()
+names = compile_all(math_utils)
+all_time = time.perf_counter() - start
+print(json.dumps({{"import": import_time, "first_call": first_call_time, "all": all_time, "count": len(names)}}))
+"""
+
+
+def run(backend: str, cache_dir: str) -> dict:
+    env = dict(os.environ, G1RL_JIT_BACKEND=backend, G1RL_JIT_CACHE_DIR=cache_dir)
+    env.pop("TORCHINDUCTOR_CACHE_DIR", None)
+    output = subprocess.run(
+        [sys.executable, "-c", CHILD.format(repo_dir=REPO_DIR)], env=env, check=True, capture_output=True, text=True
+    )
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backends", nargs="+", default=["script", "eager", "compile"])
+    args = parser.parse_args()
+
+    print(f"{'backend':<8s} {'run':<5s} {'import':>10s} {'first call':>12s} {'all kernels':>12s}")
+    for backend in args.backends:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            for run_name in ("cold", "warm"):
+                result = run(backend, cache_dir)
+                print(
+                    f"{backend:<8s} {run_name:<5s} {result['import'] * 1e3:8.1f}ms {result['first_call'] * 1e3:10.1f}ms"
+                    f" {result['all'] * 1e3:10.1f}ms ({result['count']} kernels)"
+                )
+
+
+if __name__ == "__main__":
+    main()
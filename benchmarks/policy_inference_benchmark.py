@@ -0,0 +1,45 @@
+"""Compare the per-step latency of eager PolicyExporter inference and of the PolicyInferenceEngine.
+
+The engine output is checked against the eager forward pass before timing. On CUDA the engine replays a
+captured graph, on CPU it runs the actor into preallocated buffers.
+
+Usage:
+    python benchmarks/policy_inference_benchmark.py [--device cuda:0] [--num-envs 1 16 4096]
+"""
+
+import argparse
+
+import torch
+
+from common import default_device, time_fn
+from G1RL_Test_python.policy import PolicyExporter, PolicyInferenceEngine
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--device", default=default_device())
+    parser.add_argument("--num-envs", type=int, nargs="+", default=[1, 16, 256, 4096])
+    parser.add_argument("--iters", type=int, default=1000)
+    args = parser.parse_args()
+
+    policy = PolicyExporter().to(args.device).eval()
+    print(f"device: {args.device}, latency in us")
+    print(f"{'envs':>6} | {'eager':>10} | {'engine':>10} | {'speedup':>7}")
+    for num_envs in args.num_envs:
+        obs = torch.randn(num_envs, 255, device=args.device)
+        engine = PolicyInferenceEngine(policy, num_envs, device=args.device)
+        with torch.no_grad():
+            expected = policy(obs)
+        torch.testing.assert_close(engine.act(obs), expected)
+
+        def eager():
+            with torch.no_grad():
+                policy(obs)
+
+        eager_us = time_fn(eager, args.device, args.iters)
+        engine_us = time_fn(lambda: engine.act(obs), args.device, args.iters)
+        print(f"{num_envs:>6} | {eager_us:>10.1f} | {engine_us:>10.1f} | {eager_us / engine_us:>6.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""Measure PPO training throughput (samples/sec) on the synthetic vectorized environment.
+
+Usage:
+    python benchmarks/ppo_throughput.py [--device cpu] [--num-envs 256 1024 4096] [--iterations 5]
+"""
+
+import argparse
+
+from common import default_device
+from G1RL_Test_python.rl.actor_critic import ActorCritic
+from G1RL_Test_python.rl.on_policy_runner import OnPolicyRunner
+from G1RL_Test_python.rl.ppo import PPO
+from G1RL_Test_python.rl.synthetic_env import SyntheticVecEnv
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--device", default=default_device())
+    parser.add_argument("--num-envs", type=int, nargs="+", default=[256, 1024, 4096])
+    parser.add_argument("--num-steps", type=int, default=24)
+    parser.add_argument("--iterations", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"device: {args.device}, steps per env and iteration: {args.num_steps}")
+    for num_envs in args.num_envs:
+        env = SyntheticVecEnv(num_envs, device=args.device)
+        algorithm = PPO(ActorCritic(env.obs_dim, env.action_dim), num_envs, args.num_steps, device=args.device)
+        runner = OnPolicyRunner(env, algorithm)
+        # the first iteration includes warm-up costs (allocator, kernels, optimizer state)
+        history = runner.learn(args.iterations + 1, log_interval=0)[1:]
+        samples_per_second = sum(stats["samples_per_second"] for stats in history) / len(history)
+        collect = sum(stats["collection_time"] for stats in history) / len(history)
+        learn = sum(stats["learn_time"] for stats in history) / len(history)
+        print(
+            f"num_envs {num_envs:6d} | {samples_per_second:10.0f} samples/s"
+            f" | collect {collect * 1e3:8.1f} ms | learn {learn * 1e3:8.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
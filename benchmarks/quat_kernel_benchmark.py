@@ -0,0 +1,109 @@
+"""Benchmark the quaternion kernels of math_utils with every backend, across batch sizes, dtypes and devices.
+
+Every kernel is timed with its eager, TorchScript (``script``) and ``torch.compile`` (``compile``) versions, and
+with its fused elementwise variant where it has one. The results of the variants are checked against the
+eager version before timing. With ``--output``, the fastest backend of every kernel and shape class is written
+to a selection file, which is applied at runtime with :func:`lazy_jit.load_selection`:
+
+    from G1RL_Test_python.utils import lazy_jit, math_utils
+    lazy_jit.load_selection("quat_selection.json", math_utils, device="cuda", dtype=torch.float32)
+
+Usage:
+    python benchmarks/quat_kernel_benchmark.py [--devices cpu cuda] [--dtypes float32 bfloat16]
+        [--batch-sizes 1 256 4096 65536] [--backends eager script compile fused] [--output selection.json]
+"""
+
+import argparse
+import json
+import math
+
+import torch
+
+from common import default_device
+from G1RL_Test_python.utils import lazy_jit, math_utils
+
+
+def random_quat(batch_size: int, device: str, dtype: torch.dtype) -> torch.Tensor:
+    return torch.nn.functional.normalize(torch.randn(batch_size, 4, device=device), dim=-1).to(dtype)
+
+
+def random_vec(batch_size: int, device: str, dtype: torch.dtype) -> torch.Tensor:
+    return torch.randn(batch_size, 3, device=device).to(dtype)
+
+
+# kernel name -> inputs of a batch
+KERNELS = {
+    "quat_apply_inverse": lambda n, device, dtype: (random_quat(n, device, dtype), random_vec(n, device, dtype)),
+    "quat_apply": lambda n, device, dtype: (random_quat(n, device, dtype), random_vec(n, device, dtype)),
+    "quat_mul": lambda n, device, dtype: (random_quat(n, device, dtype), random_quat(n, device, dtype)),
+    "quat_conjugate": lambda n, device, dtype: (random_quat(n, device, dtype),),
+    "yaw_quat": lambda n, device, dtype: (random_quat(n, device, dtype),),
+    "matrix_from_quat": lambda n, device, dtype: (random_quat(n, device, dtype),),
+    "euler_xyz_from_quat": lambda n, device, dtype: (random_quat(n, device, dtype),),
+}
+
+
+def check(fn: lazy_jit.LazyScriptFunction, backend: str, args: tuple, dtype: torch.dtype) -> bool:
+    """Whether the backend agrees with the eager version, False if it fails on these inputs."""
+    try:
+        expected = fn.implementation("eager")(*args)
+        result = fn.implementation(backend)(*args)
+    except (RuntimeError, TypeError, NotImplementedError):
+        return False
+    expected = expected if isinstance(expected, tuple) else (expected,)
+    result = result if isinstance(result, tuple) else (result,)
+    tolerance = 1e-4 if dtype == torch.float32 else 2e-2
+    for e, r in zip(expected, result):
+        torch.testing.assert_close(r.float(), e.float(), atol=tolerance, rtol=tolerance)
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--devices", nargs="+", default=["cpu"] + (["cuda"] if torch.cuda.is_available() else []))
+    parser.add_argument("--dtypes", nargs="+", default=["float32", "float16", "bfloat16"])
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 16, 256, 4096, 65536])
+    parser.add_argument("--backends", nargs="+", default=["eager", "script", "compile", "fused"])
+    parser.add_argument("--kernels", nargs="+", default=list(KERNELS))
+    parser.add_argument("--iters", type=int, default=200)
+    parser.add_argument("--output", default=None, help="Write the fastest backend per kernel and shape class.")
+    args = parser.parse_args()
+
+    torch.manual_seed(0)
+    selection = {}
+    for device in args.devices:
+        device = default_device() if device == "cuda" else device
+        for dtype_name in args.dtypes:
+            dtype = getattr(torch, dtype_name)
+            print(f"\ndevice: {device}, dtype: {dtype_name}, latency in us")
+            print(f"{'kernel':<22s} {'batch':>6s} " + " ".join(f"{backend:>9s}" for backend in args.backends))
+            for name in args.kernels:
+                fn = getattr(math_utils, name)
+                # summed latency of every backend over the batch sizes of every shape class
+                class_totals = {}
+                for batch_size in args.batch_sizes:
+                    inputs = KERNELS[name](batch_size, device, dtype)
+                    row = {}
+                    for backend in args.backends:
+                        if backend not in fn.backends or not check(fn, backend, inputs, dtype):
+                            row[backend] = math.inf
+                            continue
+                        row[backend] = lazy_jit.time_implementation(fn.implementation(backend), inputs, args.iters)
+                    totals = class_totals.setdefault(lazy_jit.shape_class(batch_size), {})
+                    for backend, us in row.items():
+                        totals[backend] = totals.get(backend, 0.0) + us
+                    cells = " ".join(f"{us:9.1f}" if math.isfinite(us) else f"{'n/a':>9s}" for us in row.values())
+                    print(f"{name:<22s} {batch_size:6d} {cells}")
+                best = {cls: min(totals, key=totals.get) for cls, totals in class_totals.items()}
+                print(f"{'':<22s} fastest: " + ", ".join(f"{cls} -> {backend}" for cls, backend in best.items()))
+                device_type = torch.device(device).type
+                selection.setdefault(device_type, {}).setdefault(dtype_name, {})[name] = best
+
+    if args.output is not None:
+        with open(args.output, "w") as f:
+            json.dump(selection, f, indent=2)
+        print(f"\nselection written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Compare policy checkpoints side by side in one headless simulation.
+
+The environments are split into one group per checkpoint, and all checkpoints run in a single batched
+forward pass. The mean reward per step, the finished episodes and the failures of every checkpoint are
+printed at the end.
+
+Usage:
+    python scripts/evaluate.py logs/model_a/policy.pt logs/model_b/policy.safetensors --backend torch --device cpu
+"""
+
+import argparse
+import os
+
+from train import create_backend  # importing train also adds the repository to sys.path
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("checkpoints", nargs="+", help="TorchScript (.pt) or flat (.safetensors) policies.")
+    parser.add_argument("--backend", choices=["isaac", "torch"], default="isaac")
+    parser.add_argument("--device", default="cuda:0")
+    parser.add_argument("--num-envs", type=int, default=1024)
+    parser.add_argument("--env-spacing", type=float, default=4.0)
+    parser.add_argument("--physics-dt", type=float, default=1.0 / 200.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--decimation", type=int, default=4, help="Physics steps per control step.")
+    parser.add_argument("--async-inference", action="store_true", help="Overlap inference with physics (CUDA).")
+    parser.add_argument("--steps", type=int, default=1000, help="Number of control steps.")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    backend, sim, simulation_app = create_backend(args)
+
+    import torch
+
+    from G1RL_Test_python.evaluation import MultiPolicyEvaluator
+    from G1RL_Test_python.locomotion_task import G1LocomotionTask
+    from G1RL_Test_python.policy import PolicyExporter
+    from G1RL_Test_python.scheduler import ControlScheduler
+
+    torch.manual_seed(args.seed)
+    task = G1LocomotionTask(
+        backend=backend,
+        num_envs=args.num_envs,
+        env_spacing=args.env_spacing,
+        decimation=args.decimation,
+        device=args.device,
+    )
+    task.set_up_scene()
+    if sim is not None:
+        sim.reset()
+    task.initialize()
+
+    policies = [PolicyExporter.load(path, device=args.device) for path in args.checkpoints]
+    evaluator = MultiPolicyEvaluator(task, policies)
+    evaluator.reset()
+    scheduler = ControlScheduler(
+        task, evaluator.policy, async_inference=args.async_inference, on_control_step=evaluator.score
+    )
+    for _ in range(args.steps * args.decimation):
+        scheduler.pre_physics_step()
+        backend.step()
+        scheduler.post_physics_step()
+    evaluator.report([os.path.relpath(path) for path in args.checkpoints])
+    scheduler.report()
+
+    backend.close()
+    if simulation_app is not None:
+        simulation_app.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+"""Train the G1 locomotion policy without the extension UI.
+
+The task is driven through a simulation backend:
+
+* ``isaac``: launches Isaac Sim headless (run with the Isaac Sim python, e.g. ``./python.sh scripts/train.py``).
+* ``torch``: pure PyTorch stand-in articulation, runs in any Python environment with PyTorch, on CPU or GPU.
+
+With ``--profile-steps N``, the script skips training and times each phase of N task steps driven by the
+policy instead, which gives a reproducible throughput measurement of the reset/step/observe/reward loop.
+
+Usage:
+    python scripts/train.py --backend torch --device cpu --iterations 10
+    python scripts/train.py --backend torch --device cpu --profile-steps 500
+"""
+
+import argparse
+import os
+import sys
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_DIR not in sys.path:
+    sys.path.insert(0, REPO_DIR)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backend", choices=["isaac", "torch"], default="isaac")
+    parser.add_argument("--device", default="cuda:0")
+    parser.add_argument("--num-envs", type=int, default=4096)
+    parser.add_argument("--env-spacing", type=float, default=4.0)
+    parser.add_argument("--physics-dt", type=float, default=1.0 / 200.0)
+    parser.add_argument("--decimation", type=int, default=4, help="Physics steps per control step.")
+    parser.add_argument(
+        "--terrain", choices=["flat", "rough"], default="flat", help="Flat ground plane or the terrain curriculum."
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--iterations", type=int, default=1000)
+    parser.add_argument(
+        "--obs-normalization",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="Normalize the observations with running statistics, exported with the policy.",
+    )
+    parser.add_argument(
+        "--domain-randomization",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="Randomize friction, masses and joint gains, and push the robots.",
+    )
+    parser.add_argument("--num-steps", type=int, default=24, help="Rollout length per environment and iteration.")
+    parser.add_argument("--save-interval", type=int, default=100)
+    parser.add_argument("--log-dir", default=os.path.join(REPO_DIR, "logs"))
+    parser.add_argument(
+        "--strict-device", action="store_true", help="Raise on implicit host/device transfers in the task."
+    )
+    parser.add_argument("--profile-steps", type=int, default=0, help="Profile the task loop instead of training.")
+    return parser.parse_args()
+
+
+def create_backend(args):
+    if args.backend == "isaac":
+        # the simulation app must be created before any other Isaac Sim module is imported
+        from isaacsim import SimulationApp
+
+        simulation_app = SimulationApp({"headless": True})
+
+        from isaacsim.core.api import SimulationContext
+        from G1RL_Test_python.backends.isaac_backend import IsaacSimBackend
+
+        sim = SimulationContext(
+            physics_dt=args.physics_dt, rendering_dt=args.physics_dt, backend="torch", device=args.device
+        )
+        return IsaacSimBackend(physics_dt=args.physics_dt), sim, simulation_app
+
+    from G1RL_Test_python.backends.torch_backend import TorchBackend
+
+    return TorchBackend(physics_dt=args.physics_dt, device=args.device, seed=args.seed), None, None
+
+
+def profile(env, actor_critic, num_steps: int):
+    import torch
+
+    task = env.task
+
+    def reset_done_envs():
+        reset_env_ids = task.termination_manager.dones.nonzero(as_tuple=False).squeeze(-1)
+        if len(reset_env_ids) > 0:
+            task.reset_idx(reset_env_ids)
+            task.update_state()
+
+    obs = env.reset()
+    task.observation_timer.enabled = True
+    actions = torch.zeros((env.num_envs, env.action_dim), device=env.device)
+    def step_physics():
+        for _ in range(task.decimation):
+            env.backend.step()
+
+    phases = {
+        "policy": lambda: actions.copy_(actor_critic(obs)),
+        "apply_actions": lambda: task.step(actions),
+        "physics": step_physics,
+        "read_state": task.update_state,
+        "termination": task.is_done,
+        "reward": task.get_reward,
+        "reset": reset_done_envs,
+        "commands": task.update_commands,
+        "observation": task.get_observation,
+    }
+    totals = dict.fromkeys(phases, 0.0)
+    with torch.no_grad():
+        for _ in range(num_steps):
+            for phase, fn in phases.items():
+                start = time.perf_counter()
+                fn()
+                if str(env.device).startswith("cuda"):
+                    torch.cuda.synchronize(env.device)
+                totals[phase] += time.perf_counter() - start
+
+    total = sum(totals.values())
+    print(f"[train] profiled {num_steps} control steps of {env.num_envs} envs, decimation {task.decimation}")
+    for phase, phase_total in totals.items():
+        print(f"  {phase:<14s} {phase_total / num_steps * 1e3:8.3f} ms/step ({100 * phase_total / total:5.1f}%)")
+    print(f"  {'total':<14s} {total / num_steps * 1e3:8.3f} ms/step, {num_steps * env.num_envs / total:10.0f} env-steps/s")
+    task.observation_timer.report("read_state and observation breakdown")
+
+
+def main():
+    args = parse_args()
+    backend, sim, simulation_app = create_backend(args)
+
+    import torch
+
+    from G1RL_Test_python.locomotion_task import G1LocomotionTask
+    from G1RL_Test_python.rl.actor_critic import ActorCritic
+    from G1RL_Test_python.rl.locomotion_env import LocomotionVecEnv
+    from G1RL_Test_python.rl.on_policy_runner import OnPolicyRunner
+    from G1RL_Test_python.rl.ppo import PPO
+    from G1RL_Test_python.terrain.terrain_generator import TerrainGenerator
+
+    torch.manual_seed(args.seed)
+    task = G1LocomotionTask(
+        backend=backend,
+        num_envs=args.num_envs,
+        env_spacing=args.env_spacing,
+        decimation=args.decimation,
+        terrain=TerrainGenerator(seed=args.seed) if args.terrain == "rough" else None,
+        device=args.device,
+    )
+    task.strict_device = args.strict_device
+    task.event_manager.enabled = args.domain_randomization
+    task.set_up_scene()
+    if sim is not None:
+        sim.reset()
+    task.initialize()
+
+    env = LocomotionVecEnv(task)
+    actor_critic = ActorCritic(env.obs_dim, env.action_dim, obs_normalization=args.obs_normalization).to(args.device)
+
+    if args.profile_steps > 0:
+        profile(env, actor_critic, args.profile_steps)
+    else:
+        algorithm = PPO(actor_critic, env.num_envs, num_steps=args.num_steps, device=args.device)
+        runner = OnPolicyRunner(env, algorithm)
+        os.makedirs(args.log_dir, exist_ok=True)
+        while runner.iteration < args.iterations:
+            runner.learn(min(args.save_interval, args.iterations - runner.iteration))
+            checkpoint_path = os.path.join(args.log_dir, f"model_{runner.iteration}.pt")
+            torch.save(
+                {
+                    "actor_critic": actor_critic.state_dict(),
+                    "optimizer": algorithm.optimizer.state_dict(),
+                    "iteration": runner.iteration,
+                },
+                checkpoint_path,
+            )
+            print(f"[train] saved {checkpoint_path}")
+        # TorchScript policy, loadable with PolicyExporter.from_jit
+        policy_path = os.path.join(args.log_dir, "policy.pt")
+        policy = actor_critic.export_policy()
+        torch.jit.script(policy).save(policy_path)
+        print(f"[train] exported {policy_path}")
+        # flat weights, loadable with PolicyExporter.from_flat without deserializing TorchScript
+        weights_path = os.path.join(args.log_dir, "policy.safetensors")
+        policy.save_flat(weights_path)
+        print(f"[train] exported {weights_path}")
+
+    backend.close()
+    if simulation_app is not None:
+        simulation_app.close()
+
+
+if __name__ == "__main__":
+    main()